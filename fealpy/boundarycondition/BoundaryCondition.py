@@ -1,7 +1,27 @@
+import zlib
 import numpy as np
-from scipy.sparse import coo_matrix, csc_matrix, csr_matrix, spdiags, eye
+from scipy.sparse import coo_matrix, csc_matrix, csr_matrix, bsr_matrix, spdiags, eye
 
 class DirichletBC:
+    """ The Dirichlet boundary condition
+
+    Notes
+    -----
+    `apply` eliminates the Dirichlet dofs from a CSR matrix by zeroing the
+    entries of their rows and columns and setting the diagonal entries to one
+    directly in `A.data`, which is the same as `T@A@T + Tbd` without the two
+    sparse products. The positions of these entries are found once for a
+    sparsity pattern and cached, so the matrices assembled again and again
+    with the same pattern, as in time stepping, only pay for two fancy
+    assignments.
+
+    A BSR matrix of a vector space, whose `R x R` blocks couple the
+    components of two dofs, keeps its format when all the components of a
+    boundary dof are Dirichlet ones, then the whole blocks are zeroed and
+    the diagonal blocks are set to the identity.
+
+    The right hand side `b` can have the shape `(gdof, )` or `(gdof, K)`.
+    """
     def __init__(self, V, g0, is_dirichlet_dof=None):
         self.V = V
         self.g0 = g0
@@ -13,63 +33,116 @@ class DirichletBC:
             isBdDof = is_dirichlet_dof(ipoints)
 
         self.isBdDof = isBdDof
+        self.bdIdx = None
+        self.pattern = None
 
-    def apply(self, A, b):
-        """ Modify matrix A and b
+    def boundary_value(self, b):
+        """ The Dirichlet values in an array like `b`, which is zero on the
+        other dofs
         """
-        g0 = self.g0
-        V = self.V
         isBdDof = self.isBdDof
+        if self.bdIdx is None:
+            # the length of ipoints and isBdDof maybe different
+            ipoints = self.V.interpolation_points()
+            self.bdIdx, = np.nonzero(isBdDof)
+            self.bdSelect = None
+            n = len(ipoints)
+            if len(isBdDof) > n:
+                # a vector space, the `R` components of a point are the
+                # dofs `R*i, ..., R*i + R - 1`
+                flag = np.asarray(isBdDof).reshape(n, -1)
+                isBdPoint = np.any(flag, axis=-1)
+                self.bdPoints = ipoints[isBdPoint]
+                self.bdSelect = flag[isBdPoint].reshape(-1)
+            else:
+                self.bdPoints = ipoints[self.bdIdx]
+        x = np.zeros(b.shape, dtype=np.float)
+        val = self.g0(self.bdPoints)
+        if self.bdSelect is not None:
+            val = val.reshape((-1, ) + val.shape[2:])[self.bdSelect]
+        if (b.ndim == 2) and (np.ndim(val) == 1):
+            val = val[:, None]
+        x[self.bdIdx] = val
+        return x
+
+    def pattern_index(self, A, isBdDof=None):
+        """ The positions in `A.data` of the entries in the rows and the
+        columns of the Dirichlet dofs, and the ones of their diagonal entries,
+        `None` if some diagonal entries are not stored
+
+        For a BSR matrix the positions are the ones of the blocks, and
+        `isBdDof` are the flags of the block rows.
+        """
+        key = (A.format, A.shape, A.nnz,
+                zlib.crc32(A.indptr), zlib.crc32(A.indices))
+        if (self.pattern is not None) and (self.pattern[0] == key):
+            return self.pattern[1:]
+
+        n = len(A.indptr) - 1
+        if isBdDof is None:
+            isBdDof = np.zeros(n, dtype=np.bool)
+            isBdDof[self.isBdDof] = True
+        row = np.repeat(np.arange(n), np.diff(A.indptr))
+        col = A.indices
+        isBdRow = isBdDof[row]
+        idx, = np.nonzero(isBdRow | isBdDof[col])
+        diag, = np.nonzero(isBdRow & (row == col))
+        if len(diag) != np.sum(isBdDof):
+            diag = None
+        self.pattern = (key, idx, diag)
+        return idx, diag
+
+    def apply(self, A, b, inplace=False):
+        """ Modify matrix A and b
 
-        gdof = V.number_of_global_dofs()
-        x = np.zeros((gdof,), dtype=np.float)
-        ipoints = V.interpolation_points()
-        # the length of ipoints and isBdDof maybe different
-        idx, = np.nonzero(isBdDof)
-        x[isBdDof] = g0(ipoints[idx])
+        Parameters
+        ----------
+        A : the sparse matrix
+        b : (gdof, ) or (gdof, K), which is modified in place
+        inplace : modify the CSR matrix `A` in place, otherwise `A` is not
+            changed
+        """
+        x = self.boundary_value(b)
         b -= A@x
-        bdIdx = np.zeros(gdof, dtype=np.int)
-        bdIdx[isBdDof] = 1
-        Tbd = spdiags(bdIdx, 0, gdof, gdof)
-        T = spdiags(1-bdIdx, 0, gdof, gdof)
-        A = T@A@T + Tbd
-
-        b[isBdDof] = x[isBdDof]
+        A = self.apply_on_matrix(A, inplace=inplace)
+        b[self.isBdDof] = x[self.isBdDof]
         return A, b
 
-    def apply_on_matrix(self, A):
-
-        V = self.V
-        isBdDof = self.isBdDof
-        gdof = V.number_of_global_dofs()
-
-        bdIdx = np.zeros((A.shape[0], ), np.int)
-        bdIdx[isBdDof] = 1
-        Tbd = spdiags(bdIdx, 0, A.shape[0], A.shape[0])
-        T = spdiags(1-bdIdx, 0, A.shape[0], A.shape[0])
-        A = T@A@T + Tbd
-
+    def apply_on_matrix(self, A, inplace=False):
+        if isinstance(A, bsr_matrix):
+            R, C = A.blocksize
+            flag = np.zeros(A.shape[0], dtype=np.bool)
+            flag[self.isBdDof] = True
+            flag = flag.reshape(-1, R)
+            isBdBlock = np.all(flag, axis=-1)
+            if (R == C) and np.all(isBdBlock == np.any(flag, axis=-1)):
+                B = A if inplace else A.copy()
+                B.sum_duplicates()
+                idx, diag = self.pattern_index(B, isBdDof=isBdBlock)
+                if diag is not None:
+                    B.data[idx] = 0
+                    B.data[diag] = np.eye(R)
+                    return B
+
+        if (not isinstance(A, csr_matrix)) or (not inplace):
+            A = A.tocsr(copy=True)
+        A.sum_duplicates()
+
+        idx, diag = self.pattern_index(A)
+        if diag is None:
+            # some diagonal entries are not stored in the pattern
+            bdIdx = np.zeros((A.shape[0], ), dtype=A.dtype)
+            bdIdx[self.isBdDof] = 1
+            Tbd = spdiags(bdIdx, 0, A.shape[0], A.shape[0])
+            T = spdiags(1-bdIdx, 0, A.shape[0], A.shape[0])
+            return (T@A@T + Tbd).tocsr()
+
+        A.data[idx] = 0
+        A.data[diag] = 1
         return A
 
     def apply_on_vector(self, b, A):
-        
-        g0 = self.g0
-        V = self.V
-        isBdDof = self.isBdDof
-
-        gdof = V.number_of_global_dofs()
-        x = np.zeros((gdof,), dtype=np.float)
-
-        ipoints = V.interpolation_points()
-        x[isBdDof] = g0(ipoints[isBdDof,:])
+        x = self.boundary_value(b)
         b -= A@x
-
-        b[isBdDof] = x[isBdDof] 
-
+        b[self.isBdDof] = x[self.isBdDof]
         return b
-
-
-
-        
-
-
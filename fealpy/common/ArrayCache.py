@@ -0,0 +1,184 @@
+import numpy as np
+from threading import RLock
+from collections import OrderedDict
+from functools import wraps
+from inspect import signature
+from scipy.sparse import issparse
+
+
+def array_nbytes(a):
+    """ The memory size in bytes of an array, a sparse matrix or a tuple of
+    them.
+    """
+    if isinstance(a, np.ndarray):
+        return a.nbytes
+    elif issparse(a):
+        if hasattr(a, 'indptr'):
+            return a.data.nbytes + a.indices.nbytes + a.indptr.nbytes
+        elif hasattr(a, 'row'):
+            return a.data.nbytes + a.row.nbytes + a.col.nbytes
+        else:
+            return a.data.nbytes
+    elif isinstance(a, (tuple, list)):
+        return sum(array_nbytes(b) for b in a)
+    else:
+        return 0
+
+
+def array_key(a, maxsize=4096):
+    """ A hashable key of the content of a small array, other objects are
+    returned as they are.
+    """
+    if isinstance(a, np.ndarray) and (a.size <= maxsize):
+        return ('ndarray', a.shape, a.dtype.str, a.tobytes())
+    return a
+
+
+def lock_array(a):
+    """ Make the cached numpy arrays read-only, so one can not modify the
+    cache by accident. Sparse matrices are left as they are, because scipy
+    may sort their indices in place.
+    """
+    if isinstance(a, np.ndarray):
+        a.flags.writeable = False
+    elif isinstance(a, (tuple, list)):
+        for b in a:
+            lock_array(b)
+    return a
+
+
+class ArrayCache():
+    """ A memoizing cache for arrays and sparse matrices
+
+    Parameters
+    ----------
+    maxsize : int or None
+        the memory budget of the cache in bytes. `None` means no limit and
+        `0` turns the cache off.
+
+    Notes
+    -----
+    When the total size of the cached data exceeds `maxsize`, the least
+    recently used entries are evicted. The numpy arrays returned by `fetch`
+    are always read-only, also the ones which are too large to be kept, so
+    whether a result can be modified does not depend on the size of the
+    data. The cache can be shared by threads, the data missed is computed
+    out of the lock.
+    """
+    def __init__(self, maxsize=2**28):
+        self.lock = RLock()
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = RLock()
+
+    def __len__(self):
+        return len(self.data)
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def fetch(self, key, fun):
+        """ Return the data of `key`, and call `fun()` to compute it when it
+        is not in the cache.
+        """
+        with self.lock:
+            if key in self.data:
+                self.hits += 1
+                self.data.move_to_end(key)
+                return self.data[key][0]
+            self.misses += 1
+
+        val = fun()
+        self.store(key, val)
+        return val
+
+    def store(self, key, val):
+        lock_array(val)
+        size = array_nbytes(val)
+        if (self.maxsize is not None) and (size > self.maxsize):
+            return val
+        with self.lock:
+            if key in self.data:
+                self.nbytes -= self.data.pop(key)[1]
+            self.data[key] = (val, size)
+            self.nbytes += size
+            self.shrink()
+        return val
+
+    def shrink(self):
+        if self.maxsize is None:
+            return
+        with self.lock:
+            while self.nbytes > self.maxsize:
+                _, (_, size) = self.data.popitem(last=False)
+                self.nbytes -= size
+
+    def resize(self, maxsize):
+        self.maxsize = maxsize
+        self.shrink()
+
+    def clear(self):
+        """ Drop all the cached data, but keep the hit and miss counts.
+        """
+        with self.lock:
+            self.data.clear()
+            self.nbytes = 0
+
+    def info(self):
+        return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self.data),
+                'nbytes': self.nbytes,
+                'maxsize': self.maxsize
+                }
+
+
+def cached(method):
+    """ Memoize the return value of a method in the `cache` attribute (an
+    `ArrayCache` object) of its instance.
+
+    The cache key is the method name and the arguments bound to their
+    parameter names, so `f()`, `f(False)` and `f(sparse=False)` share one
+    entry. Small arrays, such as the quadrature points, are keyed by their
+    content. Calls with other unhashable arguments are not cached.
+
+    Calls on a part of the entities, with an `index` or a `cellidx` other
+    than `None` or `slice(None)`, are not cached either, they are cheaper
+    to compute than to key, and a block of cells is rarely asked twice.
+    """
+    sig = signature(method)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        cache = getattr(self, 'cache', None)
+        if cache is None:
+            return method(self, *args, **kwargs)
+        ba = sig.bind(self, *args, **kwargs)
+        ba.apply_defaults()
+        for name in ('index', 'cellidx'):
+            idx = ba.arguments.get(name)
+            if isinstance(idx, slice) and (idx == slice(None)):
+                ba.arguments[name] = None
+            elif idx is not None:
+                return method(self, *args, **kwargs)
+        key = (method.__name__, ) + tuple(
+                (k, array_key(v)) for k, v in ba.arguments.items())[1:]
+        try:
+            hash(key)
+        except TypeError:
+            return method(self, *args, **kwargs)
+        return cache.fetch(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
@@ -7,3 +7,25 @@ def ranges(nv, start = 0):
     id_arr[shifts[:-1]] = -np.asarray(nv[:-1])+1
     id_arr[0] = start 
     return id_arr.cumsum()
+
+
+_indexType = {'itype': None}
+
+def set_index_type(itype=None):
+    """ Set the global integer type of the index arrays of meshes and dofs
+
+    `None` (the default) means the compact policy, which uses int32 whenever
+    the counts allow and int64 otherwise.
+    """
+    _indexType['itype'] = None if itype is None else np.dtype(itype)
+
+def index_type(n):
+    """ The integer type to store the indices in `range(n)`
+    """
+    itype = _indexType['itype']
+    if itype is not None:
+        return itype
+    elif n <= np.iinfo(np.int32).max:
+        return np.dtype(np.int32)
+    else:
+        return np.dtype(np.int64)
@@ -1 +1,2 @@
 from .Tools import *
+from .ArrayCache import ArrayCache, cached
@@ -125,6 +125,18 @@ class PoissonFEMModel(object):
         H1 = self.space.integralalg.L2_error(gu, guh)
         return H1
 
+    def error(self, uh=None, chunksize=None):
+        """
+        The L2 and the H1 semi errors by one evaluation of the solutions at
+        the quadrature points, see `FEMeshIntegralAlg.errors`
+        """
+        if uh is None:
+            uh = self.uh
+        e = self.space.integralalg.errors(
+                self.pde.solution, uh, gu=self.pde.gradient,
+                norms=('L2', 'H1'), chunksize=chunksize)
+        return e['L2'], e['H1']
+
     def recover_error(self, rguh):
         gu = self.pde.gradient
         guh = rguh.value
@@ -9,6 +9,8 @@ def stiff_matrix(space, qf, measure, cfun=None, barycenter=True):
 
     # Compute the element sitffness matrix
     A = np.einsum('i, ijkm, ijpm, j->jkp', ws, gphi, gphi, measure, optimize=True)
+    if hasattr(space, 'assembly_plan'):
+        return space.assembly_plan().assemble(A)
     cell2dof = space.cell_to_dof()
     ldof = space.number_of_local_dofs()
     I = np.einsum('k, ij->ijk', np.ones(ldof), cell2dof)
@@ -50,6 +52,8 @@ def mass_matrix(space, qf, measure, cfun=None, barycenter=True):
             val = cfun(pp)
         A = np.einsum('m, mi, mj, mk, i->ijk', ws, val, phi, phi, measure)
 
+    if hasattr(space, 'assembly_plan'):
+        return space.assembly_plan().assemble(A)
     cell2dof = space.cell_to_dof()
     ldof = space.number_of_local_dofs()
     I = np.einsum('k, ij->ijk', np.ones(ldof), cell2dof)
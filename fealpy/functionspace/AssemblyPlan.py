@@ -0,0 +1,296 @@
+import numpy as np
+from scipy.sparse import csr_matrix, bsr_matrix
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from ..common import index_type
+
+
+class AssemblyPlan():
+    """ The sparsity pattern of a finite element matrix and the scatter map
+    from the entries of the element matrices into it
+
+    Parameters
+    ----------
+    cell2dof : (NC, ldof) the row dofs of every cell
+    gdof : the number of the row dofs
+    cell2dof1 : (NC, ldof1) the column dofs, default `cell2dof`
+    gdof1 : the number of the column dofs, default `gdof`
+    scatter : build the scatter map or not
+
+    `cell2dof` (and `cell2dof1`) can also be a list of the `(NCg, ldofg)`
+    arrays of the groups of cells with the same number of dofs, such as the
+    polygons with the same number of vertices of the virtual element
+    spaces. Then the element matrices are given as a list of `(NCg, ldofg,
+    ldof1g)` arrays in the same order, and only `assemble` is supported.
+
+    Notes
+    -----
+    The pattern is built once. Then an assembly just sums the element
+    matrices into the `data` of the CSR matrix by one `np.bincount`, and the
+    triplets are not sorted and deduplicated again, which is what
+    `csr_matrix((val, (I, J)))` does at every call.
+
+    With `scatter=False` the scatter map, which has the size of all the
+    element matrices, is not built, and the matrix can only be assembled
+    block by block with `assemble_blocks`, so the peak memory is set by
+    the block size and the pattern.
+
+    The blocks can be assembled by `nthreads` threads, the element kernels
+    spend most of the time in `np.einsum` and `np.matmul` which release the
+    GIL. The contributions of the blocks are always summed in the order of
+    the blocks, so the result does not depend on the number of threads.
+
+    Example
+    -------
+    plan = AssemblyPlan(cell2dof, gdof)
+    A = plan.assemble(A0) # A0: (NC, ldof, ldof)
+    plan.assemble(A1, out=A) # refill the data of A in place
+    """
+    def __init__(self, cell2dof, gdof, cell2dof1=None, gdof1=None, scatter=True):
+        if cell2dof1 is None:
+            cell2dof1 = cell2dof
+            gdof1 = gdof
+
+        self.cell2dof = cell2dof
+        self.cell2dof1 = cell2dof1
+        self.shape = (gdof, gdof1)
+        if isinstance(cell2dof, (list, tuple)):
+            if not scatter:
+                raise ValueError("The plan of the cell groups needs the scatter map!")
+            self.elemshape = None
+            key = np.concatenate([
+                (c0.astype(np.int64)[:, :, None]*gdof1 + c1[:, None, :]).reshape(-1)
+                for c0, c1 in zip(cell2dof, cell2dof1)])
+        else:
+            NC, ldof = cell2dof.shape
+            ldof1 = cell2dof1.shape[1]
+            self.elemshape = (NC, ldof, ldof1)
+            if scatter:
+                key = cell2dof.astype(np.int64)[:, :, None]*gdof1 + cell2dof1[:, None, :]
+                key = key.reshape(-1)
+
+        if scatter:
+            order = np.argsort(key, kind='stable')
+            key = key[order]
+            isNew = np.r_[True, key[1:] != key[:-1]]
+            scatter = np.zeros(len(key), dtype=np.int_)
+            scatter[order] = np.cumsum(isNew) - 1
+            key = key[isNew]
+            self.nnz = len(key)
+
+            itype = index_type(max(self.nnz, gdof, gdof1))
+            self.scatter = scatter.astype(itype)
+            self.indices = (key%gdof1).astype(itype)
+            self.indptr = np.zeros(gdof + 1, dtype=itype)
+            self.indptr[1:] = np.cumsum(np.bincount(key//gdof1, minlength=gdof))
+        else:
+            # the pattern is the product of the cell to dof relations, and
+            # nothing of the size of all the element matrices is stored
+            C0 = self.cell_to_dof_matrix(cell2dof, gdof)
+            C1 = self.cell_to_dof_matrix(cell2dof1, gdof1)
+            P = (C0.T@C1).tocsr()
+            P.sort_indices()
+            self.nnz = P.nnz
+
+            itype = index_type(max(self.nnz, gdof, gdof1))
+            self.scatter = None
+            self.indices = P.indices.astype(itype, copy=False)
+            self.indptr = P.indptr.astype(itype, copy=False)
+
+    def cell_to_dof_matrix(self, cell2dof, gdof):
+        NC, ldof = cell2dof.shape
+        val = np.ones(NC*ldof, dtype=np.bool)
+        indptr = np.arange(0, NC*ldof + 1, ldof)
+        return csr_matrix((val, cell2dof.reshape(-1), indptr), shape=(NC, gdof))
+
+    def assemble(self, val, out=None):
+        """ Sum the element matrices into the global matrix
+
+        Parameters
+        ----------
+        val : (NC, ldof, ldof1) the element matrices, or the list of the
+            element matrices of the cell groups
+        out : a CSR matrix returned by this plan before, whose data is
+            overwritten in place
+
+        Returns
+        -------
+        A : the CSR matrix
+        """
+        if self.scatter is None:
+            raise ValueError("The plan has no scatter map, use `assemble_blocks`!")
+        if isinstance(val, (list, tuple)):
+            val = np.concatenate([v.reshape(-1) for v in val])
+        data = np.bincount(self.scatter, weights=val.reshape(-1), minlength=self.nnz)
+        return self.matrix(data, out=out)
+
+    def assemble_bsr(self, val, out=None):
+        """ Sum the element matrices of `R x C` blocks into a BSR matrix
+
+        Parameters
+        ----------
+        val : (NC, ldof, ldof1, R, C) the element matrices, the entry
+            `val[c, i, j, a, b]` couples the component `a` of the dof `i` and
+            the component `b` of the dof `j`
+        out : a BSR matrix returned by this plan before, whose data is
+            overwritten in place
+
+        Notes
+        -----
+        The dofs of the components are interleaved, the component `a` of the
+        dof `i` is `R*i + a`. The block pattern is the pattern of the plan,
+        so the index arrays are `R*C` times smaller than the ones of the
+        same matrix in CSR format.
+        """
+        if self.scatter is None:
+            raise ValueError("The plan has no scatter map, use `assemble_blocks`!")
+        R, C = val.shape[-2:]
+        data = np.zeros((self.nnz, R, C), dtype=np.float)
+        for a in range(R):
+            for b in range(C):
+                data[:, a, b] = np.bincount(self.scatter,
+                        weights=val[..., a, b].reshape(-1), minlength=self.nnz)
+        return self.bsr(data, out=out)
+
+    def bsr(self, data, out=None):
+        R, C = data.shape[1:]
+        if out is None:
+            shape = (self.shape[0]*R, self.shape[1]*C)
+            A = bsr_matrix(
+                    (data, self.indices.copy(), self.indptr.copy()),
+                    shape=shape)
+            A.has_sorted_indices = True
+            return A
+        elif out.data.shape == data.shape:
+            out.data[:] = data
+            return out
+        else:
+            raise ValueError("The matrix `out` does not have the pattern of this plan!")
+
+    def block_data(self, index, val, key=None):
+        """ Sum the element matrices `val` of the cells `index`, return the
+        sorted positions in the CSR data touched by the block and the sums
+        """
+        NC, ldof, ldof1 = self.elemshape
+        gdof, gdof1 = self.shape
+        if self.scatter is not None:
+            idx = self.scatter[index.start*ldof*ldof1:index.stop*ldof*ldof1]
+            idx, j = np.unique(idx, return_inverse=True)
+        else:
+            k = self.cell2dof[index].astype(np.int64)[:, :, None]*gdof1
+            k = (k + self.cell2dof1[index][:, None, :]).reshape(-1)
+            k, j = np.unique(k, return_inverse=True)
+            idx = np.searchsorted(key, k)
+        data = np.bincount(j, weights=val.reshape(-1), minlength=len(idx))
+        return idx, data
+
+    def assemble_blocks(self, kernel, chunksize, out=None, nthreads=None):
+        """ Assemble the matrix by streaming over the blocks of cells
+
+        Parameters
+        ----------
+        kernel : `kernel(index)` returns the element matrices of the cells
+            `index`, which is a slice
+        chunksize : the number of cells in one block
+        out : see `assemble`
+        nthreads : the number of threads, default one
+
+        Notes
+        -----
+        Only the element matrices of the blocks in process are in memory at a
+        time. A block is reduced to the sums on the slots of the CSR data it
+        touches, so its size is set by the block and not by `nnz`. When the
+        plan is built with `scatter=False`, the slots of a block are found by
+        a binary search of its unique entries in the pattern.
+        """
+        gdof, gdof1 = self.shape
+        key = None
+        if self.scatter is None:
+            row = np.repeat(np.arange(gdof, dtype=np.int64), np.diff(self.indptr))
+            key = row*gdof1 + self.indices
+            del row
+
+        def fun(index):
+            return self.block_data(index, kernel(index), key=key)
+
+        data = np.zeros(self.nnz, dtype=np.float)
+        NC = self.elemshape[0]
+        for idx, val in map_blocks(fun, NC, chunksize, nthreads=nthreads):
+            data[idx] += val
+        return self.matrix(data, out=out)
+
+    def matrix(self, data, out=None):
+        if out is None:
+            A = csr_matrix(
+                    (data, self.indices.copy(), self.indptr.copy()),
+                    shape=self.shape)
+            A.has_sorted_indices = True
+            return A
+        elif out.nnz == self.nnz:
+            out.data[:] = data
+            return out
+        else:
+            raise ValueError("The matrix `out` does not have the pattern of this plan!")
+
+
+def map_blocks(fun, NC, chunksize, nthreads=None):
+    """ Apply `fun` to the blocks `slice(i, i + chunksize)` of `NC` cells,
+    return an iterator over the results in the order of the blocks
+
+    With `nthreads` threads at most `2*nthreads` blocks are submitted and
+    not yet consumed at a time, so the results do not pile up in memory.
+    """
+    blocks = (slice(i, min(i + chunksize, NC)) for i in range(0, NC, chunksize))
+    if (nthreads is None) or (nthreads < 2) or (NC <= chunksize):
+        yield from map(fun, blocks)
+    else:
+        with ThreadPoolExecutor(max_workers=nthreads) as executor:
+            futures = deque()
+            for index in blocks:
+                if len(futures) == 2*nthreads:
+                    yield futures.popleft().result()
+                futures.append(executor.submit(fun, index))
+            while futures:
+                yield futures.popleft().result()
+
+
+def assemble_vector_blocks(kernel, cell2dof, gdof, chunksize, nthreads=None):
+    """ Assemble the load vector by the blocks of cells
+
+    Parameters
+    ----------
+    kernel : `kernel(index)` returns the element vectors of the cells
+        `index` with the shape `(n, ldof)` or `(n, ldof, K)`
+    cell2dof : (NC, ldof)
+    gdof : the number of the global dofs
+    chunksize : the number of cells in one block
+    nthreads : the number of threads, default one
+
+    Returns
+    -------
+    b : (gdof, ) or (gdof, K)
+    """
+    def fun(index):
+        val = kernel(index)
+        c2d = cell2dof[index].reshape(-1)
+        if len(c2d) == cell2dof.size:
+            dof, j = np.arange(gdof), c2d
+        else:
+            dof, j = np.unique(c2d, return_inverse=True)
+        shape = val.shape[2:]
+        val = val.reshape(len(j), -1)
+        # scatter all the K columns by one `np.bincount`
+        K = val.shape[1]
+        idx = j[:, None]*K + np.arange(K)
+        data = np.bincount(idx.reshape(-1), weights=val.reshape(-1),
+                minlength=len(dof)*K)
+        return dof, data.reshape(len(dof), K), shape
+
+    b = None
+    NC = len(cell2dof)
+    for dof, val, shape in map_blocks(fun, NC, chunksize, nthreads=nthreads):
+        if b is None:
+            b = np.zeros((gdof, val.shape[1]), dtype=np.float)
+        b[dof] += val
+    return b.reshape((gdof, ) + shape)
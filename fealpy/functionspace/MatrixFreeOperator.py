@@ -0,0 +1,161 @@
+import numpy as np
+from scipy.sparse.linalg import LinearOperator
+
+
+class MatrixFreeOperator(LinearOperator):
+    """ The stiffness or mass matrix of a LagrangeFiniteElementSpace applied
+    without assembling it
+
+    Parameters
+    ----------
+    space : LagrangeFiniteElementSpace with `p > 0`
+    kind : 'stiff' or 'mass'
+    cfun : the scalar coefficient function, or a number
+    isDDof : (gdof, ) the flags of the Dirichlet dofs. The operator is the
+        matrix with the rows and columns of these dofs replaced by the ones
+        of the identity, as after the Dirichlet elimination.
+    chunksize : the number of cells processed at one time
+
+    Notes
+    -----
+    Only `cell2dof`, the geometric factors and the coefficient at the
+    quadrature points are stored, and the tabulated basis values are shared
+    by all the cells. An apply gathers `u[cell2dof]`, goes to the quadrature
+    points and back by two batched matmuls with the reference basis, and
+    sums the element vectors by `np.bincount`. For the stiffness matrix the
+    geometric factor of a cell is `|K| grad lambda_i . grad lambda_j`, so
+    the cost per cell is `O(NQ*ldof*(TD+1))` instead of `O(ldof^2)`.
+
+    The cells are processed by blocks of `chunksize`, and the dofs of every
+    block are numbered locally once, so a block only touches the entries of
+    `u` and `A@u` of its own dofs and its cost does not grow with `gdof`.
+
+    The operator works with `scipy.sparse.linalg.cg` and
+    `fealpy.solver.minres.minres`, and `diagonal()` gives the Jacobi
+    preconditioner as a sparse matrix does.
+
+    Example
+    -------
+    A = space.stiff_operator(isDDof=isBdDof)
+    x, info = cg(A, b, M=A.jacobi())
+    """
+    def __init__(self, space, kind='stiff', cfun=None, isDDof=None, chunksize=2**14):
+        if space.p == 0:
+            raise ValueError('The space order is 0!')
+        if kind not in {'stiff', 'mass'}:
+            raise ValueError("the operator kind `{}` is not supported!".format(kind))
+
+        gdof = space.number_of_global_dofs()
+        super().__init__(dtype=np.float64, shape=(gdof, gdof))
+        self.space = space
+        self.kind = kind
+        self.isDDof = isDDof
+        self.chunksize = chunksize
+        self.cell2dof = space.cell_to_dof()
+        self.block = None
+
+        mesh = space.mesh
+        bcs, ws = space.integrator.get_quadrature_points_and_weights()
+        cellmeasure = space.cellmeasure
+
+        # the weights at the quadrature points of every cell: (NC, NQ)
+        if cfun is None:
+            d = 1.0
+        elif isinstance(cfun, (int, float)):
+            d = cfun
+        else:
+            d = cfun(mesh.bc_to_point(bcs))
+            if isinstance(d, np.ndarray):
+                if len(d.shape) == 1:
+                    d = d[None, :]
+                elif len(d.shape) != 2:
+                    raise ValueError("The coefficient should be a scalar!")
+                d = d.T
+        self.weight = np.ones((len(cellmeasure), 1))*(cellmeasure[:, None]*ws*d)
+
+        if kind == 'stiff':
+            # R: (NQ, ldof, TD+1), G: (NC, TD+1, TD+1)
+            R = space.lambda_grad_basis(bcs)
+            NQ, ldof, m = R.shape
+            self.phi = R.transpose(1, 0, 2).reshape(ldof, NQ*m)
+            Dlambda = mesh.grad_lambda()
+            self.G = np.einsum('cim, cjm->cij', Dlambda, Dlambda)
+            self.diag = self.cell_diagonal(R)
+        else:
+            # phi: (ldof, NQ)
+            self.phi = space.basis(bcs).T
+            self.diag = self.cell_diagonal(self.phi)
+
+    def cell_diagonal(self, phi):
+        if self.kind == 'stiff':
+            val = np.einsum('qia, qib, cab, cq->ci',
+                    phi, phi, self.G, self.weight, optimize=True)
+        else:
+            val = np.einsum('iq, cq->ci', phi**2, self.weight)
+        gdof = self.shape[0]
+        diag = np.bincount(self.cell2dof.flat, weights=val.flat, minlength=gdof)
+        if self.isDDof is not None:
+            diag[self.isDDof] = 1
+        return diag
+
+    def diagonal(self):
+        return self.diag
+
+    def jacobi(self):
+        """ The Jacobi preconditioner `diag(A)^{-1}`
+        """
+        d = 1/self.diag
+        return LinearOperator(self.shape, matvec=lambda r: d*r.reshape(-1),
+                dtype=self.dtype)
+
+    def cell_apply(self, index, u):
+        # u: (n, ldof) -> the element vectors (n, ldof)
+        phi = self.phi
+        w = self.weight[index]
+        v = u@phi
+        if self.kind == 'stiff':
+            n = v.shape[0]
+            m = self.G.shape[-1]
+            v = v.reshape(n, -1, m)@self.G[index]
+            v *= w[..., None]
+            v = v.reshape(n, -1)
+        else:
+            v *= w
+        return v@phi.T
+
+    def _matvec(self, u):
+        u = u.reshape(-1)
+        if self.isDDof is not None:
+            u0 = u
+            u = u.copy()
+            u[self.isDDof] = 0
+
+        gdof = self.shape[0]
+        y = np.zeros(gdof, dtype=np.float64)
+        for index, dof, c2d in self.blocks():
+            val = self.cell_apply(index, u[dof][c2d])
+            y[dof] += np.bincount(
+                    c2d.reshape(-1), weights=val.reshape(-1), minlength=len(dof))
+
+        if self.isDDof is not None:
+            y[self.isDDof] = u0[self.isDDof]
+        return y
+
+    def blocks(self):
+        """ The blocks of cells `index`, the sorted dofs `dof` of every block
+        and its cells to the local numbers of these dofs, built at the
+        first apply
+        """
+        if self.block is None:
+            cell2dof = self.cell2dof
+            NC = cell2dof.shape[0]
+            self.block = []
+            for start in range(0, NC, self.chunksize):
+                index = slice(start, min(start + self.chunksize, NC))
+                dof, c2d = np.unique(cell2dof[index], return_inverse=True)
+                c2d = c2d.reshape(-1, cell2dof.shape[1]).astype(cell2dof.dtype)
+                self.block.append((index, dof, c2d))
+        return self.block
+
+    def _rmatvec(self, u):
+        return self._matvec(u)
@@ -1,3 +1,4 @@
+import zlib
 import numpy as np
 from numpy.linalg import inv
 from scipy.sparse import coo_matrix, csc_matrix, csr_matrix, spdiags, eye
@@ -6,6 +7,7 @@ from .function import Function
 from ..quadrature import GaussLegendreQuadrature
 from ..quadrature import PolygonMeshIntegralAlg
 from .ScaledMonomialSpace2d import ScaledMonomialSpace2d
+from .AssemblyPlan import AssemblyPlan
 
 class NCVEMDof2d():
     """
@@ -128,16 +130,8 @@ class NonConformingVirtualElementSpace2d():
                 self.mesh,
                 area=self.smspace.area,
                 barycenter=self.smspace.barycenter)
-
-        self.H = self.matrix_H()
-        self.D = self.matrix_D(self.H)
-        self.B = self.matrix_B()
-        self.G = self.matrix_G(self.B, self.D)
-
-        self.PI1 = self.matrix_PI_1(self.G, self.B)
-        self.C = self.matrix_C(self.H, self.PI1)
-
-        self.PI0 = self.matrix_PI_0(self.H, self.C)
+        self.plan = None
+        self.projector = None
 
     def project_to_smspace(self, uh):
         """
@@ -152,67 +146,148 @@ class NonConformingVirtualElementSpace2d():
         S[:] = np.concatenate(list(map(g, zip(self.PI1, cd))))
         return S
 
-    def stiff_matrix(self):
-        p = self.p
-        G = self.G
-        D = self.D
-        PI1 = self.PI1
+    @property
+    def H(self):
+        return self.projectors()[0]
 
-        cell2dof, cell2dofLocation = self.dof.cell2dof, self.dof.cell2dofLocation
-        cd = np.hsplit(cell2dof, cell2dofLocation[1:-1])
+    @property
+    def D(self):
+        return self.projectors()[1]
 
-        DD = np.vsplit(D, cell2dofLocation[1:-1])
+    @property
+    def B(self):
+        return self.projectors()[2]
 
-        def f(x):
-            x[0, :] = 0
-            return x
-        tG = list(map(f, G))
+    @property
+    def G(self):
+        return self.cell_matrices(3)
 
-        f1 = lambda x: x[1].T@x[2]@x[1] + (np.eye(x[1].shape[1]) - x[0]@x[1]).T@(np.eye(x[1].shape[1]) - x[0]@x[1])
-        K = list(map(f1, zip(DD, PI1, tG)))
+    @property
+    def PI1(self):
+        return self.cell_matrices(4)
 
-        f2 = lambda x: np.repeat(x, x.shape[0])
-        f3 = lambda x: np.tile(x, x.shape[0])
-        f4 = lambda x: x.flatten()
+    @property
+    def C(self):
+        return self.cell_matrices(5)
 
-        I = np.concatenate(list(map(f2, cd)))
-        J = np.concatenate(list(map(f3, cd)))
-        val = np.concatenate(list(map(f4, K)))
-        gdof = self.number_of_global_dofs()
-        A = csr_matrix((val, (I, J)), shape=(gdof, gdof), dtype=np.float)
-        return A
+    @property
+    def PI0(self):
+        return self.cell_matrices(6)
 
-    def mass_matrix(self):
+    def projectors(self):
+        """
+        The projection matrices `(H, D, B, groups)`, see `group_matrices`
+        for `groups`
+
+        They are memoized in the `GeometryCache` of the mesh, keyed by the
+        space type, the order, the barycenters and the areas, so the spaces
+        rebuilt on the same mesh share them, and they are computed again
+        after the mesh is changed. The matrices larger than the budget of the
+        cache are not kept there, see `ArrayCache.resize`. Without the cache
+        of the mesh they are kept by the space.
+        """
+        cache = getattr(self.mesh, 'cache', None)
+        if cache is None:
+            if self.projector is None:
+                self.projector = self.compute_projectors()
+            return self.projector
+        bc = np.ascontiguousarray(self.smspace.barycenter)
+        area = np.ascontiguousarray(self.smspace.area)
+        key = (type(self).__name__, self.p, zlib.crc32(bc), zlib.crc32(area))
+        return cache.fetch(key, self.compute_projectors)
+
+    def compute_projectors(self):
         p = self.p
+        ds = self.mesh.ds
+        area = self.smspace.area
+        idof = (p-1)*p//2
+        location = self.dof.cell2dofLocation
+
+        H = self.matrix_H()
+        D = self.matrix_D(H)
+        B = self.matrix_B()
+
+        groups = []
+        for (cidx, cd), (_, DD), (_, BB) in zip(
+                ds.group_blocks(self.dof.cell2dof, location),
+                ds.group_blocks(D, location),
+                ds.group_blocks(B.T, location)):
+            BB = BB.swapaxes(-1, -2)
+            HH = H[cidx]
+            G = BB@DD
+            PI1 = np.linalg.solve(G, BB)
+            C = HH@PI1
+            if p > 1:
+                C[:, :idof, :] = 0
+                C[:, :idof, cd.shape[1]-idof:] = area[cidx, None, None]*np.eye(idof)
+            PI0 = np.linalg.solve(HH, C)
+            groups.append((cidx, cd, DD, G, PI1, C, PI0))
+        return H, D, B, groups
+
+    def group_matrices(self):
+        """
+        The projection matrices of the groups of cells with the same number
+        of edges, see `PolygonMeshDataStructure.cell_groups`
+
+        Returns
+        -------
+        groups : a list of `(cidx, cd, D, G, PI1, C, PI0)`, where `cidx` is
+            the index of the `n` cells of a group, `cd` is the `(n, ldof)`
+            local dofs, `D` is `(n, ldof, smldof)`, `G` is
+            `(n, smldof, smldof)`, `PI1`, `C` and `PI0` are
+            `(n, smldof, ldof)`
+        """
+        return self.projectors()[3]
 
-        # the projector matrix
-        D = self.D
-        H = self.H
-        C = self.C
-
-        # the dof arrays
-        cell2dof, cell2dofLocation = self.dof.cell2dof, self.dof.cell2dofLocation
-        cd = np.hsplit(cell2dof, cell2dofLocation[1:-1])
-
-        f1 = lambda x: x[0]@x[1]
-        PI0 = self.PI0
-        DD = np.vsplit(D, cell2dofLocation[1:-1])
-        PIS = list(map(f1, zip(DD, PI0)))
-
-        f1 = lambda x: x[0].T@x[1]@x[0] + x[3]*(np.eye(x[2].shape[1]) - x[2]).T@(np.eye(x[2].shape[1]) - x[2])
-        K = list(map(f1, zip(PI0, H, PIS, self.smspace.area)))
-
-        f2 = lambda x: np.repeat(x, x.shape[0])
-        f3 = lambda x: np.tile(x, x.shape[0])
-        f4 = lambda x: x.flatten()
+    def cell_matrices(self, i):
+        """ The list of the matrices of every cell, which are the views of
+        the `i`-th stacked arrays of the groups
+        """
+        val = [None]*self.mesh.number_of_cells()
+        for g in self.group_matrices():
+            for c, a in zip(g[0], g[i]):
+                val[c] = a
+        return val
+
+    def assembly_plan(self):
+        """ The sparsity pattern of the stiffness and mass matrices, which
+        is built at the first call and reused by the later assemblies
+        """
+        if self.plan is None:
+            cd = [g[1] for g in self.mesh.ds.group_blocks(
+                self.dof.cell2dof, self.dof.cell2dofLocation)]
+            gdof = self.number_of_global_dofs()
+            self.plan = AssemblyPlan(cd, gdof)
+        return self.plan
 
-        I = np.concatenate(list(map(f2, cd)))
-        J = np.concatenate(list(map(f3, cd)))
-        val = np.concatenate(list(map(f4, K)))
-        gdof = self.number_of_global_dofs()
-        M = csr_matrix((val, (I, J)), shape=(gdof, gdof), dtype=np.float)
-        return M
+    def stiff_matrix(self):
+        """
+        assemble the stiffness matrix, the element matrices of a group of
+        cells are computed by batched matrix products
+        """
+        K = []
+        for cidx, cd, D, G, PI1, C, PI0 in self.group_matrices():
+            tG = G.copy()
+            tG[:, 0, :] = 0
+            # the consistency part and the stability part
+            S = np.eye(cd.shape[1]) - D@PI1
+            K.append(PI1.swapaxes(-1, -2)@tG@PI1 + S.swapaxes(-1, -2)@S)
+        return self.assembly_plan().assemble(K)
 
+    def mass_matrix(self):
+        """
+        assemble the mass matrix, the element matrices of a group of cells
+        are computed by batched matrix products
+        """
+        area = self.smspace.area
+
+        K = []
+        for cidx, cd, D, G, PI1, C, PI0 in self.group_matrices():
+            S = np.eye(cd.shape[1]) - D@PI0
+            A = PI0.swapaxes(-1, -2)@self.H[cidx]@PI0
+            A += area[cidx, None, None]*(S.swapaxes(-1, -2)@S)
+            K.append(A)
+        return self.assembly_plan().assemble(K)
 
     def source_vector(self, f):
         phi = self.smspace.basis
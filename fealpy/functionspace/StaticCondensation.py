@@ -0,0 +1,124 @@
+import numpy as np
+
+from .AssemblyPlan import AssemblyPlan
+
+
+class StaticCondensation():
+    """ The static condensation of the cell interior dofs of a continuous
+    LagrangeFiniteElementSpace
+
+    Parameters
+    ----------
+    space : LagrangeFiniteElementSpace with `spacetype='C'`
+
+    Notes
+    -----
+    The interior dofs of a cell, which exist for `p > 1` on intervals,
+    `p > 2` on triangles and `p > 3` on tetrahedra, are only coupled with
+    the dofs of the same cell. Split the element system into the skeleton
+    (vertex, edge and face) part `b` and the interior part `i`,
+
+        S = A_bb - A_bi A_ii^{-1} A_ib,  g = f_b - A_bi A_ii^{-1} f_i,
+
+    are computed for all the cells at once by batched dense solves and
+    assembled into the system of the skeleton dofs only. After it is solved,
+    the interior values are `u_i = A_ii^{-1} f_i - A_ii^{-1} A_ib u_b`.
+
+    The interior dofs are numbered after all the skeleton dofs, so the
+    skeleton dofs are `0, ..., sgdof - 1` and keep their global numbers.
+    The object has `number_of_global_dofs`, `boundary_dof` and
+    `interpolation_points` of the skeleton, so `DirichletBC` can be applied
+    to the condensed system directly.
+
+    Example
+    -------
+    sc = StaticCondensation(space)
+    A, b = sc.condense(space.cell_stiff_matrix(), space.cell_source_vector(f))
+    A, b = DirichletBC(sc, g).apply(A, b)
+    uh = sc.recover(spsolve(A, b))
+    """
+    def __init__(self, space):
+        if space.spacetype != 'C':
+            raise ValueError("The static condensation needs a continuous space!")
+
+        self.space = space
+        cell2dof = space.cell_to_dof()
+        NC = cell2dof.shape[0]
+        isInCellDof = np.all(space.dof.multiIndex > 0, axis=-1)
+        self.interior, = np.nonzero(isInCellDof)
+        self.skeleton, = np.nonzero(~isInCellDof)
+
+        gdof = space.number_of_global_dofs()
+        self.sgdof = gdof - NC*len(self.interior)
+        self.cell2dof = cell2dof
+        self.cell2skeleton = cell2dof[:, self.skeleton]
+        if np.any(self.cell2skeleton >= self.sgdof):
+            raise ValueError("The interior dofs should be numbered after the skeleton dofs!")
+        self.plan = AssemblyPlan(self.cell2skeleton, self.sgdof)
+        self.X = None
+        self.y = None
+
+    def number_of_global_dofs(self):
+        return self.sgdof
+
+    def boundary_dof(self):
+        return self.space.boundary_dof()[:self.sgdof]
+
+    def interpolation_points(self):
+        return self.space.interpolation_points()[:self.sgdof]
+
+    def condense(self, A, b):
+        """ Condense the element systems
+
+        Parameters
+        ----------
+        A : (NC, ldof, ldof) the element matrices
+        b : (NC, ldof) or (NC, ldof, K) the element vectors
+
+        Returns
+        -------
+        S : (sgdof, sgdof) the CSR matrix of the skeleton system
+        g : (sgdof, ) or (sgdof, K) the right hand side
+        """
+        sk = self.skeleton
+        it = self.interior
+        shape = b.shape[2:]
+        b = b.reshape(b.shape[0], b.shape[1], -1)
+
+        Abb = A[:, sk[:, None], sk]
+        bb = b[:, sk]
+        if len(it) > 0:
+            Abi = A[:, sk[:, None], it]
+            Aii = A[:, it[:, None], it]
+            Aib = A[:, it[:, None], sk]
+            # solve the interior systems of all the cells in one call
+            Z = np.linalg.solve(Aii, np.concatenate((Aib, b[:, it]), axis=-1))
+            ns = len(sk)
+            self.X = Z[..., :ns]
+            self.y = Z[..., ns:]
+            Abb = Abb - Abi@self.X
+            bb = bb - Abi@self.y
+
+        S = self.plan.assemble(Abb)
+        K = bb.shape[-1]
+        g = np.zeros((self.sgdof, K), dtype=np.float)
+        for k in range(K):
+            g[:, k] = np.bincount(self.cell2skeleton.flat,
+                    weights=bb[..., k].flat, minlength=self.sgdof)
+        return S, g.reshape((self.sgdof, ) + shape)
+
+    def recover(self, ub):
+        """ Recover the full solution from the skeleton values `ub` of
+        shape `(sgdof, )` or `(sgdof, K)`
+        """
+        shape = ub.shape[1:]
+        gdof = self.space.number_of_global_dofs()
+        uh = np.zeros((gdof, ) + shape, dtype=ub.dtype)
+        uh[:self.sgdof] = ub
+        if len(self.interior) > 0:
+            if self.X is None:
+                raise ValueError("Call `condense` before `recover`!")
+            ue = ub.reshape(self.sgdof, -1)[self.cell2skeleton]
+            ui = self.y - self.X@ue
+            uh.reshape(gdof, -1)[self.cell2dof[:, self.interior]] = ui
+        return uh
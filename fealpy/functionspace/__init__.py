@@ -1,4 +1,7 @@
 from .lagrange_fem_space import LagrangeFiniteElementSpace
+from .mesh_transfer import MeshTransfer
+from .MatrixFreeOperator import MatrixFreeOperator
+from .StaticCondensation import StaticCondensation
 from .surface_lagrange_fem_space import SurfaceLagrangeFiniteElementSpace
 from .mixed_fem_space import RTFiniteElementSpace2d
 from .vem_space import VEMDof2d, VirtualElementSpace2d
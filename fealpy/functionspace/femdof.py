@@ -2,11 +2,14 @@ import numpy as np
 import operator as op
 from functools import reduce
 
+from ..common import index_type
+
 class CPLFEMDof1d():
     def __init__(self, mesh, p):
         self.mesh = mesh
         self.p = p
         self.multiIndex = self.multi_index_matrix()
+        self.itype = index_type(self.number_of_global_dofs())
         self.cell2dof = self.cell_to_dof()
 
     def multi_index_matrix(self):
@@ -35,7 +38,7 @@ class CPLFEMDof1d():
             NN = mesh.number_of_nodes()
             NC = mesh.number_of_cells()
             ldof = self.number_of_local_dofs()
-            cell2dof = np.zeros((NC, ldof), dtype=np.int)
+            cell2dof = np.zeros((NC, ldof), dtype=self.itype)
             cell2dof[:, [0, -1]] = cell
             cell2dof[:, 1:-1] = NN + np.arange(NC*(p-1)).reshape(NC, p-1)
             return cell2dof
@@ -86,6 +89,7 @@ class CPLFEMDof2d():
         self.mesh = mesh
         self.p = p
         self.multiIndex = self.multi_index_matrix()
+        self.itype = index_type(self.number_of_global_dofs())
         self.cell2dof = self.cell_to_dof()
 
     def multi_index_matrix(self):
@@ -123,7 +127,7 @@ class CPLFEMDof2d():
         NN = mesh.number_of_nodes()
 
         edge = mesh.ds.edge
-        edge2dof = np.zeros((NE, p+1), dtype=np.int)
+        edge2dof = np.zeros((NE, p+1), dtype=self.itype)
         edge2dof[:, [0, -1]] = edge
         if p > 1:
             edge2dof[:, 1:-1] = NN + np.arange(NE*(p-1)).reshape(NE, p-1)
@@ -144,7 +148,7 @@ class CPLFEMDof2d():
             cell2dof = cell
 
         if p > 1:
-            cell2dof = np.zeros((NC, ldof), dtype=np.int)
+            cell2dof = np.zeros((NC, ldof), dtype=self.itype)
 
             isEdgeDof = self.is_on_edge_local_dof()
             edge2dof = self.edge_to_dof()
@@ -227,6 +231,7 @@ class CPLFEMDof3d():
         self.p = p
         self.multiIndex = self.multi_index_matrix()
         self.faceMultiIndex = self.face_multi_index_matrix()
+        self.itype = index_type(self.number_of_global_dofs())
         self.cell2dof = self.cell_to_dof()
 
     def multi_index_matrix(self):
@@ -284,7 +289,7 @@ class CPLFEMDof3d():
 
         base = N
         edge = mesh.ds.edge
-        edge2dof = np.zeros((NE, p+1), dtype=np.int)
+        edge2dof = np.zeros((NE, p+1), dtype=self.itype)
         edge2dof[:, [0, -1]] = edge
         if p > 1:
             edge2dof[:,1:-1] = base + np.arange(NE*(p-1)).reshape(NE, p-1)
@@ -310,7 +315,7 @@ class CPLFEMDof3d():
 
         edge2dof = self.edge_to_dof()
 
-        face2dof = np.zeros((NF, fdof), dtype=np.int)
+        face2dof = np.zeros((NF, fdof), dtype=self.itype)
         faceIdx = self.faceMultiIndex
         isEdgeDof = (faceIdx == 0)
 
@@ -356,7 +361,7 @@ class CPLFEMDof3d():
 
         cell2face = mesh.ds.cell_to_face()
 
-        cell2dof = np.zeros((NC, ldof), dtype=np.int)
+        cell2dof = np.zeros((NC, ldof), dtype=self.itype)
 
         face2dof = self.face_to_dof()
         isFaceDof = self.is_on_face_local_dof()
@@ -393,7 +398,7 @@ class CPLFEMDof3d():
         NN = mesh.number_of_nodes()
         NC = mesh.number_of_cells()
         ldof = self.number_of_local_dofs()
-        cell2dof = np.zeros((NC, ldof), dtype=np.int)
+        cell2dof = np.zeros((NC, ldof), dtype=self.itype)
 
         idx = np.array([
             0,
@@ -512,13 +517,14 @@ class DPLFEMDof():
         self.mesh = mesh
         self.p = p
         self.multiIndex = self.multi_index_matrix()
+        self.itype = index_type(self.number_of_global_dofs())
         self.cell2dof = self.cell_to_dof()
 
     def cell_to_dof(self):
         mesh = self.mesh
         NC = mesh.number_of_cells()
         ldof = self.number_of_local_dofs()
-        cell2dof = np.arange(NC*ldof).reshape(NC, ldof)
+        cell2dof = np.arange(NC*ldof, dtype=self.itype).reshape(NC, ldof)
         return cell2dof
 
     def number_of_global_dofs(self):
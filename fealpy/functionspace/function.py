@@ -37,9 +37,13 @@ class Function(np.ndarray):
         space = self.space
         return space.hessian_value(self, bc, cellidx=cellidx)
 
+    def probe(self, points, locator=None, grad=False):
+        space = self.space
+        return space.probe(self, points, locator=locator, grad=grad)
+
     def add_plot(self, plt):
         mesh = self.space.mesh
-        if mesh.meshtype is 'tri':
+        if mesh.meshtype == 'tri':
             node = mesh.entity('node')
             cell = mesh.entity('cell')
             fig1 = plt.figure()
@@ -1,41 +1,46 @@
 import numpy as np
-from scipy.sparse import coo_matrix, csr_matrix, spdiags
+from scipy.sparse import coo_matrix, csr_matrix, bsr_matrix, spdiags, eye, kron
 from scipy.sparse.linalg import spsolve
 
 from .function import Function
+from .AssemblyPlan import AssemblyPlan, assemble_vector_blocks
+from .MatrixFreeOperator import MatrixFreeOperator
 from .femdof import CPLFEMDof1d, CPLFEMDof2d, CPLFEMDof3d
 from .femdof import DPLFEMDof1d, DPLFEMDof2d, DPLFEMDof3d
 
 from ..quadrature import GaussLegendreQuadrature
 from ..quadrature import FEMeshIntegralAlg
+from ..common import ArrayCache
 
 
 class LagrangeFiniteElementSpace():
+    tabulation = ArrayCache(maxsize=2**26)
+    tabulationSize = 1024
+
     def __init__(self, mesh, p=1, spacetype='C', q=None):
         self.mesh = mesh
-        self.cellmeasure = mesh.entity_measure('cell')
         self.p = p
         if spacetype is 'C':
-            if mesh.meshtype is 'interval':
+            if mesh.meshtype == 'interval':
                 self.dof = CPLFEMDof1d(mesh, p)
                 self.TD = 1
-            elif mesh.meshtype is 'tri':
+            elif mesh.meshtype == 'tri':
                 self.dof = CPLFEMDof2d(mesh, p)
                 self.TD = 2
-            elif mesh.meshtype is 'stri':
+            elif mesh.meshtype == 'stri':
                 self.dof = CPLFEMDof2d(mesh, p)
                 self.TD = 2
-            elif mesh.meshtype is 'tet':
+            elif mesh.meshtype == 'tet':
                 self.dof = CPLFEMDof3d(mesh, p)
                 self.TD = 3
         elif spacetype is 'D':
-            if mesh.meshtype is 'interval':
+            if mesh.meshtype == 'interval':
                 self.dof = DPLFEMDof1d(mesh, p)
                 self.TD = 1
-            elif mesh.meshtype is 'tri':
+            elif mesh.meshtype == 'tri':
                 self.dof = DPLFEMDof2d(mesh, p)
                 self.TD = 2
-            elif mesh.meshtype is 'tet':
+            elif mesh.meshtype == 'tet':
                 self.dof = DPLFEMDof3d(mesh, p)
                 self.TD = 3
 
@@ -57,10 +62,17 @@ class LagrangeFiniteElementSpace():
                 self.integrator,
                 self.mesh,
                 self.cellmeasure)
+        self.plan = None
 
     def __str__(self):
         return "Lagrange finite element space!"
 
+    @property
+    def cellmeasure(self):
+        # the measures are memoized by the geometry cache of the mesh, and
+        # follow the changes of the mesh
+        return self.mesh.entity_measure('cell')
+
     def number_of_global_dofs(self):
         return self.dof.number_of_global_dofs()
 
@@ -179,6 +191,23 @@ class LagrangeFiniteElementSpace():
         gphi = np.einsum('k...ij, kjm->k...im', R, Dlambda[cellidx, :, :])
         return gphi
 
+    def tabulate(self, fun, bc):
+        """
+        memoize the reference element values `fun(bc)` in the class level
+        cache `LagrangeFiniteElementSpace.tabulation`
+
+        The values only depend on `p`, `TD`, the space type and `bc`, so all
+        the spaces with the same degree share the tables of a quadrature
+        rule. The tables are read-only, and the arrays `bc` with more than
+        `tabulationSize` points, such as the points of `probe`, are not
+        tabulated.
+        """
+        if bc.size > self.tabulationSize*(self.TD + 1):
+            return fun(bc)
+        key = (fun.__name__, self.p, self.TD, self.spacetype,
+                bc.shape, bc.dtype.str, bc.tobytes())
+        return self.tabulation.fetch(key, lambda: fun(bc))
+
     def basis(self, bc):
         """
         compute the basis function values at barycentric point bc
@@ -197,8 +226,11 @@ class LagrangeFiniteElementSpace():
 
         Notes
         -----
-
+        The values at the same `bc` are tabulated once, see `tabulate`.
         """
+        return self.tabulate(self.compute_basis, bc)
+
+    def compute_basis(self, bc):
         p = self.p   # the degree of polynomial basis function
 
         if p == 0 and self.spacetype == 'D':
@@ -222,9 +254,10 @@ class LagrangeFiniteElementSpace():
         phi = np.prod(A[..., multiIndex, idx], axis=-1)
         return phi
 
-    def grad_basis(self, bc, cellidx=None):
+    def lambda_grad_basis(self, bc):
         """
-        compute the basis function values at barycentric point bc
+        compute the derivatives of the basis functions with respect to the
+        barycentric coordinates at bc
 
         Parameters
         ----------
@@ -233,17 +266,12 @@ class LagrangeFiniteElementSpace():
 
         Returns
         -------
-        gphi : numpy.array
-            the shape of `gphi` can b `(NC, ldof, gdim)' or
-            `(NQ, NC, ldof, gdim)'
-
-        See also
-        --------
-
-        Notes
-        -----
-
+        R : numpy.array
+            the shape of `R` can be `(ldof, tdim+1)` or `(NQ, ldof, tdim+1)`
         """
+        return self.tabulate(self.compute_lambda_grad_basis, bc)
+
+    def compute_lambda_grad_basis(self, bc):
         p = self.p   # the degree of polynomial basis function
         TD = self.TD
 
@@ -276,7 +304,31 @@ class LagrangeFiniteElementSpace():
             idx = list(range(TD+1))
             idx.remove(i)
             R[..., i] = M[..., i]*np.prod(Q[..., idx], axis=-1)
+        return R
+
+    def grad_basis(self, bc, cellidx=None):
+        """
+        compute the basis function values at barycentric point bc
+
+        Parameters
+        ----------
+        bc : numpy.array
+            the shape of `bc` can be `(tdim+1,)` or `(NQ, tdim+1)`
+
+        Returns
+        -------
+        gphi : numpy.array
+            the shape of `gphi` can b `(NC, ldof, gdim)' or
+            `(NQ, NC, ldof, gdim)'
+
+        See also
+        --------
+
+        Notes
+        -----
 
+        """
+        R = self.lambda_grad_basis(bc)
         Dlambda = self.mesh.grad_lambda()
         if cellidx is None:
             gphi = np.einsum('...ij, kjm->...kim', R, Dlambda)
@@ -321,6 +373,102 @@ class LagrangeFiniteElementSpace():
         else:
             raise ValueError("The shape of uh should be (gdof, gdim)!")
 
+    def assembly_plan(self, scatter=True):
+        """ The sparsity pattern of the stiffness and mass matrices, which
+        is built at the first call and reused by the later assemblies
+
+        `scatter=False` is for the assembly block by block, and a plan
+        without the scatter map is built if there is no plan yet.
+        """
+        if (self.plan is None) or (scatter and self.plan.scatter is None):
+            self.plan = AssemblyPlan(
+                    self.cell_to_dof(), self.number_of_global_dofs(),
+                    scatter=scatter)
+        return self.plan
+
+    def block_size(self, chunksize=None, nthreads=None):
+        """ The number of cells in a block, default `2**12`
+
+        The default does not depend on `nthreads`, so the blocks, and with
+        them the order of the summation, are the same for any number of
+        threads and so are the results.
+        """
+        if chunksize is None:
+            chunksize = 2**12
+        return chunksize
+
+    def assemble_blocks(self, kernel, chunksize=None, nthreads=None):
+        """ Assemble the element matrices `kernel(index)` block by block,
+        see `AssemblyPlan.assemble_blocks`
+        """
+        chunksize = self.block_size(chunksize, nthreads)
+        plan = self.assembly_plan(scatter=False)
+        return plan.assemble_blocks(kernel, chunksize, nthreads=nthreads)
+
+    def cell_locator(self):
+        """ The point locator of the mesh, which is kept in the cache of the
+        mesh, so it is shared by the later probes and built again after the
+        mesh is refined or its nodes are moved
+        """
+        from ..mesh.CellLocator import CellLocator
+        mesh = self.mesh
+        if mesh.meshtype not in {'tri', 'stri', 'tet'}:
+            raise ValueError("Point location is not supported on the mesh type `{}`!".format(mesh.meshtype))
+        cache = getattr(mesh, 'cache', None)
+        if cache is None:
+            return CellLocator(mesh)
+        return cache.fetch(('CellLocator', ), lambda: CellLocator(mesh))
+
+    def probe(self, uh, points, locator=None, grad=False):
+        """
+        evaluate `uh` at arbitrary physical points
+
+        Parameters
+        ----------
+        uh : numpy.array
+            the shape can be `(gdof, )` or `(gdof, ...)`
+        points : numpy.array
+            `(NP, gdim)` physical points
+        locator : CellLocator
+            default the one from `self.cell_locator()`
+        grad : bool
+            also return the gradient values
+
+        Returns
+        -------
+        val : numpy.array
+            `(NP, ...)`, `nan` at the points out of the mesh
+        gval : numpy.array
+            `(NP, ..., gdim)`, only when `grad` is True
+        """
+        if locator is None:
+            locator = self.cell_locator()
+        NP = points.shape[0]
+        cell2dof = self.dof.cell2dof
+        val = np.full((NP, ) + uh.shape[1:], np.nan, dtype=self.ftype)
+        if grad:
+            Dlambda = self.mesh.grad_lambda()
+            gval = np.full(val.shape + (self.GD, ), np.nan, dtype=self.ftype)
+
+        for start in range(0, NP, locator.chunksize):
+            cidx, bc = locator.find(points[start:start+locator.chunksize])
+            isFound = cidx >= 0
+            idx, = np.nonzero(isFound)
+            idx += start
+            cidx, bc = cidx[isFound], bc[isFound]
+            uc = uh[cell2dof[cidx]]
+            phi = self.basis(bc)
+            val[idx] = np.einsum('ij, ij...->i...', phi, uc)
+            if grad:
+                R = self.lambda_grad_basis(bc)
+                gphi = np.einsum('ijk, ikm->ijm', R, Dlambda[cidx])
+                gval[idx] = np.einsum('ijm, ij...->i...m', gphi, uc)
+
+        if grad:
+            return val, gval
+        else:
+            return val
+
     def interpolation(self, u, dim=None):
         ipoint = self.dof.interpolation_points()
         uI = u(ipoint)
@@ -349,18 +497,66 @@ class LagrangeFiniteElementSpace():
             shape = (gdof, ) + dim
         return np.zeros(shape, dtype=self.ftype)
 
-    def stiff_matrix(self, cfun=None):
+    def stiff_matrix(self, cfun=None, chunksize=None, nthreads=None):
+        """
+        assemble the stiffness matrix
+
+        Parameters
+        ----------
+        cfun : the coefficient function
+        chunksize : int
+            if it is not None, assemble the element matrices block by block
+            with `chunksize` cells in a block, so the peak memory is set by
+            the block size and not the number of cells
+        nthreads : int
+            the number of threads to assemble the blocks
+        """
         p = self.p
-        GD = self.geo_dimension()
 
         if p == 0:
             raise ValueError('The space order is 0!')
 
+        Dlambda = self.mesh.grad_lambda()
+        cellmeasure = self.cellmeasure
+
+        def kernel(index):
+            return self.cell_stiff_matrix(
+                    cfun=cfun, index=index, Dlambda=Dlambda, cellmeasure=cellmeasure)
+
+        # Construct the stiffness matrix
+        if (chunksize is None) and (nthreads is None):
+            A = self.assembly_plan().assemble(kernel(np.s_[:]))
+        else:
+            A = self.assemble_blocks(kernel, chunksize=chunksize, nthreads=nthreads)
+        return A
+
+    def stiff_operator(self, cfun=None, isDDof=None):
+        """
+        the stiffness matrix as a matrix-free `LinearOperator`, see
+        `MatrixFreeOperator`
+        """
+        return MatrixFreeOperator(self, kind='stiff', cfun=cfun, isDDof=isDDof)
+
+    def mass_operator(self, cfun=None, isDDof=None):
+        return MatrixFreeOperator(self, kind='mass', cfun=cfun, isDDof=isDDof)
+
+    def cell_stiff_matrix(self, cfun=None, index=np.s_[:], Dlambda=None, cellmeasure=None):
+        """
+        compute the element stiffness matrices `(NC, ldof, ldof)` of the
+        cells `index`
+        """
+        GD = self.geo_dimension()
+
         bcs, ws = self.integrator.get_quadrature_points_and_weights()
-        gphi = self.grad_basis(bcs)
+        if Dlambda is None:
+            Dlambda = self.mesh.grad_lambda()
+        if cellmeasure is None:
+            cellmeasure = self.cellmeasure
+        R = self.lambda_grad_basis(bcs)
+        gphi = np.einsum('...ij, kjm->...kim', R, Dlambda[index])
 
         if cfun is not None:
-            ps = self.mesh.bc_to_point(bcs)
+            ps = self.mesh.bc_to_point(bcs, cellidx=index)
             d = cfun(ps)
 
             if isinstance(d, (int, float)):
@@ -389,19 +585,15 @@ class LagrangeFiniteElementSpace():
         # ws:(NQ,)
         # dgphi: (NQ, NC, ldof, GD)
         A = np.einsum('i, ijkm, ijpm, j->jkp',
-                ws, dgphi, gphi, self.cellmeasure,
+                ws, dgphi, gphi, cellmeasure[index],
                 optimize=True)
-        cell2dof = self.cell_to_dof()
-        ldof = self.number_of_local_dofs()
-        I = np.einsum('k, ij->ijk', np.ones(ldof), cell2dof)
-        J = I.swapaxes(-1, -2)
-        gdof = self.number_of_global_dofs()
-
-        # Construct the stiffness matrix
-        A = csr_matrix((A.flat, (I.flat, J.flat)), shape=(gdof, gdof))
         return A
 
-    def mass_matrix(self, cfun=None, barycenter=False):
+    def mass_matrix(self, cfun=None, barycenter=False, chunksize=None, nthreads=None):
+        """
+        assemble the mass matrix, see `stiff_matrix` for `chunksize` and
+        `nthreads`
+        """
         p = self.p
         mesh = self.mesh
         cellmeasure = self.cellmeasure
@@ -411,17 +603,38 @@ class LagrangeFiniteElementSpace():
             M = spdiags(cellmeasure, 0, NC, NC)
             return M
 
+        def kernel(index):
+            return self.cell_mass_matrix(
+                    cfun=cfun, barycenter=barycenter, index=index,
+                    cellmeasure=cellmeasure)
+
+        if (chunksize is None) and (nthreads is None):
+            M = self.assembly_plan().assemble(kernel(np.s_[:]))
+        else:
+            M = self.assemble_blocks(kernel, chunksize=chunksize, nthreads=nthreads)
+        return M
+
+    def cell_mass_matrix(self, cfun=None, barycenter=False, index=np.s_[:], cellmeasure=None):
+        """
+        compute the element mass matrices `(NC, ldof, ldof)` of the cells
+        `index`
+        """
         # bcs: (NQ, TD+1)
         # ws: (NQ, )
         bcs, ws = self.integrator.get_quadrature_points_and_weights()
         # phi: (NQ, ldof)
         phi = self.basis(bcs)
+        if cellmeasure is None:
+            cellmeasure = self.cellmeasure
+        cellmeasure = cellmeasure[index]
 
         if cfun is not None:
             if barycenter is True:
                 d = cfun(bcs)
+                if isinstance(d, np.ndarray):
+                    d = d[..., index]
             else:
-                ps = self.mesh.bc_to_point(bcs) # (NQ, NC, GD)
+                ps = self.mesh.bc_to_point(bcs, cellidx=index) # (NQ, NC, GD)
                 d = cfun(ps) # (NQ, NC)
 
             if isinstance(d, (int, float)):
@@ -448,40 +661,86 @@ class LagrangeFiniteElementSpace():
         elif len(dphi.shape) == 3:
             M = np.einsum(
                     'm, mij, mk, i->ijk',
-                    ws, dphi, phi, self.cellmeasure,
+                    ws, dphi, phi, cellmeasure,
                     optimize=True)
+        return M
 
-        cell2dof = self.cell_to_dof()
-        ldof = self.number_of_local_dofs()
-        I = np.einsum('ij, k->ijk',  cell2dof, np.ones(ldof))
-        J = I.swapaxes(-1, -2)
+    def source_vector(self, f, surface=None, chunksize=None, nthreads=None):
+        """
+        assemble the load vector, see `stiff_matrix` for `chunksize` and
+        `nthreads`
 
-        gdof = self.number_of_global_dofs()
-        M = csr_matrix((M.flat, (I.flat, J.flat)), shape=(gdof, gdof))
-        return M
+        Parameters
+        ----------
+        f : the source function, a list of `K` source functions, or the
+            values `(NQ, NC)` or `(NQ, NC, K)` at the quadrature points of
+            `self.integrator`, see `source_value`
 
-    def source_vector(self, f, surface=None):
+        Returns
+        -------
+        b : (gdof, ) or (gdof, K), the load vectors of all the sources are
+            summed by one scatter
+        """
         p = self.p
 
         cellmeasure = self.cellmeasure
         bcs, ws = self.integrator.get_quadrature_points_and_weights()
-        pp = self.mesh.bc_to_point(bcs)
-        if surface is not None:
-            pp, _ = surface.project(pp)
-        fval = f(pp)
 
         if p > 0:
-            phi = self.basis(bcs)
-            # bb: (NC, ldof)
-            bb = np.einsum('m, mi, mk, i->ik',
-                    ws, fval, phi, self.cellmeasure)
+            def kernel(index):
+                return self.cell_source_vector(
+                        f, surface=surface, index=index, cellmeasure=cellmeasure)
+
             cell2dof = self.cell_to_dof() #(NC, ldof)
             gdof = self.number_of_global_dofs()
-            b = np.bincount(cell2dof.flat, weights=bb.flat, minlength=gdof)
+            if (chunksize is None) and (nthreads is None):
+                chunksize = cell2dof.shape[0]
+            else:
+                chunksize = self.block_size(chunksize, nthreads)
+            b = assemble_vector_blocks(
+                    kernel, cell2dof, gdof, chunksize, nthreads=nthreads)
         else:
-            b = np.einsum('i, ik, k->k', ws, fval, cellmeasure)
+            fval = self.source_value(f, bcs, surface=surface)
+            b = np.einsum('i, ik..., k->k...', ws, fval, cellmeasure)
         return b
 
+    def source_value(self, f, bcs, index=np.s_[:], surface=None):
+        """
+        the values of the sources at the quadrature points `bcs` of the
+        cells `index`, `(NQ, n)` for one source and `(NQ, n, K)` for `K`
+        sources
+
+        The physical quadrature points come from `mesh.bc_to_point`, which
+        is cached by the meshes with a `GeometryCache`, so they are computed
+        once for many calls with the same quadrature.
+        """
+        if isinstance(f, np.ndarray):
+            return f[:, index]
+        NC = self.mesh.number_of_cells()
+        if isinstance(index, slice) and (index.indices(NC) == (0, NC, 1)):
+            # all the cells share one cache entry
+            index = None
+        pp = self.mesh.bc_to_point(bcs, cellidx=index)
+        if surface is not None:
+            pp, _ = surface.project(pp)
+        if isinstance(f, (list, tuple)):
+            return np.stack([fi(pp) for fi in f], axis=-1)
+        return f(pp)
+
+    def cell_source_vector(self, f, surface=None, index=np.s_[:], cellmeasure=None):
+        """
+        compute the element load vectors `(NC, ldof)` or `(NC, ldof, K)` of
+        the cells `index`, see `source_vector` for `f`
+        """
+        bcs, ws = self.integrator.get_quadrature_points_and_weights()
+        if cellmeasure is None:
+            cellmeasure = self.cellmeasure
+        phi = self.basis(bcs)
+        fval = self.source_value(f, bcs, index=index, surface=surface)
+        # bb: (NC, ldof) or (NC, ldof, K)
+        bb = np.einsum('m, mi..., mk, i->ik...', ws, fval, phi, cellmeasure[index])
+        return bb
+
 
 class VectorLagrangeFiniteElementSpace():
     def __init__(self, mesh, p, spacetype='C'):
@@ -517,6 +776,9 @@ class VectorLagrangeFiniteElementSpace():
         isBdDof = self.dof.boundary_dof()
         return np.repeat(isBdDof, GD)
 
+    def boundary_dof(self):
+        return self.boundary_dof_flag()
+
     def number_of_global_dofs(self):
         return self.GD*self.dof.number_of_global_dofs()
 
@@ -579,54 +841,109 @@ class VectorLagrangeFiniteElementSpace():
         uI[cell2dof] = u(p)
         return uI
 
-    def stiff_matrix(self, qf, measure):
-        p = self.p
-        mesh = self.mesh
+    def stiff_matrix(self, cfun=None, chunksize=None, nthreads=None, format='csr'):
+        """
+        assemble the stiffness matrix of every component, see
+        `LagrangeFiniteElementSpace.stiff_matrix` for the parameters
+
+        The dofs of the components are interleaved, see `cell_to_dof`, so
+        the matrix is made of `GD x GD` blocks. With `format='bsr'` it is
+        returned in BSR format, whose index arrays are the ones of the scalar
+        matrix. BSR matrices can not be sliced, such as `A[isFreeDof, :]`,
+        so the default is CSR.
+        """
+        S = self.scalarspace.stiff_matrix(
+                cfun=cfun, chunksize=chunksize, nthreads=nthreads)
+        return self.block_diag_matrix(S, format=format)
+
+    def mass_matrix(self, cfun=None, barycenter=False, chunksize=None,
+            nthreads=None, format='csr'):
+        M = self.scalarspace.mass_matrix(
+                cfun=cfun, barycenter=barycenter,
+                chunksize=chunksize, nthreads=nthreads)
+        return self.block_diag_matrix(M, format=format)
+
+    def block_diag_matrix(self, S, format='csr'):
+        """ The matrix `S` of the scalar space acting on every component
+        """
         GD = self.GD
-        S = self.scalarspace.stiff_matrix(qf, measure)
+        S = S.tocsr()
+        S.sum_duplicates()
+        if format == 'bsr':
+            data = S.data[:, None, None]*np.eye(GD)
+            gdof = self.number_of_global_dofs()
+            return bsr_matrix((data, S.indices, S.indptr), shape=(gdof, gdof))
+        else:
+            return kron(S, eye(GD), format=format)
 
-        I, J = np.nonzero(S)
-        gdof = self.number_of_global_dofs()
-        A = coo_matrix(gdof, gdof)
-        for i in range(self.GD):
-            A += coo_matrix((S.data, (GD*I + i, GD*J + i)), shape=(gdof, gdof), dtype=mesh.ftype)
-        return A.tocsr() 
+    def linear_elasticity_matrix(self, mu, lam, format='csr'):
+        """
+        assemble the matrix of `(2 mu eps(u), eps(v)) + (lam div u, div v)`
 
-    def mass_matrix(self, qf, measure, cfun=None, barycenter=True):
-        p = self.p
-        mesh = self.mesh
+        Parameters
+        ----------
+        mu, lam : the Lame constants
+        format : the format of the scipy sparse matrix returned, the
+            matrix is assembled in BSR format with `GD x GD` blocks
+        """
         GD = self.GD
+        scalarspace = self.scalarspace
+        bcs, ws = scalarspace.integrator.get_quadrature_points_and_weights()
+        # gphi: (NQ, NC, ldof, GD)
+        gphi = scalarspace.grad_basis(bcs)
+        cellmeasure = scalarspace.cellmeasure
+
+        # G: (NC, ldof, ldof), H[c, i, j, a, b] = (d_a phi_i, d_b phi_j)
+        G = np.einsum('q, qcid, qcjd, c->cij',
+                ws, gphi, gphi, cellmeasure, optimize=True)
+        H = np.einsum('q, qcia, qcjb, c->cijab',
+                ws, gphi, gphi, cellmeasure, optimize=True)
+        K = mu*H.swapaxes(-1, -2) + lam*H
+        K += mu*G[..., None, None]*np.eye(GD)
+
+        A = scalarspace.assembly_plan().assemble_bsr(K)
+        if format == 'bsr':
+            return A
+        else:
+            return A.asformat(format)
 
-        M = self.scalarspace.mass_matrix(qf, measure, cfun=cfun, barycenter=barycenter)
-        I, J = np.nonzero(M)
-        gdof = self.number_of_global_dofs()
-        A = coo_matrix(gdof, gdof)
-        for i in range(self.GD):
-            A += coo_matrix((M.data, (GD*I + i, GD*J + i)), shape=(gdof, gdof), dtype=mesh.ftype)
-        return A.tocsr() 
-
-    def source_vector(self, f, qf, measure, surface=None):
+    def source_vector(self, f, qf=None, measure=None, surface=None,
+            chunksize=None, nthreads=None):
+        """
+        assemble the load vector, `f` can also be a list of `K` source
+        functions or the values `(NQ, NC, GD)` or `(NQ, NC, GD, K)` at the
+        quadrature points, then the shape of the result is `(gdof, K)`
+        """
         p = self.p
         mesh = self.mesh
         GD = self.GD
-        bcs, ws = qf.quadpts, qf.weights
-        pp = self.mesh.bc_to_point(bcs)
-        if surface is not None:
-            pp, _ = surface.project(pp)
+        scalarspace = self.scalarspace
+        if qf is None:
+            bcs, ws = scalarspace.integrator.get_quadrature_points_and_weights()
+        else:
+            bcs, ws = qf.quadpts, qf.weights
+        if measure is None:
+            measure = scalarspace.cellmeasure
 
-        fval = f(pp)
         if p > 0:
-            phi = self.scalarspace.basis(bcs)
+            phi = scalarspace.basis(bcs)
+
+            def kernel(index):
+                fval = scalarspace.source_value(
+                        f, bcs, index=index, surface=surface)
+                return np.einsum('q, qkm..., qi, k->kim...',
+                        ws, fval, phi, measure[index])
+
             cell2dof = self.dof.cell2dof
             gdof = self.dof.number_of_global_dofs()
-            b = np.zeros((gdof, GD), dtype=mesh.ftype)
-            for i in range(GD):
-                bb = np.einsum('i, ik, i..., k->k...', ws, fval[..., i], phi, measure)
-                b[:, i]  = np.bincount(cell2dof.flat, weights=bb.flat, minlength=gdof)
+            chunksize = scalarspace.block_size(chunksize, nthreads)
+            b = assemble_vector_blocks(
+                    kernel, cell2dof, gdof, chunksize, nthreads=nthreads)
         else:
-            b = np.einsum('i, ikm, k->km', ws, fval,  measure)
+            fval = scalarspace.source_value(f, bcs, surface=surface)
+            b = np.einsum('i, ikm..., k->km...', ws, fval,  measure)
 
-        return b.reshape(-1)
+        return b.reshape((-1, ) + b.shape[2:])
 
 
 class SymmetricTensorLagrangeFiniteElementSpace():
@@ -638,8 +955,9 @@ class SymmetricTensorLagrangeFiniteElementSpace():
         self.dof = self.scalarspace.dof
         self.GD = self.scalarspace.GD
         self.TD = self.scalarspace.TD
+        self.dim = self.GD
 
-        if self.TD == 2:
+        if self.dim == 2:
             self.T = np.array([[(1, 0), (0, 0)], [(0, 1), (1, 0)], [(0, 0), (0, 1)]])
         elif self.dim == 3:
             self.T = np.array([
@@ -687,7 +1005,7 @@ class SymmetricTensorLagrangeFiniteElementSpace():
         dim = self.dim
         phi = self.scalarspace.basis(bcs)
         shape = list(phi.shape[:-1])
-        phi = np.einsum('...j, mno->...jmno', phi0, self.T)
+        phi = np.einsum('...j, mno->...jmno', phi, self.T)
         shape += [-1, dim, dim]
         return phi.reshape(shape)
 
@@ -709,6 +1027,41 @@ class SymmetricTensorLagrangeFiniteElementSpace():
         val = np.einsum('...jm, ij->...im',  phi, uh0) 
         return val 
 
+    def mass_matrix(self, cfun=None, barycenter=False, chunksize=None, nthreads=None):
+        """
+        assemble the mass matrix with the Frobenius inner product of the
+        tensors, see `LagrangeFiniteElementSpace.stiff_matrix` for the
+        parameters
+        """
+        M = self.scalarspace.mass_matrix(
+                cfun=cfun, barycenter=barycenter,
+                chunksize=chunksize, nthreads=nthreads)
+        G = np.einsum('imn, jmn->ij', self.T, self.T)
+        return kron(M, G, format='csr')
+
+    def source_vector(self, f, chunksize=None, nthreads=None):
+        """
+        assemble the load vector of `f`, which returns the tensors with the
+        shape `(..., dim, dim)`
+        """
+        scalarspace = self.scalarspace
+        mesh = self.mesh
+        bcs, ws = scalarspace.integrator.get_quadrature_points_and_weights()
+        phi = scalarspace.basis(bcs)
+        measure = scalarspace.cellmeasure
+
+        def kernel(index):
+            fval = f(mesh.bc_to_point(bcs, cellidx=index))
+            return np.einsum('q, qkmn, qi, k, jmn->kij',
+                    ws, fval, phi, measure[index], self.T, optimize=True)
+
+        cell2dof = self.dof.cell2dof
+        gdof = self.dof.number_of_global_dofs()
+        chunksize = scalarspace.block_size(chunksize, nthreads)
+        b = assemble_vector_blocks(
+                kernel, cell2dof, gdof, chunksize, nthreads=nthreads)
+        return b.reshape(-1)
+
     def function(self, dim=None):
         f = Function(self)
         return f
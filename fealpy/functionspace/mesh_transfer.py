@@ -0,0 +1,237 @@
+import numpy as np
+from scipy.sparse import csr_matrix, spdiags
+from scipy.sparse.linalg import splu
+from scipy.spatial import cKDTree
+
+from .function import Function
+
+
+class MeshTransfer():
+    """ Transfer the functions of a Lagrange finite element space on a mesh to
+    the same kind of space on another mesh, the meshes need not be nested
+
+    Parameters
+    ----------
+    space0 : the source LagrangeFiniteElementSpace
+    space1 : the target LagrangeFiniteElementSpace
+    method : 'interpolation', 'L2' or 'lumped'
+        'interpolation' evaluates the source function at the interpolation
+        points of `space1`. 'L2' is the L2 projection `M1 u1 = B u0`, where
+        `B_ij = (phi1_i, phi0_j)` is the mixed mass matrix. 'lumped' uses the
+        lumped mass matrix instead of `M1` and only works for `p = 1`.
+    q : the index of the quadrature for `B`, default `p0 + p1`
+
+    Notes
+    -----
+    The transfer is assembled once and stored in `self.matrix`, which is the
+    interpolation matrix, the mixed mass matrix `B` or `diag(M1)^{-1} B`, and
+    `M1` is factorized once for 'L2'. So one transfer can be applied to any
+    number of fields with the shape `(gdof0, ...)`.
+
+    On triangle meshes `B` is integrated exactly on the intersections of the
+    cells of the two meshes, so 'L2' and 'lumped' preserve the integral of the
+    function on the common domain. On tetrahedron meshes `B` is integrated by
+    the quadrature on the cells of the target mesh.
+
+    The points of the target mesh out of the source mesh, which are common
+    near curved boundaries after remeshing, take the values at the nearest
+    points of the nearest cells.
+
+    Example
+    -------
+    T = MeshTransfer(space0, space1, method='L2')
+    U1 = T(U0)
+    """
+    def __init__(self, space0, space1, method='interpolation', q=None):
+        self.space0 = space0
+        self.space1 = space1
+        self.method = method
+
+        from ..mesh.CellLocator import CellLocator
+        self.locator = CellLocator(space0.mesh)
+
+        if method == 'interpolation':
+            self.matrix = self.interpolation_matrix()
+        elif method in {'L2', 'lumped'}:
+            B = self.mixed_mass_matrix(q=q)
+            M = space1.mass_matrix()
+            if method == 'L2':
+                self.matrix = B
+                self.solver = splu(M.tocsc())
+            elif space1.p == 1:
+                m = np.asarray(M.sum(axis=1)).reshape(-1)
+                self.matrix = (spdiags(1/m, 0, len(m), len(m))@B).tocsr()
+            else:
+                raise ValueError("The lumped L2 projection only works for p = 1!")
+        else:
+            raise ValueError("the transfer method `{}` is not supported!".format(method))
+
+    def __call__(self, uh):
+        shape = uh.shape
+        val = self.matrix@uh.reshape(shape[0], -1)
+        if self.method == 'L2':
+            val = self.solver.solve(val)
+        val = val.reshape((-1, ) + shape[1:])
+        return Function(self.space1, array=val)
+
+    def locate(self, points):
+        """ Locate the points in the source mesh, the points out of it are
+        moved into the nearest cells
+        """
+        cidx, bc = self.locator.find(points)
+        isLost = cidx < 0
+        if np.any(isLost):
+            mesh = self.space0.mesh
+            tree = cKDTree(mesh.entity_barycenter('cell'))
+            _, c = tree.query(points[isLost])
+            b, _ = self.locator.barycentric(points[isLost], c)
+            b = np.maximum(b, 0)
+            cidx[isLost] = c
+            bc[isLost] = b/np.sum(b, axis=1, keepdims=True)
+        return cidx, bc
+
+    def interpolation_matrix(self):
+        space0 = self.space0
+        space1 = self.space1
+        points = space1.interpolation_points()
+        cidx, bc = self.locate(points)
+
+        phi = space0.basis(bc)
+        cell2dof = space0.cell_to_dof()
+        NP, ldof = phi.shape
+        I = np.repeat(np.arange(NP), ldof)
+        J = cell2dof[cidx]
+        shape = (space1.number_of_global_dofs(), space0.number_of_global_dofs())
+        return csr_matrix((phi.flat, (I, J.flat)), shape=shape)
+
+    def mixed_mass_matrix(self, q=None):
+        space0 = self.space0
+        space1 = self.space1
+        mesh1 = space1.mesh
+        if q is None:
+            q = space0.p + space1.p
+        qf = mesh1.integrator(q)
+        bcs, ws = qf.quadpts, qf.weights
+
+        cell2dof1 = space1.cell_to_dof()
+        cell2dof0 = space0.cell_to_dof()
+        if mesh1.meshtype == 'tri':
+            from ..mesh.CellLocator import CellLocator
+            locator1 = CellLocator(mesh1)
+            cell1, cell0, tri, start = self.cell_intersection()
+            area = np.abs(np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]))/2
+            ps = np.einsum('qj, ijk->iqk', bcs, tri)
+            NT, NQ, GD = ps.shape
+            bc1, _ = locator1.barycentric(ps.reshape(-1, GD), np.repeat(cell1, NQ))
+            bc0, _ = self.locator.barycentric(ps.reshape(-1, GD), np.repeat(cell0, NQ))
+            phi1 = space1.basis(bc1).reshape(NT, NQ, -1)
+            phi0 = space0.basis(bc0).reshape(NT, NQ, -1)
+
+            # sum the sub-triangles of each pair of cells
+            val = np.einsum('q, i, iqj, iqk->ijk', ws, area, phi1, phi0)
+            val = np.add.reduceat(val, start, axis=0)
+            cell1, cell0 = cell1[start], cell0[start]
+            I = np.broadcast_to(cell2dof1[cell1][:, :, None], val.shape)
+            J = np.broadcast_to(cell2dof0[cell0][:, None, :], val.shape)
+        elif mesh1.meshtype == 'tet':
+            ps = mesh1.bc_to_point(bcs).swapaxes(0, 1)
+            NT, NQ, GD = ps.shape
+            cellmeasure = mesh1.entity_measure('cell')
+            bc1 = np.tile(bcs, (NT, 1))
+            cell0, bc0 = self.locate(ps.reshape(-1, GD))
+            phi1 = space1.basis(bc1).reshape(NT, NQ, -1)
+            phi0 = space0.basis(bc0).reshape(NT, NQ, -1)
+
+            val = np.einsum('q, i, iqj, iqk->iqjk', ws, cellmeasure, phi1, phi0)
+            I = np.broadcast_to(cell2dof1[:, None, :, None], val.shape)
+            J = cell2dof0[cell0].reshape(NT, NQ, 1, -1)
+            J = np.broadcast_to(J, val.shape)
+        else:
+            raise ValueError("The L2 transfer is not supported on the mesh type `{}`!".format(mesh1.meshtype))
+
+        shape = (space1.number_of_global_dofs(), space0.number_of_global_dofs())
+        return csr_matrix((val.flat, (I.flat, J.flat)), shape=shape)
+
+    def cell_intersection(self):
+        """ Intersect the cells of two triangle meshes
+
+        Returns
+        -------
+        cell1 : the target cell of each sub-triangle
+        cell0 : the source cell of each sub-triangle
+        tri : (NT, 3, 2) the sub-triangles which cover the intersections
+        start : the first sub-triangle of each pair of intersecting cells,
+            the sub-triangles of one pair are stored together
+        """
+        mesh0 = self.space0.mesh
+        mesh1 = self.space1.mesh
+        node0 = mesh0.entity('node')
+        node1 = mesh1.entity('node')
+        cell0 = mesh0.entity('cell')
+        cell1 = mesh1.entity('cell')
+
+        p1 = node1[cell1]
+        i1, i0 = self.locator.intersect_box(np.min(p1, axis=1), np.max(p1, axis=1))
+        poly = p1[i1]
+        n = np.full(len(i1), 3)
+
+        # clip the target cells by the edges of the source cells in the
+        # counterclockwise order
+        p0 = node0[cell0[i0]]
+        isCW = np.cross(p0[:, 1] - p0[:, 0], p0[:, 2] - p0[:, 0]) < 0
+        p0[isCW] = p0[isCW][:, ::-1]
+        for i in range(3):
+            poly, n = clip_polygon(poly, n, p0[:, i], p0[:, (i+1)%3])
+
+        # split the convex polygons into triangles around the first vertex
+        tri = []
+        cell = []
+        for k in range(1, poly.shape[1] - 1):
+            idx, = np.nonzero(n > k + 1)
+            tri.append(poly[idx][:, [0, k, k+1]])
+            cell.append(idx)
+        idx = np.concatenate(cell)
+        tri = np.concatenate(tri)
+        i = np.argsort(idx, kind='stable')
+        idx = idx[i]
+        start, = np.nonzero(np.r_[True, idx[1:] != idx[:-1]])
+        return i1[idx], i0[idx], tri[i], start
+
+
+def clip_polygon(poly, n, a, b):
+    """ Clip the convex polygons by the left half-planes of the lines `a->b`
+
+    Parameters
+    ----------
+    poly : (NP, M, 2) the vertices of the polygons, padded to `M`
+    n : (NP, ) the number of the vertices of each polygon
+    a, b : (NP, 2) two points on each line
+
+    Returns
+    -------
+    poly, n : the clipped polygons in the same format
+    """
+    NP, M, _ = poly.shape
+    idx = np.arange(M)
+    isValid = idx < n[:, None]
+    nxt = (idx + 1)%np.maximum(n, 1)[:, None]
+    q0 = poly
+    q1 = np.take_along_axis(poly, nxt[..., None], axis=1)
+
+    e = b - a
+    s0 = np.cross(e[:, None, :], q0 - a[:, None, :])
+    s1 = np.cross(e[:, None, :], q1 - a[:, None, :])
+    isKept = isValid & (s0 >= 0)
+    isCut = isValid & (((s0 > 0) & (s1 < 0)) | ((s0 < 0) & (s1 > 0)))
+    t = np.zeros_like(s0)
+    t[isCut] = s0[isCut]/(s0[isCut] - s1[isCut])
+    x = q0 + t[..., None]*(q1 - q0)
+
+    # keep the vertex and then the cut point of each edge in order
+    flag = np.stack([isKept, isCut], axis=2).reshape(NP, 2*M)
+    val = np.stack([q0, x], axis=2).reshape(NP, 2*M, 2)
+    idx = np.argsort(~flag, axis=1, kind='stable')
+    n = np.sum(flag, axis=1)
+    M = max(np.max(n, initial=0), 3)
+    poly = np.take_along_axis(val, idx[:, :M, None], axis=1)
+    return poly, n
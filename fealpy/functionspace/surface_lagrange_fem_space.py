@@ -2,6 +2,7 @@ import numpy as np
 from numpy.linalg import inv
 from scipy.sparse import coo_matrix, csr_matrix, spdiags
 from .function import Function
+from .AssemblyPlan import AssemblyPlan
 from ..common import ranges
 from .femdof import CPLFEMDof2d, DPLFEMDof2d
 from fealpy.mesh import SurfaceTriangleMesh
@@ -62,10 +63,17 @@ class SurfaceLagrangeFiniteElementSpace:
             self.integrator = self.mesh.integrator(q)
 
         self.integralalg = FEMeshIntegralAlg(self.integrator, self.mesh, self.cellmeasure)
+        self.plan = None
 
     def __str__(self):
         return "Lagrange finite element space on surface triangle mesh!"
 
+    def assembly_plan(self):
+        if self.plan is None:
+            self.plan = AssemblyPlan(
+                    self.cell_to_dof(), self.number_of_global_dofs())
+        return self.plan
+
     def stiff_matrix(self):
         p = self.p
         GD = self.mesh.geo_dimension()
@@ -75,14 +83,9 @@ class SurfaceLagrangeFiniteElementSpace:
 
         # Compute the element sitffness matrix
         A = np.einsum('i, ijkm, ijpm, j->jkp', ws, gphi, gphi, self.cellmeasure, optimize=True)
-        cell2dof = self.cell_to_dof()
-        ldof = self.number_of_local_dofs()
-        I = np.einsum('k, ij->ijk', np.ones(ldof), cell2dof)
-        J = I.swapaxes(-1, -2)
 
         # Construct the stiffness matrix
-        gdof = self.number_of_global_dofs()
-        A = csr_matrix((A.flat, (I.flat, J.flat)), shape=(gdof, gdof))
+        A = self.assembly_plan().assemble(A)
         return A
 
     def mass_matrix(self):
@@ -92,14 +95,9 @@ class SurfaceLagrangeFiniteElementSpace:
         bcs, ws = self.integrator.get_quadrature_points_and_weights()
         phi = self.basis(bcs)
         M = np.einsum('m, mj, mk, i->ijk', ws, phi, phi, self.cellmeasure, optimize=True)
-        cell2dof = self.cell_to_dof()
-        ldof = self.number_of_local_dofs()
-        I = np.einsum('k, ij->ijk', np.ones(ldof), cell2dof)
-        J = I.swapaxes(-1, -2)
 
         # Construct the stiffness matrix
-        gdof = self.number_of_global_dofs()
-        M = csr_matrix((M.flat, (I.flat, J.flat)), shape=(gdof, gdof))
+        M = self.assembly_plan().assemble(M)
         return M
 
     def source_vector(self, f):
@@ -0,0 +1,199 @@
+import numpy as np
+
+
+class CellLocator():
+    """ A bucket grid spatial index over the cells of a simplex mesh
+
+    Parameters
+    ----------
+    mesh : TriangleMesh (2d or surface) or TetrahedronMesh
+    h : the bucket size, default the average cell size
+    tol : the cell bounding boxes are enlarged by `tol`. For a surface mesh
+        it is the largest distance from a point to the surface which can be
+        located, default a fifth of the average cell size. The point is
+        located in the nearby cell closest to its projection, and
+        the barycentric coordinates are clipped into the cell.
+    chunksize : the number of points processed at one time
+
+    Notes
+    -----
+    Every cell is registered in all buckets overlapped by its bounding box,
+    and the relation between the nonempty buckets and the cells is stored in
+    CSR format. A point is tested against the cells in its bucket with
+    barycentric coordinates, all in vectorized form.
+
+    Example
+    -------
+    locator = CellLocator(mesh)
+    cidx, bc = locator.find(points)
+    """
+    def __init__(self, mesh, h=None, tol=None, chunksize=2**16):
+        node = mesh.entity('node')
+        cell = mesh.entity('cell')
+        self.GD = node.shape[1]
+        self.TD = cell.shape[1] - 1
+        self.NC = cell.shape[0]
+        self.chunksize = chunksize
+
+        # the affine map of each cell: x = x0 + J lambda[1:]
+        self.x0 = node[cell[:, 0]]
+        self.J = (node[cell[:, 1:]] - self.x0[:, None, :]).swapaxes(-1, -2)
+        if self.TD == self.GD:
+            self.invJ = np.linalg.inv(self.J)
+        else:
+            JT = self.J.swapaxes(-1, -2)
+            self.invJ = np.linalg.solve(JT@self.J, JT)
+
+        box0 = np.min(node[cell], axis=1)
+        box1 = np.max(node[cell], axis=1)
+        if h is None:
+            h = np.mean(np.max(box1 - box0, axis=1))
+        if tol is None:
+            tol = 0.2*h if self.TD < self.GD else 0.0
+        self.tol = tol
+        box0 -= tol
+        box1 += tol
+
+        self.origin = np.min(box0, axis=0)
+        self.h = h
+        self.shape = np.floor((np.max(box1, axis=0) - self.origin)/h).astype(np.int_) + 1
+
+        self.box0 = box0
+        self.box1 = box1
+
+        cidx, bidx = self.box_to_bucket(box0, box1)
+        idx = np.argsort(bidx, kind='stable')
+        self.bucket2cell = cidx[idx]
+        self.bucket, num = np.unique(bidx[idx], return_counts=True)
+        self.bucketLocation = np.zeros(len(num) + 1, dtype=np.int_)
+        self.bucketLocation[1:] = np.cumsum(num)
+
+    def bucket_index(self, p):
+        i = np.floor((p - self.origin)/self.h).astype(np.int_)
+        return np.clip(i, 0, self.shape - 1)
+
+    def box_to_bucket(self, box0, box1):
+        """ Enumerate the buckets overlapped by the boxes `[box0, box1]`,
+        return the box indices and the bucket indices
+        """
+        i0 = self.bucket_index(box0)
+        i1 = self.bucket_index(box1)
+        n = i1 - i0 + 1
+        nb = np.prod(n, axis=1)
+        idx = np.repeat(np.arange(len(box0)), nb)
+
+        k = local_index(nb)
+        n = n[idx]
+        bidx = np.zeros(len(idx), dtype=np.int_)
+        for d in range(self.GD):
+            bidx = bidx*self.shape[d] + i0[idx, d] + k%n[:, d]
+            k = k//n[:, d]
+        return idx, bidx
+
+    def bucket_to_cell(self, bidx):
+        """ The cells registered in the buckets `bidx`, return the positions
+        in `bidx` and the cell indices
+        """
+        i = np.searchsorted(self.bucket, bidx)
+        i[i == len(self.bucket)] = 0
+        location = self.bucketLocation
+        nc = location[i + 1] - location[i]
+        nc[self.bucket[i] != bidx] = 0
+        idx = np.repeat(np.arange(len(bidx)), nc)
+        cidx = self.bucket2cell[np.repeat(location[i], nc) + local_index(nc)]
+        return idx, cidx
+
+    def intersect_box(self, box0, box1):
+        """ Find the pairs of the boxes `[box0, box1]` and the cells whose
+        bounding boxes overlap
+
+        Returns
+        -------
+        idx : the box indices
+        cidx : the cell indices
+        """
+        idx, bidx = self.box_to_bucket(box0, box1)
+        i, cidx = self.bucket_to_cell(bidx)
+        idx = idx[i]
+
+        # a pair may be found in several buckets
+        key = np.unique(idx*self.NC + cidx)
+        idx = key//self.NC
+        cidx = key%self.NC
+        isOverlap = np.all(
+                (box0[idx] <= self.box1[cidx]) & (box1[idx] >= self.box0[cidx]),
+                axis=1)
+        return idx[isOverlap], cidx[isOverlap]
+
+    def barycentric(self, p, cidx):
+        """ The barycentric coordinates of the points `p` in the cells `cidx`,
+        and the distances from `p` to the planes of the cells
+        """
+        v = p - self.x0[cidx]
+        bc = np.zeros((len(cidx), self.TD + 1), dtype=p.dtype)
+        bc[:, 1:] = np.einsum('ijk, ik->ij', self.invJ[cidx], v)
+        bc[:, 0] = 1 - np.sum(bc[:, 1:], axis=1)
+        if self.TD < self.GD:
+            v -= np.einsum('ijk, ik->ij', self.J[cidx], bc[:, 1:])
+            d = np.linalg.norm(v, axis=1)
+        else:
+            d = np.zeros(len(cidx), dtype=p.dtype)
+        return bc, d
+
+    def find(self, p, eps=1e-10):
+        """ Locate the points `p`
+
+        Returns
+        -------
+        cidx : (NP, ) the index of the cell containing each point, -1 if the
+            point is not in the mesh
+        bc : (NP, TD+1) the barycentric coordinates in the cell
+        """
+        NP = p.shape[0]
+        cidx = -np.ones(NP, dtype=np.int_)
+        bc = np.zeros((NP, self.TD + 1), dtype=p.dtype)
+        for start in range(0, NP, self.chunksize):
+            end = min(start + self.chunksize, NP)
+            cidx[start:end], bc[start:end] = self._find(p[start:end], eps)
+        return cidx, bc
+
+    def _find(self, p, eps):
+        NP = p.shape[0]
+        bidx = np.zeros(NP, dtype=np.int_)
+        i = self.bucket_index(p)
+        for d in range(self.GD):
+            bidx = bidx*self.shape[d] + i[:, d]
+
+        # all the (point, candidate cell) pairs
+        pidx, cidx = self.bucket_to_cell(bidx)
+
+        bc, d = self.barycentric(p[pidx], cidx)
+        out = np.maximum(-np.min(bc, axis=1), 0)
+        if self.TD < self.GD:
+            # near a vertex of a curved surface the projection of a point may
+            # be out of all the cells around, so keep the candidates near to
+            # the point and choose the least outside one
+            isIn = d <= self.tol + eps
+        else:
+            isIn = out <= eps
+        pidx, cidx, bc, d, out = pidx[isIn], cidx[isIn], bc[isIn], d[isIn], out[isIn]
+
+        c = -np.ones(NP, dtype=np.int_)
+        b = np.zeros((NP, self.TD + 1), dtype=p.dtype)
+        if len(pidx) == 0:
+            return c, b
+        idx = np.lexsort((cidx, d, out, pidx))
+        idx = idx[np.r_[True, pidx[idx][1:] != pidx[idx][:-1]]]
+        c[pidx[idx]] = cidx[idx]
+        b[pidx[idx]] = bc[idx]
+        if self.TD < self.GD:
+            b = np.maximum(b, 0)
+            isFound = c >= 0
+            b[isFound] /= np.sum(b[isFound], axis=1, keepdims=True)
+        return c, b
+
+
+def local_index(n):
+    """ `np.r_[0:n[0], 0:n[1], ...]` without a python loop
+    """
+    return np.arange(np.sum(n)) - np.repeat(np.cumsum(n) - n, n)
@@ -0,0 +1,87 @@
+import zlib
+import weakref
+import numpy as np
+
+from ..common import ArrayCache
+
+
+class GeometryCache(ArrayCache):
+    """ The cache of the geometric quantities of a mesh, such as
+    `grad_lambda`, the jacobi matrices, the measures and `bc_to_point`
+
+    Parameters
+    ----------
+    mesh : the mesh with `node` and `ds.cell`, and `ds.cellLocation` for
+        the polygon meshes
+    maxsize : the memory budget in bytes, see `ArrayCache`
+    dtype : the float type of the cached arrays, such as `np.float32` to
+        halve the memory. Default the arrays are kept as they are computed.
+    nsample : the number of the rows of `node` in the checksum
+
+    Notes
+    -----
+    The mesh methods decorated by `cached` are memoized here, and so are the
+    data of the spaces built on the mesh, such as the projection matrices of
+    the virtual element spaces. Before every lookup the state of the mesh is
+    compared with the one of the cached data, and the cache is cleared when
+    it is changed. The state is the identity and the shape of `node` and
+    `cell`, the `version` of the data structure, which counts the rebuilds
+    of the topology, and a CRC32 of `nsample` rows of `node` taken with a
+    fixed stride, so the check does not depend on the size of the mesh.
+
+    A new `node` array, a refinement and the nodes moved in place, as in
+    `mesh.node[:] = ...` or `mesh.node *= 2`, are found. All the nodes are
+    in the checksum of a mesh with at most `nsample` nodes. On a larger
+    mesh only the moves of a few nodes between the sampled rows, such as a
+    local smoothing, are missed, call `clear()` after them.
+
+    Example
+    -------
+    mesh.cache = GeometryCache(mesh, dtype=np.float32)
+    """
+    def __init__(self, mesh, maxsize=2**28, dtype=None, nsample=2**12):
+        super().__init__(maxsize=maxsize)
+        self.mesh = weakref.ref(mesh)
+        self.dtype = dtype
+        self.nsample = nsample
+        self.state = None
+
+    def checksum(self, node):
+        stride = max(1, -(-len(node)//self.nsample))
+        return zlib.crc32(np.ascontiguousarray(node[::stride]))
+
+    def is_current(self, version, arrays, checksum):
+        state = self.state
+        if (state is None) or (state[0] != version) or (state[2] != checksum):
+            return False
+        return all((r() is a) and (shape == a.shape)
+                for (r, shape), a in zip(state[1], arrays))
+
+    def fetch(self, key, fun):
+        mesh = self.mesh()
+        arrays = [mesh.node, mesh.ds.cell]
+        if hasattr(mesh.ds, 'cellLocation'):
+            arrays.append(mesh.ds.cellLocation)
+        version = getattr(mesh.ds, 'version', None)
+        checksum = self.checksum(mesh.node)
+        with self.lock:
+            if not self.is_current(version, arrays, checksum):
+                self.clear()
+                # weak references, an array which is freed never matches
+                # a new one which gets its address
+                self.state = (
+                        version,
+                        [(weakref.ref(a), a.shape) for a in arrays],
+                        checksum)
+        return super().fetch(key, lambda: self.cast(fun()))
+
+    def cast(self, val):
+        dtype = self.dtype
+        if dtype is None:
+            return val
+        elif isinstance(val, np.ndarray) and (val.dtype.kind == 'f'):
+            return val.astype(dtype, copy=False)
+        elif isinstance(val, tuple):
+            return tuple(self.cast(a) for a in val)
+        else:
+            return val
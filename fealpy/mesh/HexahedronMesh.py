@@ -44,9 +44,19 @@ class HexahedronMesh(Mesh3d):
 
         self.meshtype = 'hex'
 
-        self.itype = cell.dtype
         self.ftype = node.dtype
 
+    @property
+    def itype(self):
+        """ The integer type of the index arrays, which follows the data
+        structure when the topology is rebuilt
+        """
+        return self.ds.itype
+
+    @itype.setter
+    def itype(self, itype):
+        self.ds.itype = itype
+
     def volume(self):
         pass
 
@@ -3,7 +3,9 @@ from .mesh_tools import unique_row, find_node, find_entity, show_mesh_1d
 from scipy.sparse import csr_matrix
 from types import ModuleType
 
-from ..quadrature import GaussLegendreQuadrature 
+from .GeometryCache import GeometryCache
+from ..quadrature import get_quadrature
+from ..common import cached
 
 class IntervalMesh():
     def __init__(self, node, cell):
@@ -17,10 +19,11 @@ class IntervalMesh():
 
         self.itype = cell.dtype
         self.ftype = node.dtype
+        self.cache = GeometryCache(self)
 
 
     def integrator(self, k):
-        return GaussLegendreQuadrature(k)
+        return get_quadrature('interval', k)
 
     def number_of_nodes(self):
         return self.ds.NN
@@ -44,6 +47,7 @@ class IntervalMesh():
         else:
             raise ValueError("`entitytype` is wrong!")
 
+    @cached
     def grad_lambda(self):
         node = self.node
         cell = self.ds.cell
@@ -90,6 +94,7 @@ class IntervalMesh():
         else:
             raise ValueError("`etype` is wrong!")
 
+    @cached
     def cell_length(self, cellidx=None):
         node = self.node
         cell = self.ds.cell
@@ -98,9 +103,12 @@ class IntervalMesh():
         else:
             return node[cell[cellidx, 1]] - node[cell[cellidx, 0]]
 
-    def bc_to_point(self, bc):
+    @cached
+    def bc_to_point(self, bc, cellidx=None):
         node = self.node
         cell = self.ds.cell
+        if cellidx is not None:
+            cell = cell[cellidx]
         p = np.einsum('...j, ij->...i', bc, node[cell])
         return p
 
@@ -208,6 +216,7 @@ class IntervalMeshDataStructure():
         self.construct()
 
     def construct(self):
+        self.version = getattr(self, 'version', 0) + 1
         NN = self.NN
         NC = self.NC
         cell = self.cell
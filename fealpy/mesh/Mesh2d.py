@@ -1,8 +1,9 @@
 import numpy as np
 from scipy.sparse import coo_matrix, csc_matrix, csr_matrix, spdiags, eye, tril, triu
-from .mesh_tools import unique_row, find_node, find_entity, show_mesh_2d
-from ..common import ranges
+from .mesh_tools import unique_row, unique_row_radix, update_entity_to_cell, find_node, find_entity, show_mesh_2d
+from ..common import ranges, index_type, ArrayCache, cached
 from types import ModuleType
+from .space_filling_curve import reorder_index
 
 class Mesh2d():
     """ The base class of TriangleMesh and QuadrangleMesh
@@ -114,6 +115,7 @@ class Mesh2d():
             v = node[edge[index,1],:] - node[edge[index,0],:]
         return v
 
+    @cached
     def edge_length(self, index=None):
         node = self.entity('node')
         edge = self.entity('edge')
@@ -163,6 +165,39 @@ class Mesh2d():
             v = node[edge[index,1],:] - node[edge[index,0],:]
         return v
 
+    def reorder(self, method='hilbert'):
+        """ Renumber the nodes and cells for a better data locality
+
+        Parameters
+        ----------
+        method : 'hilbert', 'morton' or 'rcm'
+
+        Returns
+        -------
+        nidx : the new to old node map, `node_new = node_old[nidx]`
+        cidx : the new to old cell map
+
+        Notes
+        -----
+        The topology is rebuilt, so the edges are renumbered too. The
+        arrays in `nodedata` and `celldata` are permuted with the nodes and
+        cells.
+        """
+        nidx, cidx = reorder_index(self, method=method)
+        NN = self.number_of_nodes()
+        nidxMap = np.zeros(NN, dtype=self.itype)
+        nidxMap[nidx] = np.arange(NN)
+
+        self.node = self.node[nidx]
+        cell = nidxMap[self.ds.cell[cidx]]
+        self.ds.reinit(NN, cell)
+
+        for data, idx in [(getattr(self, 'nodedata', {}), nidx),
+                (getattr(self, 'celldata', {}), cidx)]:
+            for key, value in data.items():
+                data[key] = value[idx]
+        return nidx, cidx
+
     def add_plot(
             self, plot,
             nodecolor='w', edgecolor='k',
@@ -229,24 +264,87 @@ class Mesh2d():
 class Mesh2dDataStructure():
     """ The topology data structure of mesh 2d
         This is just a abstract class, and you can not use it directly.
+
+        The adjacency relations (`cell_to_edge`, `cell_to_cell`,
+        `node_to_cell`, ...) are memoized in `self.cache`, which is cleared
+        whenever the topology is rebuilt. Call `self.cache.info()` to get the
+        hit and miss counts, and `self.cache.resize(nbytes)` to change its
+        memory budget.
+
+        `construct` finds the unique edges by a radix sort of the packed
+        node pairs. Set `uniqueMethod = 'unique'` to use `np.unique` instead.
     """
+    uniqueMethod = 'radix'
 
     def __init__(self, NN, cell):
+        self.cache = ArrayCache()
         self.NN = NN
         self.NC = cell.shape[0]
-        self.cell = cell
-        self.itype = cell.dtype
+        self.itype = index_type(max(NN, self.E*self.NC))
+        self.cell = cell.astype(self.itype, copy=False)
         self.construct()
 
     def reinit(self, NN, cell):
         self.NN = NN
         self.NC = cell.shape[0]
-        self.cell = cell
+        self.itype = index_type(max(NN, self.E*self.NC))
+        self.cell = cell.astype(self.itype, copy=False)
         self.construct()
 
+    def update(self, NN, cell, index=None):
+        """ Update the topology after a local refinement
+
+        Parameters
+        ----------
+        NN : the number of nodes of the new mesh
+        cell : the new cells, a new array, in which the first `self.NC`
+            cells keep their old index and the rest are appended
+        index : the index of the old cells which are changed. If it is
+            `None`, the changed cells are found by comparing with
+            `self.cell`.
+
+        Notes
+        -----
+        Only the edges of the changed and the appended cells are rebuilt, and
+        the result is the same as `reinit(NN, cell)`.
+        """
+        NC = cell.shape[0]
+        if index_type(max(NN, self.E*NC)) != self.itype:
+            # the indices do not fit in the old type any more
+            self.reinit(NN, cell)
+            return
+
+        cell = cell.astype(self.itype, copy=False)
+        if (self.edge is None) or (NC < self.NC) or np.shares_memory(cell, self.cell):
+            self.reinit(NN, cell)
+            return
+
+        isChangedCell = np.ones(NC, dtype=np.bool)
+        if index is None:
+            isChangedCell[:self.NC] = np.any(cell[:self.NC] != self.cell, axis=1)
+        else:
+            isChangedCell[:self.NC] = False
+            isChangedCell[index] = True
+
+        data = update_entity_to_cell(
+                self.edge, self.edge2cell, cell, self.localEdge,
+                isChangedCell, NN)
+        if data is None:
+            self.reinit(NN, cell)
+            return
+
+        self.cache.clear()
+        self.version = getattr(self, 'version', 0) + 1
+        self.NN = NN
+        self.NC = NC
+        self.cell = cell
+        self.edge, self.edge2cell = data
+        self.NE = self.edge.shape[0]
+
     def clear(self):
         self.edge = None
         self.edge2cell = None
+        self.cache.clear()
 
     def number_of_nodes_of_cells(self):
         return self.V
@@ -275,22 +373,28 @@ class Mesh2dDataStructure():
     def construct(self):
         """ Construct edge and edge2cell from cell
         """
+        self.cache.clear()
+        self.version = getattr(self, 'version', 0) + 1
         NC = self.NC
         E = self.E
 
         totalEdge = self.total_edge()
-        _, i0, j = np.unique(np.sort(totalEdge, axis=-1),
-                return_index=True,
-                return_inverse=True,
-                axis=0)
-        NE = i0.shape[0]
+        if self.uniqueMethod == 'radix':
+            _, i0, i1, j = unique_row_radix(
+                    np.sort(totalEdge, axis=-1), self.NN)
+            NE = i0.shape[0]
+        else:
+            _, i0, j = np.unique(np.sort(totalEdge, axis=-1),
+                    return_index=True,
+                    return_inverse=True,
+                    axis=0)
+            NE = i0.shape[0]
+            i1 = np.zeros(NE, dtype=self.itype)
+            i1[j] = np.arange(E*NC, dtype=self.itype)
         self.NE = NE
 
         self.edge2cell = np.zeros((NE, 4), dtype=self.itype)
 
-        i1 = np.zeros(NE, dtype=self.itype)
-        i1[j] = np.arange(E*NC, dtype=self.itype)
-
         self.edge2cell[:, 0] = i0//E
         self.edge2cell[:, 1] = i1//E
         self.edge2cell[:, 2] = i0%E
@@ -298,6 +402,7 @@ class Mesh2dDataStructure():
 
         self.edge = totalEdge[i0, :]
 
+    @cached
     def cell_to_node(self):
         """ 
         """
@@ -312,6 +417,7 @@ class Mesh2dDataStructure():
         cell2node = csr_matrix((val, (I, cell.flatten())), shape=(NC, NN), dtype=np.bool)
         return cell2node
 
+    @cached
     def cell_to_edge(self, sparse=False):
         """ The neighbor information of cell to edge
         """
@@ -335,6 +441,7 @@ class Mesh2dDataStructure():
                     shape=(NC, NE), dtype=np.bool)
             return cell2edge 
 
+    @cached
     def cell_to_edge_sign(self, sparse=False):
         NC = self.NC
         E = self.E
@@ -350,6 +457,7 @@ class Mesh2dDataStructure():
                     shape=(NC, NE), dtype=np.bool)
         return cell2edgeSign
 
+    @cached
     def cell_to_face(self, sparse=False):
         """ The neighbor information of cell to edge
         """
@@ -374,6 +482,7 @@ class Mesh2dDataStructure():
             return cell2edge 
 
 
+    @cached
     def cell_to_cell(self, return_sparse=False, return_boundary=True, return_array=False):
         """ Consctruct the neighbor information of cells
         """
@@ -440,6 +549,7 @@ class Mesh2dDataStructure():
         edge2node = self.edge_to_node()
         return edge2node*edge2node.transpose()
 
+    @cached
     def edge_to_edge(self):
         edge2node = self.edge_to_node(sparse=True)
         return edge2node*edge2node.transpose()
@@ -457,6 +567,7 @@ class Mesh2dDataStructure():
             face2cell = csr_matrix((val, (I, J)), shape=(NE, NC), dtype=np.bool)
             return face2cell 
 
+    @cached
     def node_to_node(self, return_array=False):
         """ The neighbor information of nodes
         """
@@ -483,6 +594,7 @@ class Mesh2dDataStructure():
         node2node = csr_matrix((val, (I, J)), shape=(NN, NN), dtype=np.bool)
         return node2node
 
+    @cached
     def node_to_edge(self):
         NN = self.NN
         NE = self.NE
@@ -494,6 +606,7 @@ class Mesh2dDataStructure():
         node2edge = csr_matrix((val, (I, J)), shape=(NN, NE), dtype=np.bool)
         return node2edge
 
+    @cached
     def node_to_cell(self, localidx=False):
         """
         """
@@ -515,6 +628,7 @@ class Mesh2dDataStructure():
         return node2cell
 
 
+    @cached
     def boundary_node_flag(self):
         NN = self.NN
         edge = self.edge
@@ -523,6 +637,7 @@ class Mesh2dDataStructure():
         isBdPoint[edge[isBdEdge,:]] = True
         return isBdPoint
 
+    @cached
     def boundary_edge_flag(self):
         edge2cell = self.edge2cell
         return edge2cell[:, 0] == edge2cell[:, 1]
@@ -531,6 +646,7 @@ class Mesh2dDataStructure():
         edge = self.edge
         return edge[self.boundary_edge_index()]
 
+    @cached
     def boundary_cell_flag(self):
         NC = self.NC
         edge2cell = self.edge2cell
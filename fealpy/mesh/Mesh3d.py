@@ -2,8 +2,9 @@ import numpy as np
 
 from types import ModuleType
 from scipy.sparse import coo_matrix, csc_matrix, csr_matrix, spdiags, eye, tril, triu
-from .mesh_tools import unique_row, find_entity, show_mesh_3d, find_node
-from ..common import ranges
+from .mesh_tools import unique_row, unique_row_radix, update_entity_to_cell, update_cell_to_edge, find_entity, show_mesh_3d, find_node
+from ..common import ranges, index_type, ArrayCache, cached
+from .space_filling_curve import reorder_index
 
 
 class Mesh3d():
@@ -147,6 +148,39 @@ class Mesh3d():
         length = np.sqrt(np.square(v).sum(axis=1))
         return v/length.reshape(-1, 1)
 
+    def reorder(self, method='hilbert'):
+        """ Renumber the nodes and cells for a better data locality
+
+        Parameters
+        ----------
+        method : 'hilbert', 'morton' or 'rcm'
+
+        Returns
+        -------
+        nidx : the new to old node map, `node_new = node_old[nidx]`
+        cidx : the new to old cell map
+
+        Notes
+        -----
+        The topology is rebuilt, so the edges and faces are renumbered too. The
+        arrays in `nodedata` and `celldata` are permuted with the nodes and
+        cells.
+        """
+        nidx, cidx = reorder_index(self, method=method)
+        NN = self.number_of_nodes()
+        nidxMap = np.zeros(NN, dtype=self.itype)
+        nidxMap[nidx] = np.arange(NN)
+
+        self.node = self.node[nidx]
+        cell = nidxMap[self.ds.cell[cidx]]
+        self.ds.reinit(NN, cell)
+
+        for data, idx in [(getattr(self, 'nodedata', {}), nidx),
+                (getattr(self, 'celldata', {}), cidx)]:
+            for key, value in data.items():
+                data[key] = value[idx]
+        return nidx, cidx
+
     def add_plot(
             self, plot,
             nodecolor='k', edgecolor='k', facecolor='w', cellcolor='w',
@@ -227,24 +261,93 @@ class Mesh3d():
 
 
 class Mesh3dDataStructure():
+    """ The topology data structure of mesh 3d
+
+        The adjacency relations are memoized in `self.cache`, which is
+        cleared whenever the topology is rebuilt.
+
+        `construct` finds the unique faces and edges by a radix sort of the
+        packed node tuples. Set `uniqueMethod = 'unique'` to use `np.unique`
+        instead.
+    """
+    uniqueMethod = 'radix'
+
     def __init__(self, NN, cell):
-        self.itype = cell.dtype
+        self.cache = ArrayCache()
         self.NN = NN
         self.NC = cell.shape[0]
-        self.cell = cell
+        self.itype = index_type(max(NN, self.E*self.NC))
+        self.cell = cell.astype(self.itype, copy=False)
         self.construct()
 
     def reinit(self, NN, cell):
         self.NN = NN
         self.NC = cell.shape[0]
-        self.cell = cell
+        self.itype = index_type(max(NN, self.E*self.NC))
+        self.cell = cell.astype(self.itype, copy=False)
         self.construct()
 
+    def update(self, NN, cell, index=None):
+        """ Update the topology after a local refinement
+
+        Parameters
+        ----------
+        NN : the number of nodes of the new mesh
+        cell : the new cells, a new array, in which the first `self.NC`
+            cells keep their old index and the rest are appended
+        index : the index of the old cells which are changed. If it is
+            `None`, the changed cells are found by comparing with
+            `self.cell`.
+
+        Notes
+        -----
+        Only the faces and edges of the changed and the appended cells are
+        rebuilt, and the result is the same as `reinit(NN, cell)`.
+        """
+        NC = cell.shape[0]
+        if index_type(max(NN, self.E*NC)) != self.itype:
+            # the indices do not fit in the old type any more
+            self.reinit(NN, cell)
+            return
+
+        cell = cell.astype(self.itype, copy=False)
+        if (self.face is None) or (NC < self.NC) or np.shares_memory(cell, self.cell):
+            self.reinit(NN, cell)
+            return
+
+        isChangedCell = np.ones(NC, dtype=np.bool)
+        if index is None:
+            isChangedCell[:self.NC] = np.any(cell[:self.NC] != self.cell, axis=1)
+        else:
+            isChangedCell[:self.NC] = False
+            isChangedCell[index] = True
+
+        face = update_entity_to_cell(
+                self.face, self.face2cell, cell, self.localFace,
+                isChangedCell, NN)
+        edge = update_cell_to_edge(
+                self.edge, self.cell2edge, cell, self.localEdge,
+                isChangedCell, NN)
+        if (face is None) or (edge is None):
+            self.reinit(NN, cell)
+            return
+
+        self.cache.clear()
+        self.version = getattr(self, 'version', 0) + 1
+        self.NN = NN
+        self.NC = NC
+        self.cell = cell
+        self.face, self.face2cell = face
+        self.edge, self.cell2edge = edge
+        self.NF = self.face.shape[0]
+        self.NE = self.edge.shape[0]
+
     def clear(self):
         self.face = None
         self.face2cell = None
         self.edge = None
         self.cell2edge = None
+        self.cache.clear()
 
     def number_of_nodes_of_cells(self):
         return self.V
@@ -268,42 +371,51 @@ class Mesh3dDataStructure():
         return totalFace
 
     def construct(self):
+        self.cache.clear()
+        self.version = getattr(self, 'version', 0) + 1
         NC = self.NC
 
+        F = self.F
         totalFace = self.total_face()
-
-        _, i0, j = np.unique(
-                np.sort(totalFace, axis=1),
-                return_index=True,
-                return_inverse=True,
-                axis=0)
+        if self.uniqueMethod == 'radix':
+            _, i0, i1, j = unique_row_radix(
+                    np.sort(totalFace, axis=1), self.NN)
+            NF = i0.shape[0]
+        else:
+            _, i0, j = np.unique(
+                    np.sort(totalFace, axis=1),
+                    return_index=True,
+                    return_inverse=True,
+                    axis=0)
+            NF = i0.shape[0]
+            i1 = np.zeros(NF, dtype=self.itype)
+            i1[j] = np.arange(F*NC)
 
         self.face = totalFace[i0]
-
-        NF = i0.shape[0]
         self.NF = NF
 
         self.face2cell = np.zeros((NF, 4), dtype=self.itype)
 
-        i1 = np.zeros(NF, dtype=self.itype)
-        F = self.F
-        i1[j] = np.arange(F*NC)
-
         self.face2cell[:, 0] = i0 // F
         self.face2cell[:, 1] = i1 // F
         self.face2cell[:, 2] = i0 % F
         self.face2cell[:, 3] = i1 % F
 
         totalEdge = self.total_edge()
-        self.edge, i2, j = np.unique(
-                np.sort(totalEdge, axis=1),
-                return_index=True,
-                return_inverse=True,
-                axis=0)
+        if self.uniqueMethod == 'radix':
+            self.edge, i2, _, j = unique_row_radix(
+                    np.sort(totalEdge, axis=1), self.NN)
+        else:
+            self.edge, i2, j = np.unique(
+                    np.sort(totalEdge, axis=1),
+                    return_index=True,
+                    return_inverse=True,
+                    axis=0)
         E = self.E
-        self.cell2edge = np.reshape(j, (NC, E))
+        self.cell2edge = np.reshape(j, (NC, E)).astype(self.itype)
         self.NE = self.edge.shape[0]
 
+    @cached
     def cell_to_node(self):
         """
         """
@@ -351,6 +463,7 @@ class Mesh3dDataStructure():
             cell2edgeSign[:, i] = cell[:, j] < cell[:, k]
         return cell2edgeSign
 
+    @cached
     def cell_to_face(self, sparse=False):
         NC = self.NC
         NF = self.NF
@@ -372,6 +485,7 @@ class Mesh3dDataStructure():
                     ), shape=(NC, NF), dtype=np.bool)
             return cell2face
 
+    @cached
     def cell_to_cell(
             self, return_sparse=False,
             return_boundary=True, return_array=False):
@@ -442,6 +556,7 @@ class Mesh3dDataStructure():
                     ), shape=(NF, NN), dtype=np.bool)
             return face2node
 
+    @cached
     def face_to_edge(self, return_sparse=False):
         cell2edge = self.cell2edge
         face2cell = self.face2cell
@@ -466,6 +581,7 @@ class Mesh3dDataStructure():
                     ), shape=(NF, NE), dtype=np.bool)
             return f2e
 
+    @cached
     def face_to_face(self):
         face2edge = self.face_to_edge()
         return face2edge*face2edge.transpose()
@@ -504,10 +620,12 @@ class Mesh3dDataStructure():
                     ), shape=(NE, NN), dtype=np.bool)
             return edge2node
 
+    @cached
     def edge_to_edge(self):
         edge2node = self.edge_to_node()
         return edge2node*edge2node.transpose()
 
+    @cached
     def edge_to_face(self):
         NF = self.NF
         NE = self.NE
@@ -523,6 +641,7 @@ class Mesh3dDataStructure():
                 ), shape=(NE, NF), dtype=np.bool)
         return edge2face
 
+    @cached
     def edge_to_cell(self, localidx=False):
         NC = self.NC
         NE = self.NE
@@ -538,6 +657,7 @@ class Mesh3dDataStructure():
                 ), shape=(NE, NC), dtype=np.bool)
         return edge2cell
 
+    @cached
     def node_to_node(self):
         """ The neighbor information of nodes
         """
@@ -554,6 +674,7 @@ class Mesh3dDataStructure():
                 ), shape=(NN, NN), dtype=np.bool)
         return node2node
 
+    @cached
     def node_to_edge(self):
         NN = self.NN
         NE = self.NE
@@ -568,6 +689,7 @@ class Mesh3dDataStructure():
                 ), shape=(NE, NN), dtype=np.bool)
         return node2edge
 
+    @cached
     def node_to_face(self):
         NN = self.NN
         NF = self.NF
@@ -584,6 +706,7 @@ class Mesh3dDataStructure():
                 ), shape=(NF, NN), dtype=np.bool)
         return node2face
 
+    @cached
     def node_to_cell(self, return_local_index=False):
         """
         """
@@ -613,6 +736,7 @@ class Mesh3dDataStructure():
                     ), shape=(NN, NC), dtype=np.bool)
         return node2cell
 
+    @cached
     def boundary_node_flag(self):
         NN = self.NN
         face = self.face
@@ -621,6 +745,7 @@ class Mesh3dDataStructure():
         isBdPoint[face[isBdFace, :]] = True
         return isBdPoint
 
+    @cached
     def boundary_edge_flag(self):
         NE = self.NE
         face2edge = self.face_to_edge()
@@ -629,10 +754,12 @@ class Mesh3dDataStructure():
         isBdEdge[face2edge[isBdFace, :]] = True
         return isBdEdge
 
+    @cached
     def boundary_face_flag(self):
         face2cell = self.face_to_cell()
         return face2cell[:, 0] == face2cell[:, 1]
 
+    @cached
     def boundary_cell_flag(self):
         NC = self.NC
         face2cell = self.face_to_cell()
@@ -27,6 +27,22 @@ class Octree(HexahedronMesh):
         idx, = np.nonzero(child[:, 0] == -1)
         return idx
 
+    def reorder(self, method='hilbert'):
+        """ Renumber the nodes and cells, and update `parent` and `child`
+        """
+        nidx, cidx = super(Octree, self).reorder(method=method)
+        NC = self.number_of_cells()
+        cidxMap = np.zeros(NC, dtype=self.itype)
+        cidxMap[cidx] = np.arange(NC)
+
+        parent = self.parent[cidx]
+        child = self.child[cidx]
+        parent[parent[:, 0] > -1, 0] = cidxMap[parent[parent[:, 0] > -1, 0]]
+        child[child > -1] = cidxMap[child[child > -1]]
+        self.parent = parent
+        self.child = child
+        return nidx, cidx
+
     def is_leaf_cell(self, idx=None):
         if idx is None:
             return self.child[:, 0] == -1
@@ -105,9 +105,19 @@ class OctreeMesh(Mesh3d):
 
         self.meshtype = 'octreemesh'
 
-        self.itype = cell.dtype
         self.ftype = node.dtype
 
+    @property
+    def itype(self):
+        """ The integer type of the index arrays, which follows the data
+        structure when the topology is rebuilt
+        """
+        return self.ds.itype
+
+    @itype.setter
+    def itype(self, itype):
+        self.ds.itype = itype
+
     def disp(self):
         print("Node:\n", self.node)
         print("Cell:\n", self.ds.cell)
@@ -1,9 +1,10 @@
 import numpy as np
 from scipy.sparse import coo_matrix, csc_matrix, csr_matrix, spdiags, eye, tril, triu
-from ..common import ranges
-from .mesh_tools import unique_row, find_entity, show_mesh_2d
-from ..quadrature import TriangleQuadrature
+from ..common import ranges, index_type, ArrayCache, cached
+from .mesh_tools import unique_row, unique_row_radix, find_entity, show_mesh_2d
+from ..quadrature import get_quadrature
 from .Mesh2d import Mesh2d
+from .GeometryCache import GeometryCache
 
 class PolygonMesh(Mesh2d):
 
@@ -22,11 +23,22 @@ class PolygonMesh(Mesh2d):
 
         self.ds = PolygonMeshDataStructure(node.shape[0], cell, cellLocation)
         self.meshtype = 'polygon'
-        self.itype = cell.dtype
         self.ftype = node.dtype
+        self.cache = GeometryCache(self)
+
+    @property
+    def itype(self):
+        """ The integer type of the index arrays, which follows the data
+        structure when the topology is rebuilt
+        """
+        return self.ds.itype
+
+    @itype.setter
+    def itype(self, itype):
+        self.ds.itype = itype
 
     def integrator(self, k):
-        return TriangleQuadrature(k)
+        return get_quadrature('polygon', k)
 
     def number_of_vertices_of_cells(self):
         return self.ds.number_of_vertices_of_cells()
@@ -155,27 +167,46 @@ class PolygonMesh(Mesh2d):
 
 
 class PolygonMeshDataStructure():
+    """ The topology data structure of polygon mesh
+
+    The cells are stored in CSR format: the vertices of the cell `i` are
+    `cell[cellLocation[i]:cellLocation[i+1]]` in counterclockwise order, and
+    the local edge `j` of the cell is from its vertex `j` to `j+1`. The
+    arrays aligned with `cell`, such as `cell_to_edge(sparse=False)`, use
+    `cellLocation` as their row pointer too.
+
+    `cell_groups()` groups the cells by the number of vertices, so every group
+    can be handled as a dense `(NCg, NV)` block without any loop over the
+    cells. The relations are memoized in `self.cache` as in
+    `Mesh2dDataStructure`.
+    """
+    uniqueMethod = 'radix'
+
     def __init__(self, NN, cell, cellLocation):
+        self.cache = ArrayCache()
         self.NN = NN
         self.NC = cellLocation.shape[0] - 1
         self.nx = int(np.sqrt(NN)-1)
         self.ny = self.nx
 
-        self.cell = cell
-        self.cellLocation = cellLocation
+        self.itype = index_type(max(NN, cell.shape[0] + 1))
+        self.cell = cell.astype(self.itype, copy=False)
+        self.cellLocation = cellLocation.astype(self.itype, copy=False)
         self.construct()
 
     def reinit(self, NN, cell, cellLocation):
         self.NN = NN
         self.NC = cellLocation.shape[0] - 1
 
-        self.cell = cell
-        self.cellLocation = cellLocation
+        self.itype = index_type(max(NN, cell.shape[0] + 1))
+        self.cell = cell.astype(self.itype, copy=False)
+        self.cellLocation = cellLocation.astype(self.itype, copy=False)
         self.construct()
 
     def clear(self):
         self.edge = None
         self.edge2cell = None
+        self.cache.clear()
 
     def number_of_vertices_of_cells(self):
         cellLocation = self.cellLocation
@@ -189,105 +220,181 @@ class PolygonMeshDataStructure():
         cellLocation = self.cellLocation
         return cellLocation[1:] - cellLocation[0:-1]
 
-    def total_edge(self):
-        cell = self.cell
+    @cached
+    def cell_index(self):
+        """ The cell index of every entry of `cell`
+        """
+        NV = self.number_of_vertices_of_cells()
+        return np.repeat(np.arange(self.NC, dtype=self.itype), NV)
+
+    @cached
+    def local_index(self):
+        """ The local index of every entry of `cell` in its cell
+        """
+        return (np.arange(self.cell.shape[0], dtype=self.itype)
+                - self.cellLocation[self.cell_index()])
+
+    @cached
+    def next_index(self):
+        """ The position in `cell` of the next vertex of every entry
+        """
         cellLocation = self.cellLocation
+        idx = np.arange(1, self.cell.shape[0] + 1, dtype=self.itype)
+        idx[cellLocation[1:] - 1] = cellLocation[:-1]
+        return idx
 
-        NN = self.NN
-        NC = self.NC
-        NV = self.number_of_nodes_of_cells()
-
-        totalEdge = np.zeros((cell.shape[0], 2), dtype=np.int)
+    def total_edge(self):
+        cell = self.cell
+        totalEdge = np.zeros((cell.shape[0], 2), dtype=self.itype)
         totalEdge[:, 0] = cell
-        totalEdge[:-1, 1] = cell[1:]
-        totalEdge[cellLocation[1:] - 1, 1] = cell[cellLocation[:-1]]
+        totalEdge[:, 1] = cell[self.next_index()]
         return totalEdge
 
     def construct(self):
-        NC = self.NC
-
+        self.cache.clear()
+        self.version = getattr(self, 'version', 0) + 1
         cell = self.cell
-        cellLocation = self.cellLocation
-        NV = self.number_of_vertices_of_cells()
+        N = cell.shape[0]
 
         totalEdge = self.total_edge()
-        _, i0, j = np.unique(np.sort(totalEdge, axis=1),
-                return_index=True,
-                return_inverse=True,
-                axis=0)
-        NE = i0.shape[0]
+        if self.uniqueMethod == 'radix':
+            _, i0, i1, j = unique_row_radix(np.sort(totalEdge, axis=1), self.NN)
+            NE = i0.shape[0]
+        else:
+            _, i0, j = np.unique(np.sort(totalEdge, axis=1),
+                    return_index=True,
+                    return_inverse=True,
+                    axis=0)
+            NE = i0.shape[0]
+            i1 = np.zeros(NE, dtype=self.itype)
+            i1[j] = np.arange(N, dtype=self.itype)
         self.NE = NE
-        self.edge2cell = np.zeros((NE, 4), dtype=np.int)
-
-        i1 = np.zeros(NE, dtype=np.int)
-        i1[j] = np.arange(len(cell))
-
         self.edge = totalEdge[i0]
 
-        cellIdx = np.repeat(range(NC), NV)
- 
-        localIdx = ranges(NV)
-
+        cellIdx = self.cell_index()
+        localIdx = self.local_index()
+        self.edge2cell = np.zeros((NE, 4), dtype=self.itype)
         self.edge2cell[:, 0] = cellIdx[i0]
         self.edge2cell[:, 1] = cellIdx[i1]
         self.edge2cell[:, 2] = localIdx[i0]
         self.edge2cell[:, 3] = localIdx[i1]
 
-    def cell_to_node(self):
-        NN = self.NN
-        NC = self.NC
-        NE = self.NE
+    @cached
+    def cell_groups(self):
+        """ Group the cells by the number of vertices
 
-        cell = self.cell
-        cellLocation = self.cellLocation
+        Returns
+        -------
+        groups : a tuple of `(NV, cidx)` in the increasing order of `NV`,
+            where `cidx` is the sorted index of the cells with `NV` vertices
+        """
         NV = self.number_of_vertices_of_cells()
-        I = np.repeat(range(NC), NV)
-        J = cell
+        idx = np.argsort(NV, kind='stable').astype(self.itype)
+        nv, start = np.unique(NV[idx], return_index=True)
+        start = np.r_[start, self.NC]
+        return tuple(
+                (int(n), idx[start[i]:start[i+1]]) for i, n in enumerate(nv))
+
+    def group_blocks(self, a, location=None):
+        """ Split an array in CSR format into dense blocks by `cell_groups()`
+
+        Parameters
+        ----------
+        a : an array aligned with `cell` (the default), or any array whose
+            rows of the cell `i` are `a[location[i]:location[i+1]]`, such as
+            `cell2dof` of the virtual element spaces
+        location : the row pointer of `a`, default `self.cellLocation`
+
+        Returns
+        -------
+        blocks : a list of `(cidx, b)`, where `b` has the shape
+            `(len(cidx), n) + a.shape[1:]`
+        """
+        if location is None:
+            location = self.cellLocation
+        blocks = []
+        for _, cidx in self.cell_groups():
+            start = location[cidx]
+            n = location[cidx[0] + 1] - start[0]
+            blocks.append((cidx, a[start[:, None] + np.arange(n)]))
+        return blocks
+
+    @cached
+    def padded_cell(self, fill=-1):
+        """ The cells as a `(NC, max(NV))` array padded by `fill`
+        """
+        NV = self.number_of_vertices_of_cells()
+        cell = np.full((self.NC, NV.max()), fill, dtype=self.itype)
+        cell[self.cell_index(), self.local_index()] = self.cell
+        return cell
 
-        val = np.ones(len(cell), dtype=np.bool)
-        cell2node = csr_matrix((val, (I, J)), shape=(NC, NN), dtype=np.bool)
+    @cached
+    def cell_to_node(self):
+        NN = self.NN
+        NC = self.NC
+        val = np.ones(self.cell.shape[0], dtype=np.bool)
+        cell2node = csr_matrix(
+                (val, self.cell, self.cellLocation), shape=(NC, NN))
         return cell2node
 
+    @cached
     def cell_to_edge(self, sparse=True):
         NE = self.NE
         NC = self.NC
 
         edge2cell = self.edge2cell
-        cell = self.cell
         cellLocation = self.cellLocation
 
+        cell2edge = np.zeros(self.cell.shape[0], dtype=self.itype)
+        cell2edge[cellLocation[edge2cell[:, 0]] + edge2cell[:, 2]] = range(NE)
+        cell2edge[cellLocation[edge2cell[:, 1]] + edge2cell[:, 3]] = range(NE)
         if sparse:
-            J = np.arange(NE)
-            val = np.ones((NE,), dtype=np.bool)
-            cell2edge = coo_matrix((val, (edge2cell[:,0], J)), shape=(NC, NE), dtype=np.bool)
-            cell2edge += coo_matrix((val, (edge2cell[:,1], J)), shape=(NC, NE), dtype=np.bool)
-            return cell2edge.tocsr()
+            val = np.ones(len(cell2edge), dtype=np.bool)
+            return csr_matrix((val, cell2edge, cellLocation), shape=(NC, NE))
         else:
-            cell2edge = np.zeros(cell.shape[0], dtype=np.int)
-            cell2edge[cellLocation[edge2cell[:, 0]] + edge2cell[:, 2]] = range(NE)
-            cell2edge[cellLocation[edge2cell[:, 1]] + edge2cell[:, 3]] = range(NE)
             return cell2edge
 
-    def cell_to_edge_sign(self):
+    @cached
+    def cell_to_edge_sign(self, sparse=True):
         NE = self.NE
         NC = self.NC
         edge2cell = self.edge2cell
-        val = np.ones((NE,), dtype=np.bool)
-        cell2edgeSign = csr_matrix((val, (edge2cell[:,0], range(NE))), shape=(NC,NE), dtype=np.bool)
+        if sparse:
+            val = np.ones((NE,), dtype=np.bool)
+            cell2edgeSign = csr_matrix(
+                    (val, (edge2cell[:, 0], range(NE))),
+                    shape=(NC, NE), dtype=np.bool)
+        else:
+            cell2edgeSign = np.zeros(self.cell.shape[0], dtype=np.bool)
+            cell2edgeSign[self.cellLocation[edge2cell[:, 0]] + edge2cell[:, 2]] = True
         return cell2edgeSign
 
-    def cell_to_cell(self):
+    @cached
+    def cell_to_cell(self, sparse=True):
+        """ The neighbors of the cells
+
+        Parameters
+        ----------
+        sparse : if it is False, return an array aligned with `cell`, which
+            is the neighbor across each local edge, and the cell itself for
+            the boundary edges
+        """
         NC = self.NC
         edge2cell = self.edge2cell
-        isInEdge = (edge2cell[:, 0] != edge2cell[:, 1])
-        val = np.ones(isInEdge.sum(), dtype=np.bool)
-        cell2cell = coo_matrix(
-                (val, (edge2cell[isInEdge, 0], edge2cell[isInEdge, 1])),
-                shape=(NC,NC), dtype=np.bool)
-        cell2cell+= coo_matrix(
-                (val, (edge2cell[isInEdge, 1], edge2cell[isInEdge, 0])), 
-                shape=(NC,NC), dtype=np.bool)
-        return cell2cell.tocsr()
+        cellLocation = self.cellLocation
+
+        cell2cell = np.zeros(self.cell.shape[0], dtype=self.itype)
+        cell2cell[cellLocation[edge2cell[:, 0]] + edge2cell[:, 2]] = edge2cell[:, 1]
+        cell2cell[cellLocation[edge2cell[:, 1]] + edge2cell[:, 3]] = edge2cell[:, 0]
+        if not sparse:
+            return cell2cell
+
+        isInEdge = cell2cell != self.cell_index()
+        num = np.bincount(self.cell_index()[isInEdge], minlength=NC)
+        indptr = np.zeros(NC + 1, dtype=self.itype)
+        indptr[1:] = np.cumsum(num)
+        val = np.ones(indptr[-1], dtype=np.bool)
+        return csr_matrix((val, cell2cell[isInEdge], indptr), shape=(NC, NC))
 
     def edge_to_node(self, sparse=False):
         NN = self.NN
@@ -297,14 +404,15 @@ class PolygonMeshDataStructure():
         if sparse == False:
             return edge
         else:
-            val = np.ones((NE,), dtype=np.bool)
-            edge2node = coo_matrix((val, (edge[:,0], edge[:,1])), shape=(NE, NN), dtype=np.bool)
-            edge2node+= coo_matrix((val, (edge[:,1], edge[:,0])), shape=(NE, NN), dtype=np.bool)
-            return edge2node.tocsr()
+            val = np.ones(2*NE, dtype=np.bool)
+            indptr = np.arange(0, 2*NE + 1, 2)
+            edge2node = csr_matrix((val, edge.reshape(-1), indptr), shape=(NE, NN))
+            return edge2node
 
+    @cached
     def edge_to_edge(self):
-        edge2node = self.edge_to_node()
-        return edge2node*edge2node.tranpose()
+        edge2node = self.edge_to_node(sparse=True)
+        return edge2node*edge2node.transpose()
 
     def edge_to_cell(self, sparse=False):
         NE = self.NE
@@ -318,10 +426,11 @@ class PolygonMeshDataStructure():
             edge2cell+= coo_matrix((val, (range(NE), edge2cell[:,1])), shape=(NE, NC), dtype=np.bool)
             return edge2cell.tocsr()
 
+    @cached
     def node_to_node(self):
         NN = self.NN
         edge = self.edge
-        return node_to_node_in_edge(NN, edge)
+        return self.node_to_node_in_edge(NN, edge)
 
     def node_to_node_in_edge(self, NN, edge):
         I = edge.flatten()
@@ -330,29 +439,13 @@ class PolygonMeshDataStructure():
         node2node = csr_matrix((val, (I, J)), shape=(NN, NN), dtype=np.bool)
         return node2node
 
+    @cached
     def node_to_edge(self):
-        NN = self.NN
-        NE = self.NE
-
-        edge = self.edge
-
-        val = np.ones((NE,), dtype=np.bool)
-        node2edge = coo_matrix((val, (edge[:,0], range(NE))), shape=(NE, NN), dtype=np.bool)
-        node2edge+= coo_matrix((val, (edge[:,1], range(NE))), shape=(NE, NN), dtype=np.bool)
-        return node2edge.tocsr()
+        return self.edge_to_node(sparse=True).transpose().tocsr()
 
+    @cached
     def node_to_cell(self):
-        NN = self.NN
-        NC = self.NC
-        NE = self.NE
-
-        cell = self.cell
-        NV = self.number_of_vertices_of_cells()
-        I = cell
-        J = np.repeat(range(NC), NV)
-        val = np.ones(cell.shape[0], dtype=np.bool)
-        node2cell = csr_matrix((val, (I, J)), shape=(NN, NC), dtype=np.bool)
-        return node2cell
+        return self.cell_to_node().transpose().tocsr()
 
     def boundary_node_flag(self):
         NN = self.NN
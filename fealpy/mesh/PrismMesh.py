@@ -1,7 +1,7 @@
 
 import numpy as np
 from .Mesh3d import Mesh3d, Mesh3dDataStructure
-from ..quadrature import PrismQuadrature
+from ..quadrature import get_quadrature
 
 
 class PrismMeshDataStructure(Mesh3dDataStructure):
@@ -42,7 +42,7 @@ class PrismMesh(Mesh3d):
         return sum(face[:, -2] != face[:, -1])
 
     def integrator(self, k):
-        return PrismQuadrature(k)
+        return get_quadrature('prism', k)
 
     def vtk_cell_type(self):
         VTK_PENTAGONAL_PRISM = 15
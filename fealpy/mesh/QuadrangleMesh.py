@@ -1,6 +1,8 @@
 import numpy as np
 from .Mesh2d import Mesh2d, Mesh2dDataStructure
-from ..quadrature import QuadrangleQuadrature
+from .GeometryCache import GeometryCache
+from ..quadrature import get_quadrature
+from ..common import cached
 
 
 class QuadrangleMeshDataStructure(Mesh2dDataStructure):
@@ -27,13 +29,24 @@ class QuadrangleMesh(Mesh2d):
 
         self.meshtype = 'quad'
 
-        self.itype = cell.dtype
         self.ftype = node.dtype
+        self.cache = GeometryCache(self)
 
         self.celldata = {}
         self.nodedata = {}
         self.edgedata = {}
 
+    @property
+    def itype(self):
+        """ The integer type of the index arrays, which follows the data
+        structure when the topology is rebuilt
+        """
+        return self.ds.itype
+
+    @itype.setter
+    def itype(self, itype):
+        self.ds.itype = itype
+
     def reorder_cell(self, idx):
         NC = self.number_of_cells()
         NN = self.number_of_nodes()
@@ -42,12 +55,13 @@ class QuadrangleMesh(Mesh2d):
         self.ds.reinit(NN, cell)
 
     def integrator(self, k):
-        return QuadrangleQuadrature(k)
+        return get_quadrature('quadrangle', k)
 
 
     def area(self, index=None):
         return self.cell_area(index=index)
 
+    @cached
     def cell_area(self, index=None):
         NC = self.number_of_cells()
         node = self.entity('node')
@@ -128,6 +142,7 @@ class QuadrangleMesh(Mesh2d):
         jacobi = self.jacobi_at_corner()
         return jacobi.sum(axis=1)/4
 
+    @cached
     def bc_to_point(self, bc):
         node = self.node
         cell = self.ds.cell
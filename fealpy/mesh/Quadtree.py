@@ -31,6 +31,22 @@ class Quadtree(QuadrangleMesh):
         elif celltype is 'tri':
             return np.r_['0', cell[:, [1, 2, 0]], cell[:, [3, 0, 2]]]
 
+    def reorder(self, method='hilbert'):
+        """ Renumber the nodes and cells, and update `parent` and `child`
+        """
+        nidx, cidx = super(Quadtree, self).reorder(method=method)
+        NC = self.number_of_cells()
+        cidxMap = np.zeros(NC, dtype=self.itype)
+        cidxMap[cidx] = np.arange(NC)
+
+        parent = self.parent[cidx]
+        child = self.child[cidx]
+        parent[parent[:, 0] > -1, 0] = cidxMap[parent[parent[:, 0] > -1, 0]]
+        child[child > -1] = cidxMap[child[child > -1]]
+        self.parent = parent
+        self.child = child
+        return nidx, cidx
+
     def is_leaf_cell(self, idx=None):
         if idx is None:
             return self.child[:, 0] == -1
@@ -472,6 +488,10 @@ class Quadtree(QuadrangleMesh):
             isNeedCutCell = np.zeros(NC, dtype=np.bool)
             isNeedCutCell[idx] = True
             isNeedCutCell = isNeedCutCell & isLeafCell
+            idx, = np.nonzero(isNeedCutCell)
+            if len(idx) == 0:
+                # all the marked cells are refined already
+                return
 
             # Find the cutted edge
             cell2edge = self.ds.cell_to_edge()
@@ -542,7 +562,7 @@ class Quadtree(QuadrangleMesh):
             self.node = np.concatenate((node, edgeCenter, cellCenter), axis=0)
             self.parent = np.concatenate((parent, newParent), axis=0)
             self.child = np.concatenate((child, newChild), axis=0)
-            self.ds.reinit(N + NEC + NCC, cell)
+            self.ds.update(N + NEC + NCC, cell, [])
 
     def adaptive_coarsen(self, estimator, data=None):
         i = 0
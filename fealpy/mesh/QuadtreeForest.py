@@ -47,13 +47,23 @@ class QuadtreeMesh(Mesh2d):
 
         self.meshtype = 'quadtreemesh'
 
-        self.itype = cell.dtype
         self.ftype = node.dtype
 
         self.celldata = {}
         self.nodedata = {}
         self.edgedata = {}
 
+    @property
+    def itype(self):
+        """ The integer type of the index arrays, which follows the data
+        structure when the topology is rebuilt
+        """
+        return self.ds.itype
+
+    @itype.setter
+    def itype(self, itype):
+        self.ds.itype = itype
+
     def uniform_refine(self, n=1):
         for i in range(n):
             NN = self.number_of_nodes()
@@ -1,7 +1,7 @@
 
 import numpy as np
 from ..functionspace.lagrange_fem_space import LagrangeFiniteElementSpace
-from ..quadrature import TriangleQuadrature
+from ..quadrature import get_quadrature
 from types import ModuleType
 from .mesh_tools import unique_row, find_node, find_entity, show_mesh_2d
 
@@ -50,7 +50,7 @@ class SurfaceTriangleMesh():
         self.celldata = {}
 
     def integrator(self, k):
-        return TriangleQuadrature(k)
+        return get_quadrature('triangle', k)
 
     def entity(self, etype=2):
         if etype in ['cell', 2]:
@@ -132,6 +132,24 @@ class SurfaceTriangleMesh():
         bcp, _ = self.surface.project(bcp)
         return bcp
 
+    def location(self, p, tol=None):
+        """ Find the cells of the flat mesh near the points `p`
+
+        Parameters
+        ----------
+        p : (NP, 3) points on or near the surface
+        tol : the largest distance from a point to the flat mesh, see
+            `CellLocator`
+
+        Returns
+        -------
+        cidx : -1 for the points far away from the mesh
+        bc : the barycentric coordinates of the projections of the points on
+            the flat cells
+        """
+        from .CellLocator import CellLocator
+        return CellLocator(self.mesh, tol=tol).find(p)
+
     def area(self, idx=3):
         integrator = self.integrator(idx)
         bcs, ws = integrator.quadpts, integrator.weights
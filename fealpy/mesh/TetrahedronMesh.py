@@ -3,7 +3,10 @@ from scipy.sparse import coo_matrix, csc_matrix, csr_matrix
 from scipy.sparse import spdiags, eye, tril, triu, bmat
 from .mesh_tools import unique_row
 from .Mesh3d import Mesh3d, Mesh3dDataStructure
-from ..quadrature import TetrahedronQuadrature
+from .CellLocator import CellLocator
+from .GeometryCache import GeometryCache
+from ..quadrature import get_quadrature
+from ..common import cached
 
 class TetrahedronMeshDataStructure(Mesh3dDataStructure):
     localFace = np.array([(1, 2, 3),  (0, 3, 2), (0, 1, 3), (0, 2, 1)])
@@ -39,20 +42,31 @@ class TetrahedronMesh(Mesh3d):
 
         self.meshtype = 'tet'
 
-        self.itype = cell.dtype
         self.ftype = node.dtype
+        self.cache = GeometryCache(self)
 
         self.celldata = {}
         self.edgedata = {}
         self.facedata = {}
         self.nodedata = {}
 
+    @property
+    def itype(self):
+        """ The integer type of the index arrays, which follows the data
+        structure when the topology is rebuilt
+        """
+        return self.ds.itype
+
+    @itype.setter
+    def itype(self, itype):
+        self.ds.itype = itype
+
     def vtk_cell_type(self):
         VTK_TETRA = 10
         return VTK_TETRA
 
     def integrator(self, k):
-        return TetrahedronQuadrature(k)
+        return get_quadrature('tetrahedron', k)
 
     def delete_cell(self, threshold):
         NN = self.number_of_nodes()
@@ -91,6 +105,7 @@ class TetrahedronMesh(Mesh3d):
 
         return l1*np.cross(v20, v30) + l2*np.cross(v30, v10) + l3*np.cross(v10, v20)
 
+    @cached
     def volume(self):
         cell = self.ds.cell
         node = self.node
@@ -117,6 +132,7 @@ class TetrahedronMesh(Mesh3d):
         length = np.sqrt(np.square(nv).sum(axis=1))
         return nv/length.reshape(-1, 1)
 
+    @cached
     def cell_volume(self):
         cell = self.ds.cell
         node = self.node
@@ -126,6 +142,7 @@ class TetrahedronMesh(Mesh3d):
         volume = np.sum(v03*np.cross(v01, v02), axis=1)/6.0
         return volume
 
+    @cached
     def face_area(self):
         face = self.ds.face
         node = self.node
@@ -135,6 +152,7 @@ class TetrahedronMesh(Mesh3d):
         area = np.sqrt(np.square(nv).sum(axis=1))/2.0
         return area
 
+    @cached
     def edge_length(self):
         edge = self.ds.edge
         node = self.node
@@ -157,12 +175,20 @@ class TetrahedronMesh(Mesh3d):
         return np.array(angle).T
 
 
-    def bc_to_point(self, bc):
+    @cached
+    def bc_to_point(self, bc, cellidx=None):
         node = self.node
         cell = self.ds.cell
+        if cellidx is not None:
+            cell = cell[cellidx]
         p = np.einsum('...j, ijk->...ik', bc, node[cell])
         return p 
 
+    def location(self, p):
+        """ Find the cells containing the points `p`, see `CellLocator`
+        """
+        return CellLocator(self).find(p)
+
     def circumcenter(self):
         node = self.node
         cell = self.ds.cell
@@ -239,6 +265,7 @@ class TetrahedronMesh(Mesh3d):
 
         return grad/wgt.reshape(-1, 1)
 
+    @cached
     def grad_lambda(self):
         localFace = self.ds.localFace
         node = self.node
@@ -253,6 +280,24 @@ class TetrahedronMesh(Mesh3d):
             Dlambda[:,i,:] = np.cross(vjm, vjk)/(6*volume.reshape(-1,1))
         return Dlambda
 
+    @cached
+    def jacobi_matrix(self):
+        """
+        Return
+        ------
+        J : numpy.array
+            `J` is the transpose of the jacobi matrix of each cell, the shape
+            is `(NC, 3, 3)`
+        """
+        node = self.node
+        cell = self.ds.cell
+        return node[cell[:, 1:]] - node[cell[:, [0]]]
+
+    def inv_jacobi_matrix(self):
+        """ The inverse of the transpose of `jacobi_matrix`, `(NC, 3, 3)`
+        """
+        return self.grad_lambda()[:, 1:, :]
+
     def label(self, node=None, cell=None, cellidx=None):
         """单元顶点的重新排列，使得cell[:, :2] 存储了单元的最长边
         Parameter
@@ -343,6 +388,8 @@ class TetrahedronMesh(Mesh3d):
         # 非协调边的标记数组 
         nonConforming = np.ones(8*NN, dtype=np.bool)
         IM = eye(NN)
+        NC0 = NC
+        changed = []
         while len(markedCell) != 0:
             # 标记最长边
             self.label(node, cell, markedCell)
@@ -425,6 +472,7 @@ class TetrahedronMesh(Mesh3d):
                     axis=-1)
             # 第几代点 
             generation[p4[idx]] = cellGeneration + 1
+            changed.append(markedCell[markedCell < NC0])
             cell[markedCell, 0] = p3
             cell[markedCell, 1] = p0
             cell[markedCell, 2] = p2
@@ -460,7 +508,10 @@ class TetrahedronMesh(Mesh3d):
 
         self.node = node[:NN]
         cell = cell[:NC]
-        self.ds.reinit(NN, cell)
+        if len(changed) > 0:
+            self.ds.update(NN, cell, np.concatenate(changed))
+        else:
+            self.ds.reinit(NN, cell)
 
         if returnim is True:
             return IM
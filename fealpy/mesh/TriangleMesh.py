@@ -1,7 +1,10 @@
 import numpy as np
 from scipy.sparse import coo_matrix, csc_matrix, csr_matrix, spdiags, bmat, eye
 from .Mesh2d import Mesh2d, Mesh2dDataStructure
-from ..quadrature import TriangleQuadrature
+from .CellLocator import CellLocator
+from .GeometryCache import GeometryCache
+from ..quadrature import get_quadrature
+from ..common import cached
 
 class TriangleMeshDataStructure(Mesh2dDataStructure):
     localEdge = np.array([(1, 2), (2, 0), (0, 1)])
@@ -23,19 +26,30 @@ class TriangleMesh(Mesh2d):
         elif node.shape[1] == 3:
             self.meshtype = 'stri'
 
-        self.itype = cell.dtype
         self.ftype = node.dtype
+        self.cache = GeometryCache(self)
 
         self.celldata = {}
         self.nodedata = {}
         self.edgedata = {}
 
+    @property
+    def itype(self):
+        """ The integer type of the index arrays, which follows the data
+        structure when the topology is rebuilt
+        """
+        return self.ds.itype
+
+    @itype.setter
+    def itype(self, itype):
+        self.ds.itype = itype
+
     def vtk_cell_type(self):
         VTK_TRIANGLE = 5
         return VTK_TRIANGLE
 
     def integrator(self, k):
-        return TriangleQuadrature(k)
+        return get_quadrature('triangle', k)
 
     def copy(self):
         return TriangleMesh(self.node.copy(), self.ds.cell.copy());
@@ -59,33 +73,64 @@ class TriangleMesh(Mesh2d):
         NN = len(node)
         self.ds.reinit(NN, cell)
 
-    def line_walk(self, p):
-        NC = self.number_of_cells()
-        NP = p.shape[0]
-        cell = self.entity('cell')
+    def line_walk(self, p, cidx=None, eps=1e-10):
+        """ Locate the points `p` by walking from the cells `cidx` across the
+        edges towards the points
 
-        cidx = np.random.randint(0, NC, NP)
-        isNotOK = np.ones(NP, dtype=np.bool)
-        while isNotOK.sum() > 0:
-            idx0, = np.find(isNotOK)
-            cidx0 = cidx[isNotOK]
-            pp = p[isNotOK]
+        Parameters
+        ----------
+        p : (NP, 2) points
+        cidx : (NP, ) the start cells, such as the cells of the points in the
+            last time step. Default is found by `self.location`.
 
-            a = np.zeros((len(cidx0), 3), dtype=self.ftype)
-            p0 = cell[cidx0, 0]
-            p1 = cell[cidx0, 1]
-            p2 = cell[cidx0, 2]
+        Returns
+        -------
+        cidx : the cells containing the points, -1 if the walk leaves the mesh
+        bc : (NP, 3) the barycentric coordinates in the cells
+        """
+        if cidx is None:
+            return self.location(p)
+
+        node = self.entity('node')
+        cell = self.entity('cell')
+        cell2cell = self.ds.cell_to_cell()
+        NP = p.shape[0]
+        NC = self.number_of_cells()
 
-            v0 = p0 - pp
-            v1 = p1 - pp
-            v2 = p2 - pp
-            a[:, 0] = np.cross(v1, v2)
-            a[:, 1] = np.cross(v2, v0)
-            a[:, 2] = np.cross(v0, v1)
-            idx = np.argmin(a, axis=-1)
+        cidx = np.array(cidx, dtype=self.itype)
+        bc = np.zeros((NP, 3), dtype=self.ftype)
+        idx = np.arange(NP)
+        for i in range(NC):
+            c = cidx[idx]
+            v0 = node[cell[c, 1]] - node[cell[c, 0]]
+            v1 = node[cell[c, 2]] - node[cell[c, 0]]
+            w = p[idx] - node[cell[c, 0]]
+            a = np.cross(v0, v1)
+            bc[idx, 1] = np.cross(w, v1)/a
+            bc[idx, 2] = np.cross(v0, w)/a
+            bc[idx, 0] = 1 - bc[idx, 1] - bc[idx, 2]
+
+            # the edge i of a cell is opposite to its vertex i
+            j = np.argmin(bc[idx], axis=-1)
+            isOut = bc[idx, j] < -eps
+            nc = cell2cell[c, j]
+            isLost = isOut & (nc == c)
+            cidx[idx[isOut]] = nc[isOut]
+            cidx[idx[isLost]] = -1
+            idx = idx[isOut & ~isLost]
+            if len(idx) == 0:
+                break
+        return cidx, bc
 
-            isOK = a[range(a.shape[0]), idx] >= 0
+    def location(self, p):
+        """ Find the cells containing the points `p` and the barycentric
+        coordinates of the points in them
 
+        Returns `(cidx, bc)`, `cidx` is -1 for the points out of the mesh. To
+        locate many point sets on the same mesh, use `CellLocator(mesh)`
+        directly, which builds the spatial index only once.
+        """
+        return CellLocator(self).find(p)
 
     def circumcenter(self):
         node = self.node
@@ -242,6 +287,8 @@ class TriangleMesh(Mesh2d):
         newNode =0.5*(node[edge[isCutEdge,0],:] + node[edge[isCutEdge,1],:])
         self.node = np.concatenate((node, newNode), axis=0)
         cell2edge0 = cell2edge[:, 0]
+        NC0 = NC
+        changed = []
 
         if returnim:
             nn = len(newNode)
@@ -272,6 +319,7 @@ class TriangleMesh(Mesh2d):
                 break
             L = idx
             R = np.arange(NC, NC+nc)
+            changed.append(L[L < NC0])
             p0 = cell[idx,0]
             p1 = cell[idx,1]
             p2 = cell[idx,2]
@@ -291,7 +339,10 @@ class TriangleMesh(Mesh2d):
             NC = NC+nc
 
         NN = self.node.shape[0]
-        self.ds.reinit(NN, cell)
+        if len(changed) > 0:
+            self.ds.update(NN, cell, np.concatenate(changed))
+        else:
+            self.ds.reinit(NN, cell)
 
         if returnim:
             return IM.tocsr()
@@ -606,6 +657,7 @@ class TriangleMesh(Mesh2d):
 
 
 
+    @cached
     def grad_lambda(self):
         node = self.node
         cell = self.ds.cell
@@ -630,6 +682,7 @@ class TriangleMesh(Mesh2d):
             Dlambda[:,2,:] = np.cross(n, v2)/length.reshape((-1,1))
         return Dlambda
 
+    @cached
     def jacobi_matrix(self, cellidx=None):
         """
         Return
@@ -646,6 +699,17 @@ class TriangleMesh(Mesh2d):
             J = node[cell[cellidx, [1, 2]]] - node[cell[cellidx, [0]]]
         return J
 
+    def inv_jacobi_matrix(self):
+        """
+        Return
+        ------
+        G : numpy.array
+            `G` is the inverse of the transpose of `jacobi_matrix`, which is
+            the pseudo-inverse on a surface. The shape of `G` is `(NC, 2, GD)`
+        """
+        return self.grad_lambda()[:, 1:, :]
+
+    @cached
     def rot_lambda(self):
         node = self.node
         cell = self.ds.cell
@@ -668,6 +732,7 @@ class TriangleMesh(Mesh2d):
             Rlambda[:,2,:] = v2/length.reshape((-1, 1))
         return Rlambda
 
+    @cached
     def area(self, index=None):
         node = self.node
         cell = self.ds.cell
@@ -685,6 +750,7 @@ class TriangleMesh(Mesh2d):
             a = np.sqrt(np.square(nv).sum(axis=1))/2.0
         return a
 
+    @cached
     def cell_area(self, index=None):
         node = self.node
         cell = self.ds.cell
@@ -702,9 +768,12 @@ class TriangleMesh(Mesh2d):
             a = np.sqrt(np.square(nv).sum(axis=1))/2.0
         return a
 
-    def bc_to_point(self, bc):
+    @cached
+    def bc_to_point(self, bc, cellidx=None):
         node = self.node
         cell = self.ds.cell
+        if cellidx is not None:
+            cell = cell[cellidx]
         p = np.einsum('...j, ijk->...ik', bc, node[cell])
         return p 
 
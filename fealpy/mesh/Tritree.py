@@ -24,6 +24,25 @@ class Tritree(TriangleMesh):
         cell = self.ds.cell[child[:, 0] == -1]
         return cell
 
+    def reorder(self, method='hilbert'):
+        """ Renumber the nodes and cells, and update `parent` and `child`
+        """
+        idxmap = self.celldata.pop('idxmap', None)
+        nidx, cidx = super(Tritree, self).reorder(method=method)
+        NC = self.number_of_cells()
+        cidxMap = np.zeros(NC, dtype=self.itype)
+        cidxMap[cidx] = np.arange(NC)
+
+        parent = self.parent[cidx]
+        child = self.child[cidx]
+        parent[parent[:, 0] > -1, 0] = cidxMap[parent[parent[:, 0] > -1, 0]]
+        child[child > -1] = cidxMap[child[child > -1]]
+        self.parent = parent
+        self.child = child
+        if idxmap is not None:
+            self.celldata['idxmap'] = cidxMap[idxmap]
+        return nidx, cidx
+
     def is_leaf_cell(self, idx=None):
         if idx is None:
             return self.child[:, 0] == -1
@@ -537,7 +556,7 @@ class Tritree(TriangleMesh):
             cell = np.r_['0', cell, cell4]
             self.parent = np.r_['0', self.parent, parent4]
             self.child = np.r_['0', self.child, child4]
-            self.ds.reinit(NN + NNN, cell)
+            self.ds.update(NN + NNN, cell, [])
 
     def adaptive_coarsen(self, estimator, surface=None, data=None):
 
@@ -17,6 +17,8 @@ from .StructureHexMesh import StructureHexMesh
 from .SurfaceTriangleMesh import SurfaceTriangleMesh
 from .PrismMesh import PrismMesh
 from .MeshZoo import MeshZoo
+from .CellLocator import CellLocator
+from .GeometryCache import GeometryCache
 
 from .Tritree import Tritree
 from .Quadtree import Quadtree
@@ -30,4 +32,4 @@ from .sizing_function import huniform
 
 from .mesh_tools import *
 
-from .meshio import load_mat_mesh
+from .meshio import load_mat_mesh, write_mmap_mesh, load_mmap_mesh
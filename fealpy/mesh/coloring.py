@@ -34,7 +34,7 @@ def randomcoloring(mesh):
 
     edge = mesh.ds.edge
 
-    c = np.zeros(NN, dtype=np.int)
+    c = np.zeros(NN, dtype=mesh.itype)
 
     isUnColor = (c == 0) 
     color = 0
@@ -86,7 +86,7 @@ def randomcoloring1(mesh):
     NN = mesh.number_of_nodes()
     edge = mesh.ds.edge
 
-    c = np.zeros(NN, dtype=np.int)
+    c = np.zeros(NN, dtype=mesh.itype)
 
     isUnColor = (c == 0) 
 
@@ -115,7 +115,7 @@ def randomcoloring2(mesh):
 
     edge = mesh.ds.edge
 
-    c = np.zeros(N, dtype=np.int)
+    c = np.zeros(N, dtype=mesh.itype)
 
     isUnColor = (c == 0) 
     color = 1
@@ -173,7 +173,7 @@ def show_mesh_2d(
     node = mesh.entity('node')
     cell = mesh.entity('cell')
 
-    if mesh.meshtype is not 'polygon':
+    if mesh.meshtype != 'polygon':
         if mesh.geo_dimension() == 2:
             poly = PolyCollection(node[cell[:, mesh.ds.ccw], :])
         else:
@@ -266,6 +266,85 @@ def unique_row(a):
     return (b, i, j)
 
 
+def row_key(a, n):
+    """ Pack each row of the nonnegative integer array `a` (entries less than
+    `n`) into one int64 key, keeping the lexicographic order of the rows.
+
+    Return `None` when the keys would overflow int64.
+    """
+    n = int(n)
+    m = a.shape[1]
+    if n**m > np.iinfo(np.int64).max:
+        return None
+    key = np.zeros(a.shape[0], dtype=np.int64)
+    for i in range(m):
+        key *= n
+        key += a[:, i]
+    return key
+
+
+def radix_argsort(keys):
+    """ Stable LSD radix sort over 16-bit digits.
+
+    Parameters
+    ----------
+    keys : list of nonnegative integer arrays, from the most significant to
+        the least significant one.
+
+    Notes
+    -----
+    Every pass is a stable `argsort` of a uint16 array, which numpy does with
+    a counting radix sort in linear time.
+    """
+    order = np.arange(len(keys[0]))
+    for key in reversed(keys):
+        key = key.astype(np.uint64)
+        nbits = int(key.max()).bit_length()
+        for shift in range(0, nbits, 16):
+            digit = ((key[order] >> np.uint64(shift)) & np.uint64(0xFFFF)).astype(np.uint16)
+            order = order[np.argsort(digit, kind='stable')]
+    return order
+
+
+def unique_row_radix(a, n=None):
+    """ The unique rows of the nonnegative integer array `a` by radix sort
+
+    Parameters
+    ----------
+    a : (N, m) integer array
+    n : the upper bound of the entries of `a`, default `a.max() + 1`
+
+    Returns
+    -------
+    b : the unique rows, in lexicographic order as `np.unique(a, axis=0)`
+    i0 : the index of the first occurrence of each unique row
+    i1 : the index of the last occurrence of each unique row
+    j : the index of the unique row of each row of `a`, so `a == b[j]`
+    """
+    N = a.shape[0]
+    if N == 0:
+        i0 = np.zeros(0, dtype=np.int_)
+        return a[i0], i0, i0, i0
+    if n is None:
+        n = a.max() + 1
+    key = row_key(a, n)
+    if key is not None:
+        order = radix_argsort([key])
+        key = key[order]
+        isNew = np.r_[True, key[1:] != key[:-1]]
+    else:
+        order = radix_argsort([a[:, i] for i in range(a.shape[1])])
+        b = a[order]
+        isNew = np.r_[True, np.any(b[1:] != b[:-1], axis=1)]
+
+    start, = np.nonzero(isNew)
+    i0 = order[start]
+    i1 = order[np.r_[start[1:], N] - 1]
+    j = np.zeros(N, dtype=np.int_)
+    j[order] = np.cumsum(isNew) - 1
+    return a[i0], i0, i1, j
+
+
 def show_point(axes, point):
     axes.plot(point[:, 0], point[:, 1], 'ro')
 
@@ -321,3 +400,121 @@ def show_solution(axes, mesh, u):
     return
 
 
+
+
+def update_entity_to_cell(entity, entity2cell, cell, localEntity,
+        isChangedCell, n):
+    """ Patch the unique entities (edges in 2d or faces in 3d) and the
+    entity-to-cell relation of a mesh after some cells are changed or added.
+
+    Parameters
+    ----------
+    entity : (NE, m) the old entities, in the order of `unique_row_radix`
+    entity2cell : (NE, 4) the old entity to cell relation
+    cell : (NC, V) the new cells, the unchanged cells keep their old index
+    localEntity : (E, m) the local entities of a cell
+    isChangedCell : (NC, ) bool, the cells which are changed or added
+    n : the number of the nodes of the new mesh
+
+    Returns
+    -------
+    The new `entity` and `entity2cell`, the same as a global construct, or
+    `None` when the node tuples can not be packed into int64 keys.
+
+    Notes
+    -----
+    Only the records of the entities touched by the changed cells are sorted,
+    the rest are moved in one vectorized merge. Every entity is assumed to be
+    shared by at most two cells, which is true for conforming meshes and for
+    the tree meshes.
+    """
+    E = localEntity.shape[0]
+    key0 = row_key(np.sort(entity, axis=1), n)
+    if key0 is None:
+        return None
+    NE = len(key0)
+
+    # the occurrences in the changed cells are removed
+    flag0 = isChangedCell[entity2cell[:, 0]]
+    flag1 = isChangedCell[entity2cell[:, 1]]
+    isAffected = flag0 | flag1
+
+    # the occurrences in the changed cells
+    cidx, = np.nonzero(isChangedCell)
+    key1 = row_key(np.sort(
+        cell[cidx][:, localEntity].reshape(-1, localEntity.shape[1]),
+        axis=1), n)
+    fid1 = (E*cidx.reshape(-1, 1) + np.arange(E)).reshape(-1)
+    pos = np.searchsorted(key0, key1)
+    isFound = pos < NE
+    isFound[isFound] = key0[pos[isFound]] == key1[isFound]
+    isAffected[pos[isFound]] = True
+
+    # collect all the occurrences of the affected and the new entities
+    aidx, = np.nonzero(isAffected)
+    f0 = ~flag0[aidx]
+    f1 = ~flag1[aidx]
+    e2c = entity2cell[aidx]
+    key = np.r_[key0[aidx][f0], key0[aidx][f1], key1]
+    fid = np.r_[E*e2c[f0, 0] + e2c[f0, 2], E*e2c[f1, 1] + e2c[f1, 3], fid1]
+    order = np.lexsort((fid, key))
+    key = key[order]
+    fid = fid[order]
+    isNew = np.r_[True, key[1:] != key[:-1]]
+    start, = np.nonzero(isNew)
+    i0 = fid[start]
+    i1 = fid[np.r_[start[1:], len(key)] - 1]
+    key = key[start]
+
+    e2c = np.zeros((len(key), 4), dtype=entity2cell.dtype)
+    e2c[:, 0] = i0//E
+    e2c[:, 1] = i1//E
+    e2c[:, 2] = i0%E
+    e2c[:, 3] = i1%E
+    e = cell[e2c[:, [0]], localEntity[e2c[:, 2]]]
+
+    isKeep = ~isAffected
+    pos = np.searchsorted(key0[isKeep], key)
+    entity = np.insert(entity[isKeep], pos, e, axis=0)
+    entity2cell = np.insert(entity2cell[isKeep], pos, e2c, axis=0)
+    return entity, entity2cell
+
+
+def update_cell_to_edge(edge, cell2edge, cell, localEdge, isChangedCell, n):
+    """ Patch the sorted unique edges and the cell to edge relation of a 3d
+    mesh after some cells are changed or added.
+
+    Returns the new `edge` and `cell2edge`, the same as a global construct,
+    or `None` when the edges can not be packed into int64 keys.
+    """
+    E = localEdge.shape[0]
+    key0 = row_key(edge, n)
+    if key0 is None:
+        return None
+    NE = len(key0)
+    NC0 = cell2edge.shape[0]
+
+    # the edges which are still used
+    isUsed = np.zeros(NE, dtype=np.bool)
+    isUsed[cell2edge[~isChangedCell[:NC0]]] = True
+
+    cidx, = np.nonzero(isChangedCell)
+    edge1 = np.sort(cell[cidx][:, localEdge].reshape(-1, 2), axis=1)
+    key1 = row_key(edge1, n)
+    pos = np.searchsorted(key0, key1)
+    isFound = pos < NE
+    isFound[isFound] = key0[pos[isFound]] == key1[isFound]
+    isUsed[pos[isFound]] = True
+
+    key2, i = np.unique(key1[~isFound], return_index=True)
+    key0 = key0[isUsed]
+    pos = np.searchsorted(key0, key2)
+    edge = np.insert(edge[isUsed], pos, edge1[~isFound][i], axis=0)
+    key = np.insert(key0, pos, key2)
+
+    idxMap = np.zeros(NE, dtype=cell2edge.dtype)
+    idxMap[isUsed] = np.arange(len(key0)) + np.searchsorted(key2, key0)
+    c2e = np.zeros((cell.shape[0], E), dtype=cell2edge.dtype)
+    c2e[:NC0] = idxMap[cell2edge]
+    c2e[cidx] = np.searchsorted(key, key1).reshape(-1, E)
+    return edge, c2e
@@ -1,7 +1,13 @@
 """Mesh IO
 """
+import os
+import json
+import importlib
+import numpy as np
 import scipy.io as sio
 from .TriangleMesh import TriangleMesh
+from .GeometryCache import GeometryCache
+from ..common import ArrayCache
 
 def write_obj_mesh(trimesh, f):
     from openmesh import TriMesh, write_mesh 
@@ -34,3 +40,160 @@ def write_mat_linear_system(f, AD, b):
     data = {'AD':AD, 'b':b}
     sio.matlab.savemat(f, data)
 
+
+
+# the classes which `load_mmap_mesh` creates, `module:qualname`. The names in
+# `meta.json` are checked against them, so loading a mesh directory can not
+# create an object of any other class.
+MMAP_CLASSES = {
+        'fealpy.mesh.' + name for name in [
+            'IntervalMesh:IntervalMesh',
+            'IntervalMesh:IntervalMeshDataStructure',
+            'TriangleMesh:TriangleMesh',
+            'TriangleMesh:TriangleMeshDataStructure',
+            'QuadrangleMesh:QuadrangleMesh',
+            'QuadrangleMesh:QuadrangleMeshDataStructure',
+            'TetrahedronMesh:TetrahedronMesh',
+            'TetrahedronMesh:TetrahedronMeshDataStructure',
+            'HexahedronMesh:HexahedronMesh',
+            'HexahedronMesh:HexahedronMeshDataStructure',
+            'PolygonMesh:PolygonMesh',
+            'PolygonMesh:PolygonMeshDataStructure',
+            'Tritree:Tritree',
+            'Quadtree:Quadtree',
+            'Octree:Octree',
+            'QuadtreeForest:QuadtreeMesh',
+            'QuadtreeForest:QuadtreeMeshDataStructure',
+            'OctreeForest:OctreeMesh',
+            'OctreeForest:OctreeMeshDataStructure']}
+
+
+def write_mmap_mesh(path, mesh):
+    """ Write a mesh into the directory `path`, which can be loaded back by
+    `load_mmap_mesh` without copy
+
+    Notes
+    -----
+    Every array of the mesh, its data structure and the dicts `nodedata`,
+    `edgedata`, `facedata` and `celldata` is saved as one `.npy` file, so the
+    topology (edge, face, edge2cell, ...) is saved too. The classes and the
+    other attributes (meshtype, itype, ...) are saved in `meta.json`. Only
+    the meshes of `MMAP_CLASSES` can be saved.
+    """
+    for obj in (mesh, mesh.ds):
+        if class_name(obj) not in MMAP_CLASSES:
+            raise ValueError("The mesh class `{}` can not be saved!".format(class_name(obj)))
+    os.makedirs(path, exist_ok=True)
+    meta = {
+            'version': 1,
+            'class': class_name(mesh),
+            'dsclass': class_name(mesh.ds),
+            'mesh': {},
+            'ds': {},
+            'data': {},
+            'arrays': {}}
+
+    def save(name, a):
+        fname = name + '.npy'
+        np.save(os.path.join(path, fname), np.ascontiguousarray(a))
+        meta['arrays'][name] = fname
+
+    for obj, key in [(mesh, 'mesh'), (mesh.ds, 'ds')]:
+        for name, val in obj.__dict__.items():
+            if isinstance(val, np.ndarray):
+                save(key + '.' + name, val)
+            elif (key == 'mesh') and (name in {'nodedata', 'edgedata', 'facedata', 'celldata'}):
+                meta['data'][name] = list(val.keys())
+                for k, a in val.items():
+                    save(name + '.' + k, a)
+            elif (key == 'mesh' and name == 'ds') or (name == 'cache'):
+                continue
+            else:
+                meta[key][name] = encode_attribute(name, val)
+
+    meta['cache'] = isinstance(getattr(mesh, 'cache', None), GeometryCache)
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=1)
+
+
+def load_mmap_mesh(path, mmap_mode='r'):
+    """ Load a mesh written by `write_mmap_mesh`
+
+    Parameters
+    ----------
+    path : the directory of the mesh
+    mmap_mode : the mode of `np.load`. 'r' maps the arrays read-only, 'c'
+        is copy-on-write, 'r+' writes the changes back into the files and
+        `None` reads everything into memory. Use 'c' for the meshes changed
+        in place, such as the refinement of `Quadtree`.
+
+    Notes
+    -----
+    The mesh and its data structure are set up from the saved arrays
+    directly, and the topology is not rebuilt.
+    """
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+
+    arrays = {}
+    for name, fname in meta['arrays'].items():
+        arrays[name] = np.load(os.path.join(path, fname), mmap_mode=mmap_mode)
+
+    ds = new_object(meta['dsclass'])
+    for name, val in meta['ds'].items():
+        setattr(ds, name, decode_attribute(val))
+    ds.cache = ArrayCache()
+
+    mesh = new_object(meta['class'])
+    for name, val in meta['mesh'].items():
+        setattr(mesh, name, decode_attribute(val))
+    mesh.ds = ds
+    if meta.get('cache', False):
+        mesh.cache = GeometryCache(mesh)
+    for name, keys in meta['data'].items():
+        setattr(mesh, name, {k: arrays[name + '.' + k] for k in keys})
+
+    for name, a in arrays.items():
+        key, attr = name.split('.', 1)
+        if key == 'mesh':
+            setattr(mesh, attr, a)
+        elif key == 'ds':
+            setattr(ds, attr, a)
+    return mesh
+
+
+def class_name(obj):
+    cls = type(obj)
+    return cls.__module__ + ':' + cls.__qualname__
+
+
+def new_object(name):
+    """ Create an object of the class `module:qualname` of `MMAP_CLASSES`
+    without calling its `__init__`
+    """
+    if name not in MMAP_CLASSES:
+        raise ValueError("`{}` is not a mesh class of fealpy!".format(name))
+    module, qualname = name.split(':')
+    cls = importlib.import_module(module)
+    for attr in qualname.split('.'):
+        cls = getattr(cls, attr)
+    return cls.__new__(cls)
+
+
+def encode_attribute(name, val):
+    if (val is None) or isinstance(val, (bool, int, float, str)):
+        return val
+    elif isinstance(val, np.generic):
+        return val.item()
+    elif isinstance(val, (np.dtype, type)):
+        try:
+            return {'dtype': np.dtype(val).str}
+        except TypeError:
+            pass
+    raise ValueError("The attribute `{}` of type {} can not be saved!".format(name, type(val)))
+
+
+def decode_attribute(val):
+    if isinstance(val, dict):
+        return np.dtype(val['dtype'])
+    return val
@@ -0,0 +1,127 @@
+import numpy as np
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+
+def quantize(p, nbits, box=None):
+    """ Map the points `p` to the integer grid `[0, 2**nbits)^GD` over the
+    bounding box `box` of shape (2, GD).
+    """
+    if box is None:
+        box = np.array([np.min(p, axis=0), np.max(p, axis=0)])
+    h = box[1] - box[0]
+    h[h == 0] = 1
+    n = 2**nbits - 1
+    x = np.floor((p - box[0])/h*n)
+    x = np.clip(x, 0, n)
+    return x.astype(np.uint64).T.copy()
+
+
+def morton_key(p, nbits=None, box=None):
+    """ The Morton (Z-order) keys of the points `p`
+
+    Parameters
+    ----------
+    p : (N, GD) points
+    nbits : the number of bits in each direction, default `63//GD`
+    box : (2, GD) the bounding box, default the one of `p`
+    """
+    GD = p.shape[1]
+    if nbits is None:
+        nbits = 63//GD
+    x = quantize(p, nbits, box=box)
+    key = np.zeros(p.shape[0], dtype=np.uint64)
+    one = np.uint64(1)
+    for b in range(nbits - 1, -1, -1):
+        for i in range(GD):
+            key = (key << one) | ((x[i] >> np.uint64(b)) & one)
+    return key
+
+
+def hilbert_key(p, nbits=None, box=None):
+    """ The Hilbert curve keys of the points `p` in any dimension
+
+    Parameters
+    ----------
+    p : (N, GD) points
+    nbits : the number of bits in each direction, default `63//GD`
+    box : (2, GD) the bounding box, default the one of `p`
+
+    Notes
+    -----
+    This is the vectorized version of the transpose algorithm in J. Skilling,
+    Programming the Hilbert curve, AIP Conf. Proc. 707 (2004).
+    """
+    GD = p.shape[1]
+    if nbits is None:
+        nbits = 63//GD
+    x = quantize(p, nbits, box=box)
+
+    # inverse undo
+    q = 1 << (nbits - 1)
+    while q > 1:
+        P = np.uint64(q - 1)
+        Q = np.uint64(q)
+        for i in range(GD):
+            isSet = (x[i] & Q) != 0
+            x[0][isSet] ^= P
+            t = (x[0] ^ x[i]) & P
+            t[isSet] = 0
+            x[0] ^= t
+            x[i] ^= t
+        q >>= 1
+
+    # gray encode
+    for i in range(1, GD):
+        x[i] ^= x[i-1]
+    t = np.zeros(p.shape[0], dtype=np.uint64)
+    q = 1 << (nbits - 1)
+    while q > 1:
+        isSet = (x[GD-1] & np.uint64(q)) != 0
+        t[isSet] ^= np.uint64(q - 1)
+        q >>= 1
+    x ^= t
+
+    key = np.zeros(p.shape[0], dtype=np.uint64)
+    one = np.uint64(1)
+    for b in range(nbits - 1, -1, -1):
+        for i in range(GD):
+            key = (key << one) | ((x[i] >> np.uint64(b)) & one)
+    return key
+
+
+def reorder_index(mesh, method='hilbert'):
+    """ The new orderings of the nodes and cells of a mesh
+
+    Parameters
+    ----------
+    mesh : a mesh with `node` and `ds.cell`
+    method : 'hilbert', 'morton' or 'rcm'
+
+    Returns
+    -------
+    nidx : the new to old node map, the i-th new node is `nidx[i]`
+    cidx : the new to old cell map
+
+    Notes
+    -----
+    'hilbert' and 'morton' sort the nodes and the cell barycenters along the
+    space filling curve. 'rcm' uses the reverse Cuthill-McKee ordering of the
+    node graph, and sorts the cells by their smallest new node index.
+    """
+    node = mesh.entity('node')
+    cell = mesh.entity('cell')
+    if method in {'hilbert', 'morton'}:
+        key = hilbert_key if method == 'hilbert' else morton_key
+        box = np.array([np.min(node, axis=0), np.max(node, axis=0)])
+        nidx = np.argsort(key(node, box=box), kind='stable')
+        bc = mesh.entity_barycenter('cell')
+        cidx = np.argsort(key(bc, box=box), kind='stable')
+    elif method == 'rcm':
+        node2node = mesh.ds.node_to_node().tocsr()
+        nidx = reverse_cuthill_mckee(node2node, symmetric_mode=True)
+        nidxMap = np.zeros(len(nidx), dtype=mesh.itype)
+        nidxMap[nidx] = np.arange(len(nidx))
+        cidx = np.argsort(np.min(nidxMap[cell], axis=1), kind='stable')
+    else:
+        raise ValueError("the reorder method `{}` is not supported!".format(method))
+    return nidx.astype(mesh.itype), cidx.astype(mesh.itype)
@@ -27,10 +27,10 @@ def write_vtk_mesh(mesh, fileName):
             dtype=mesh.ftype)), axis=1)
     ug = tvtk.UnstructuredGrid(points=node)
 
-    if mesh.meshtype is 'hex':
+    if mesh.meshtype == 'hex':
         cell_type = tvtk.Hexahedron().cell_type
         cell = mesh.ds.cell
-    elif mesh.meshtype is 'tri':
+    elif mesh.meshtype == 'tri':
         cell_type = tvtk.Triangle().cell_type
         cell = mesh.ds.cell
         for key, value in mesh.cellData.items():
@@ -39,17 +39,17 @@ def write_vtk_mesh(mesh, fileName):
         for key, value in mesh.pointData.items():
             i = ug.point_data.add_array(value)
             ug.point_data.get_array(i).name = key
-    elif mesh.meshtype is 'polyhedron':
+    elif mesh.meshtype == 'polyhedron':
         cell_type = tvtk.Polygon().cell_type
         NF, faces = mesh.to_vtk()
         cell = tvtk.CellArray()
         cell.set_cells(NF, faces)
-    elif mesh.meshtype is 'polygon':
+    elif mesh.meshtype == 'polygon':
        cell_type = tvtk.Polygon().cell_type
        NC, cells = mesh.to_vtk()
        cell = tvtk.CellArray()
        cell.set_cells(NC, cells)
-    elif mesh.meshtype is 'tet':
+    elif mesh.meshtype == 'tet':
         cell_type = tvtk.Tetra().cell_type
         cell = mesh.ds.cell
         for key, value in mesh.cellData.items():
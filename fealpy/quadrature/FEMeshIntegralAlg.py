@@ -19,6 +19,105 @@ class FEMeshIntegralAlg():
         else:
             return e.sum()
 
+    def errors(self, u, uh, gu=None, guh=None, norms=('L2', 'H1'), power=None,
+            chunksize=None, celltype=False):
+        """
+        compute several error norms by one evaluation of the functions at
+        the quadrature points
+
+        Parameters
+        ----------
+        u : the exact solution `u(x)` at the physical points `x`
+        uh : the finite element `Function`, or `uh(bcs, cellidx)`
+        gu : the gradient of the exact solution, needed by 'H1'
+        guh : `guh(bcs, cellidx)`, default `uh.grad_value`
+        norms : some of 'L1', 'L2', 'Lp', 'Linf' (the maximum at the
+            quadrature points) and 'H1' (the H1 semi norm)
+        power : the `p` of 'Lp'
+        chunksize : the number of cells processed at one time, default all
+            the cells
+        celltype : also return the norms on every cell
+
+        Returns
+        -------
+        e : a dict of the global norms, and a dict of the `(NC, )` norms on
+            the cells if `celltype` is True
+
+        Notes
+        -----
+        `u`, `uh` and the gradients are evaluated once per quadrature point,
+        and only the values of the cells in process are in memory at a time.
+        The streaming by cell blocks needs a mesh whose `bc_to_point` takes
+        the `cellidx` argument.
+        """
+        for name in norms:
+            if name not in {'L1', 'L2', 'Lp', 'Linf', 'H1'}:
+                raise ValueError("the norm `{}` is not supported!".format(name))
+        if ('Lp' in norms) and (power is None):
+            raise ValueError("`power` is needed by the Lp norm!")
+        if 'H1' in norms:
+            if gu is None:
+                raise ValueError("`gu` is needed by the H1 semi norm!")
+            if guh is None:
+                guh = uh.grad_value
+
+        qf = self.integrator
+        bcs, ws = qf.quadpts, qf.weights
+        mesh = self.mesh
+        NC = len(self.measure)
+        if chunksize is None:
+            chunksize = NC
+
+        ec = {name: np.zeros(NC, dtype=np.float) for name in norms}
+        for start in range(0, NC, chunksize):
+            if chunksize == NC:
+                index = np.s_[:]
+                cellidx = None
+                pp = mesh.bc_to_point(bcs)
+            else:
+                index = np.s_[start:start+chunksize]
+                cellidx = index
+                pp = mesh.bc_to_point(bcs, cellidx=cellidx)
+            measure = self.measure[index]
+
+            def integral(val):
+                # sum over the components of vector or tensor values
+                val = val.reshape(val.shape[:2] + (-1, )).sum(axis=-1)
+                return np.einsum('i, ij, j->j', ws, val, measure)
+
+            if {'L1', 'L2', 'Lp', 'Linf'} & set(norms):
+                d = np.abs(u(pp) - uh(bcs, cellidx=cellidx))
+                if 'L1' in norms:
+                    ec['L1'][index] = integral(d)
+                if 'L2' in norms:
+                    ec['L2'][index] = integral(d**2)
+                if 'Lp' in norms:
+                    ec['Lp'][index] = integral(d**power)
+                if 'Linf' in norms:
+                    d = d.reshape(d.shape[:2] + (-1, ))
+                    ec['Linf'][index] = d.max(axis=-1).max(axis=0)
+            if 'H1' in norms:
+                d = gu(pp) - guh(bcs, cellidx=cellidx)
+                ec['H1'][index] = integral(d**2)
+
+        e = {}
+        for name in norms:
+            if name == 'L1':
+                e[name] = ec[name].sum()
+            elif name == 'Linf':
+                e[name] = ec[name].max()
+            elif name == 'Lp':
+                e[name] = ec[name].sum()**(1/power)
+                ec[name] **= 1/power
+            else:
+                e[name] = np.sqrt(ec[name].sum())
+                ec[name] = np.sqrt(ec[name])
+
+        if celltype is True:
+            return e, ec
+        else:
+            return e
+
     def L2_norm(self, uh, celltype=False):
         def f(x):
             return uh(x)**2
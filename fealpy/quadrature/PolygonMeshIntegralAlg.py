@@ -1,6 +1,21 @@
+import zlib
 import numpy as np
 
 class PolygonMeshIntegralAlg():
+    """ The integrals on a polygon mesh by the quadrature on the sub-triangles
+    of the cells
+
+    Notes
+    -----
+    Every cell is split into the triangles formed by its barycenter and its
+    edges. There is one sub-triangle for every entry of `ds.cell`, so they
+    are ordered by the cells. The meshes with a `(NC, NV)` array `ds.cell`,
+    such as the triangle meshes, are split in the same way. The physical
+    quadrature points, the weights (the quadrature weights times the areas
+    of the sub-triangles) and the cells of the sub-triangles are computed
+    once by `integration_plan`, and then an integral is one evaluation of
+    the integrand on all the sub-triangles and one weighted `np.bincount`.
+    """
     def __init__(self, integrator, pmesh, area=None, barycenter=None):
         self.pmesh = pmesh
         self.integrator = integrator
@@ -13,6 +28,7 @@ class PolygonMeshIntegralAlg():
             self.barycenter = pmesh.entity_barycenter('cell')
         else:
             self.barycenter = barycenter
+        self.plan = None
 
     def triangle_area(self, tri):
         v1 = tri[1] - tri[0]
@@ -20,42 +36,79 @@ class PolygonMeshIntegralAlg():
         area = np.cross(v1, v2)/2
         return area
 
-    def integral(self, u, celltype=False):
-        pmesh = self.pmesh
-        node = pmesh.node
-        bc = self.barycenter
+    def integration_plan(self):
+        """
+        The quadrature on the sub-triangles of all the cells
+
+        Returns
+        -------
+        pp : (NQ, NT, 2) the physical quadrature points
+        ws : (NQ, NT) the weights
+        cellidx : (NT, ) the cell of every sub-triangle
+
+        Notes
+        -----
+        The plan is memoized in the `GeometryCache` of the mesh if there is
+        one, keyed by the quadrature and the barycenters, so it is computed
+        again after the mesh is changed. Otherwise it is kept here.
+        """
+        cache = getattr(self.pmesh, 'cache', None)
+        if cache is None:
+            if self.plan is None:
+                self.plan = self.compute_integration_plan()
+            return self.plan
 
-        edge = pmesh.ds.edge
-        edge2cell = pmesh.ds.edge2cell
+        qf = self.integrator
+        bcs, ws = qf.quadpts, qf.weights
+        key = ('integration_plan',
+                zlib.crc32(np.ascontiguousarray(bcs)),
+                zlib.crc32(np.ascontiguousarray(ws)),
+                zlib.crc32(np.ascontiguousarray(self.barycenter)))
+        return cache.fetch(key, self.compute_integration_plan)
 
-        NC = pmesh.number_of_cells()
+    def compute_integration_plan(self):
+        pmesh = self.pmesh
+        node = pmesh.node
+        ds = pmesh.ds
 
         qf = self.integrator
         bcs, ws = qf.quadpts, qf.weights
 
-        tri = [bc[edge2cell[:, 0]], node[edge[:, 0]], node[edge[:, 1]]]
+        if hasattr(ds, 'cell_index'):
+            cellidx = ds.cell_index()
+            v0 = ds.cell
+            v1 = ds.cell[ds.next_index()]
+        else:
+            # the meshes whose cells have the same number of vertices, such
+            # as the triangle meshes
+            NC, NV = ds.cell.shape
+            cellidx = np.repeat(np.arange(NC), NV)
+            v0 = ds.cell.reshape(-1)
+            v1 = np.roll(ds.cell, -1, axis=1).reshape(-1)
+        tri = [self.barycenter[cellidx], node[v0], node[v1]]
         a = self.triangle_area(tri)
         pp = np.einsum('ij, jkm->ikm', bcs, tri)
-        val = u(pp, edge2cell[:, 0])
-
-        shape = (NC, ) + val.shape[2:]
-        e = np.zeros(shape, dtype=np.float)
-
-        ee = np.einsum('i, ij..., j->j...', ws, val, a)
-        np.add.at(e, edge2cell[:, 0], ee)
-
-        isInEdge = (edge2cell[:, 0] != edge2cell[:, 1])
-        if np.sum(isInEdge) > 0:
-            tri = [
-                    bc[edge2cell[isInEdge, 1]],
-                    node[edge[isInEdge, 1]],
-                    node[edge[isInEdge, 0]]
-                    ]
-            a = self.triangle_area(tri)
-            pp = np.einsum('ij, jkm->ikm', bcs, tri)
-            val = u(pp, edge2cell[isInEdge, 1])
-            ee = np.einsum('i, ij..., j->j...', ws, val, a)
-            np.add.at(e, edge2cell[isInEdge, 1], ee)
+        return pp, ws[:, None]*a, cellidx
+
+    def integral(self, u, celltype=False):
+        """
+        The integral of `u(x, cellidx)`, which returns the values with the
+        shape `(NQ, NT, ...)` at the points `x` of the shape `(NQ, NT, 2)`
+        in the cells `cellidx`
+
+        The vector and matrix valued integrands are summed in one pass.
+        """
+        pp, ws, cellidx = self.integration_plan()
+        val = u(pp, cellidx)
+
+        NC = self.pmesh.number_of_cells()
+        ee = np.einsum('ij..., ij->j...', val, ws)
+        shape = ee.shape[1:]
+        ee = ee.reshape(len(cellidx), -1)
+        K = ee.shape[1]
+        idx = cellidx[:, None]*K + np.arange(K)
+        e = np.bincount(idx.reshape(-1), weights=ee.reshape(-1),
+                minlength=NC*K).reshape((NC, ) + shape)
 
         if celltype is True:
             return e
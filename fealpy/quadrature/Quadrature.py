@@ -1,3 +1,43 @@
+import os
+import numpy as np
+
+# the tables of the quadrature rules, `{name}_{index}` is the table of the
+# `index`-th rule of `name` with the points in the first columns and the
+# weights in the last one, and `{name}_index`, `{name}_degree` give the
+# algebraic degree of exactness of every rule
+DATAFILE = os.path.join(os.path.dirname(__file__), 'data', 'quadrature_tables.npz')
+
+tables = {}
+
+
+def quadrature_table(name, index):
+    """ The table of the `index`-th rule of `name`
+
+    The table is read from `DATAFILE` at its first use and shared by all the
+    rules built from it, so it is read-only.
+    """
+    key = '{}_{}'.format(name, index)
+    A = tables.get(key)
+    if A is None:
+        with np.load(DATAFILE) as data:
+            if key not in data.files:
+                raise ValueError("There is no {}-th {} quadrature rule!".format(index, name))
+            A = data[key]
+        A.flags.writeable = False
+        tables[key] = A
+    return A
+
+
+def quadrature_degree(name):
+    """ The indices of the rules of `name` and their degrees of exactness
+    """
+    key = '{}_degree'.format(name)
+    if key not in tables:
+        with np.load(DATAFILE) as data:
+            tables['{}_index'.format(name)] = data['{}_index'.format(name)]
+            tables[key] = data[key]
+    return tables['{}_index'.format(name)], tables[key]
+
 
 class Quadrature():
     def number_of_quadrature_points(self):
@@ -0,0 +1,97 @@
+import numpy as np
+
+from .Quadrature import quadrature_degree
+from .GaussLegendreQuadrature import GaussLegendreQuadrature
+from .TriangleQuadrature import TriangleQuadrature
+from .TetrahedronQuadrature import TetrahedronQuadrature
+from .QuadrangleQuadrature import QuadrangleQuadrature
+from .HexahedronQuadrature import HexahedronQuadrature
+from .PrismQuadrature import PrismQuadrature
+
+
+class QuadratureRegistry():
+    """ The quadrature rules of the cells, built once and shared
+
+    Notes
+    -----
+    `get(celltype, index)` returns the rule `mesh.integrator(index)` of the
+    meshes of `celltype`. A rule is built at its first request from the
+    tables in the data file and kept, so the spaces and the integral
+    algorithms which ask for the same rule again share one object. Its
+    arrays are read-only.
+
+    The polygons are integrated on their sub-triangles, so `polygon` has the
+    rules of `triangle`. The rules of `quadrangle` and `hexahedron` are the
+    tensor products of the Gauss-Legendre rules, and the ones of `prism` are
+    the products of the rules of `triangle` and `interval` with the same
+    index.
+
+    Example
+    -------
+    qf = registry.get('triangle', 3)
+    qf = registry.quadrature('triangle', 6) # the rule exact for degree 6
+    """
+    def __init__(self):
+        self.rules = {}
+        self.celltypes = {
+                'interval': GaussLegendreQuadrature,
+                'triangle': TriangleQuadrature,
+                'polygon': TriangleQuadrature,
+                'tetrahedron': TetrahedronQuadrature,
+                'quadrangle': QuadrangleQuadrature,
+                'hexahedron': HexahedronQuadrature,
+                'prism': PrismQuadrature}
+
+    def get(self, celltype, index):
+        key = (celltype, index)
+        qf = self.rules.get(key)
+        if qf is None:
+            if celltype not in self.celltypes:
+                raise ValueError("There is no quadrature rule of the {}!".format(celltype))
+            qf = self.celltypes[celltype](index)
+            for a in (qf.quadpts, qf.weights):
+                for b in (a if isinstance(a, tuple) else (a, )):
+                    b.flags.writeable = False
+            self.rules[key] = qf
+        return qf
+
+    def degree(self, celltype):
+        """ The indices of the rules of `celltype` and their algebraic
+        degrees of exactness, in the same order
+        """
+        if celltype in {'triangle', 'polygon', 'tetrahedron'}:
+            name = 'triangle' if celltype == 'polygon' else celltype
+            return quadrature_degree(name)
+
+        index, degree = quadrature_degree('gauss_legendre')
+        if celltype in {'interval', 'quadrangle', 'hexahedron'}:
+            return index, degree
+        elif celltype == 'prism':
+            index0, degree0 = quadrature_degree('triangle')
+            n = min(len(index0), len(index))
+            return index0[:n], np.minimum(degree0[:n], degree[:n])
+        else:
+            raise ValueError("There is no quadrature rule of the {}!".format(celltype))
+
+    def index(self, celltype, k):
+        """ The index of the rule of `celltype` with the fewest points which
+        integrates the polynomials of degree `k` exactly
+        """
+        index, degree = self.degree(celltype)
+        i, = np.nonzero(degree >= k)
+        if len(i) == 0:
+            raise ValueError("There is no quadrature rule of the {} exact for the degree {}!".format(celltype, k))
+        return int(index[i[0]])
+
+    def quadrature(self, celltype, k):
+        """ The rule of `celltype` with the fewest points which is exact for
+        the polynomials of degree `k`
+        """
+        return self.get(celltype, self.index(celltype, k))
+
+
+registry = QuadratureRegistry()
+
+
+def get_quadrature(celltype, index):
+    return registry.get(celltype, index)
@@ -6,6 +6,7 @@ from .TetrahedronQuadrature import TetrahedronQuadrature
 from .QuadrangleQuadrature import QuadrangleQuadrature
 from .HexahedronQuadrature import HexahedronQuadrature
 from .PrismQuadrature import PrismQuadrature
+from .QuadratureRegistry import QuadratureRegistry, registry, get_quadrature
 from .FEMeshIntegralAlg import FEMeshIntegralAlg
 from .PolygonMeshIntegralAlg import PolygonMeshIntegralAlg
 
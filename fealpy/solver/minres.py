@@ -2,7 +2,10 @@
 from numpy import sqrt, inner, finfo, zeros
 from numpy.linalg import norm
 
-from scipy.sparse.linalg.isolve.utils import make_system
+try:
+    from scipy.sparse.linalg._isolve.utils import make_system
+except ImportError:
+    from scipy.sparse.linalg.isolve.utils import make_system
 
 
 def minres(A, b, x0=None, shift=0.0, tol=1e-5, maxiter=None,
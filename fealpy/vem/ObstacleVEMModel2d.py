@@ -5,7 +5,8 @@ from scipy.sparse import coo_matrix, csc_matrix, csr_matrix, spdiags, eye
 from ..functionspace.vem_space import VirtualElementSpace2d 
 from ..solver import active_set_solver 
 from ..boundarycondition import DirichletBC
-from ..vemmodel import doperator, PolygonMeshIntegralAlg
+from ..quadrature import PolygonMeshIntegralAlg
+from . import doperator
 
 class ObstacleVEMModel2d():
     def __init__(self, model, mesh, p=1, integrator=None):
@@ -43,15 +44,7 @@ class ObstacleVEMModel2d():
         self.gI = self.vemspace.interpolation(model.obstacle, self.integralalg.integral)
         self.uI = self.vemspace.interpolation(model.solution, self.integralalg.integral)
 
-        self.H = doperator.matrix_H(self.vemspace)
-
-        self.D = doperator.matrix_D(self.vemspace, self.H)
-        self.B = doperator.matrix_B(self.vemspace)
-        self.G = doperator.matrix_G(self.vemspace, self.B, self.D)
-        self.C = doperator.matrix_C(self.vemspace, self.B, self.D, self.H, self.area)
-
-        self.PI0 = doperator.matrix_PI_0(self.vemspace, self.H, self.C)
-        self.PI1 = doperator.matrix_PI_1(self.vemspace, self.G, self.B)
+        self.set_projectors()
 
 
     def reinit(self, mesh, p=None):
@@ -69,15 +62,17 @@ class ObstacleVEMModel2d():
         self.gI = self.vemspace.interpolation(self.model.obstacle, self.integralalg.integral)
         self.uI = self.vemspace.interpolation(self.model.solution, self.integralalg.integral)
 
-        self.H = doperator.matrix_H(self.vemspace)
-        self.D = doperator.matrix_D(self.vemspace, self.H)
-        self.B = doperator.matrix_B(self.vemspace)
-        self.C = doperator.matrix_C(self.vemspace, self.B, self.D, self.H, self.area)
-
-        self.G = doperator.matrix_G(self.vemspace, self.B, self.D)
+        self.set_projectors()
 
-        self.PI0 = doperator.matrix_PI_0(self.vemspace, self.H, self.C)
-        self.PI1 = doperator.matrix_PI_1(self.vemspace, self.G, self.B)
+    def set_projectors(self):
+        self.mat = doperator.basic_matrix(self.vemspace, self.area)
+        self.H = self.mat.H
+        self.D = self.mat.D
+        self.B = self.mat.B
+        self.C = self.mat.C
+        self.G = self.mat.G
+        self.PI0 = self.mat.PI0
+        self.PI1 = self.mat.PI1
 
     def project_to_smspace(self, uh=None):
         p = self.vemspace.p
@@ -180,7 +175,7 @@ class ObstacleVEMModel2d():
     def get_left_matrix(self):
         vemspace = self.vemspace
         area = self.area
-        return doperator.stiff_matrix(vemspace, area, vem=self)
+        return doperator.stiff_matrix(vemspace, area, mat=self.mat)
 
     def get_right_vector(self):
         f = self.model.source
@@ -1,106 +1,135 @@
+import zlib
 import numpy as np
 from ..quadrature import GaussLobattoQuadrature, GaussLegendreQuadrature
 from scipy.sparse import coo_matrix, csc_matrix, csr_matrix, spdiags, eye
 from numpy.linalg import inv
+from ..functionspace.AssemblyPlan import AssemblyPlan
 
 
 class BasicMatrix():
+    """ The projection matrices of a virtual element space
+
+    The matrices of the cells are computed group by group and memoized, see
+    `projectors`, and `G`, `C`, `PI0` and `PI1` are the lists of the views
+    of the stacked arrays in `self.groups`.
+    """
     def __init__(self, V, area):
         self.area = area
-        self.H = matrix_H(V)
-        self.D = matrix_D(V, self.H)
-        self.B = matrix_B(V)
-        self.C = matrix_C(V, self.B, self.D, self.H, self.area)
-        self.G = matrix_G(V, self.B, self.D)
-
-        self.PI0 = matrix_PI_0(V, self.H, self.C)
-        self.PI1 = matrix_PI_1(V, self.G, self.B)
+        self.H, self.D, self.B, self.groups = projectors(V, area)
+
+        NC = len(area)
+        self.C = cell_matrices(self.groups, 5, NC)
+        self.PI0 = cell_matrices(self.groups, 6, NC)
+        self.PI1 = cell_matrices(self.groups, 4, NC)
+        if V.p == 1:
+            self.G = np.array([(1, 0, 0), (0, 1, 0), (0, 0, 1)])
+        else:
+            self.G = cell_matrices(self.groups, 3, NC)
 
 def basic_matrix(V, area):
     return BasicMatrix(V, area)
 
-def stiff_matrix(V, area, cfun=None, mat=None):
+def projectors(V, area):
+    """ The projection matrices `(H, D, B, groups)` of `V`, see
+    `group_matrices` for `groups`
+
+    They are memoized in the `GeometryCache` of the mesh, so the models
+    rebuilt on the same mesh share them, and they are computed again after
+    the mesh is changed.
+    """
+    def compute():
+        mat = BasicMatrix.__new__(BasicMatrix)
+        mat.H = matrix_H(V)
+        mat.D = matrix_D(V, mat.H)
+        mat.B = matrix_B(V)
+        return mat.H, mat.D, mat.B, group_matrices(V, mat)
+
+    cache = getattr(V.mesh, 'cache', None)
+    if cache is None:
+        return compute()
+    key = ('BasicMatrix', type(V).__name__, V.p,
+            zlib.crc32(np.ascontiguousarray(area)))
+    return cache.fetch(key, compute)
+
+def cell_matrices(groups, i, NC):
+    val = [None]*NC
+    for g in groups:
+        for c, a in zip(g[0], g[i]):
+            val[c] = a
+    return val
+
+def group_matrices(V, mat):
+    """ The matrices `D`, `G`, `PI1` and `PI0` of the groups of cells with
+    the same number of vertices, see `PolygonMeshDataStructure.cell_groups`
+
+    Returns a list of `(cidx, cd, D, G, PI1, C, PI0)`, every matrix is a
+    3D array of the `n` cells of a group.
+    """
+    if hasattr(mat, 'groups'):
+        return mat.groups
 
-    def f(x):
-        x[0, :] = 0
-        return x
+    p = V.p
+    ds = V.mesh.ds
+    area = V.smspace.area
+    idof = (p-1)*p//2
+    location = V.dof.cell2dofLocation
+
+    groups = []
+    for (cidx, cd), (_, D), (_, B) in zip(
+            ds.group_blocks(V.dof.cell2dof, location),
+            ds.group_blocks(mat.D, location),
+            ds.group_blocks(mat.B.T, location)):
+        B = B.swapaxes(-1, -2)
+        H = mat.H[cidx]
+        G = B@D
+        PI = np.linalg.solve(G, B)
+        PI1 = B if p == 1 else PI
+        C = H@PI
+        if p > 1:
+            C[:, :idof, :] = 0
+            C[:, :idof, cd.shape[1]-idof:] = area[cidx, None, None]*np.eye(idof)
+        PI0 = np.linalg.solve(H, C)
+        groups.append((cidx, cd, D, G, PI1, C, PI0))
+    return groups
+
+def assemble_groups(V, K):
+    cd = [g[1] for g in V.mesh.ds.group_blocks(
+        V.dof.cell2dof, V.dof.cell2dofLocation)]
+    gdof = V.number_of_global_dofs()
+    return AssemblyPlan(cd, gdof).assemble(K)
 
+def stiff_matrix(V, area, cfun=None, mat=None):
     p = V.p
     if mat is None:
-        pass
-    else:
-        G = mat.G
-        PI1 = mat.PI1
-        D = mat.D
-
-    cell2dof, cell2dofLocation = V.dof.cell2dof, V.dof.cell2dofLocation
-    NC = len(cell2dofLocation) - 1
-    cd = np.hsplit(cell2dof, cell2dofLocation[1:-1])
-    DD = np.vsplit(D, cell2dofLocation[1:-1])
-
-    if p == 1:
-        tG = np.array([(0, 0, 0), (0, 1, 0), (0, 0, 1)])
-        if cfun is None:
-            f1 = lambda x: x[1].T@tG@x[1] + (np.eye(x[1].shape[1]) - x[0]@x[1]).T@(np.eye(x[1].shape[1]) - x[0]@x[1])
-            K = list(map(f1, zip(DD, PI1)))
-        else:
-            barycenter = V.smspace.barycenter
-            k = cfun(barycenter)
-            f1 = lambda x: (x[1].T@tG@x[1] + (np.eye(x[1].shape[1]) - x[0]@x[1]).T@(np.eye(x[1].shape[1]) - x[0]@x[1]))*x[2]
-            K = list(map(f1, zip(DD, PI1, k)))
-    else:
-        tG = list(map(f, G))
-        if cfun is None:
-            f1 = lambda x: x[1].T@x[2]@x[1] + (np.eye(x[1].shape[1]) - x[0]@x[1]).T@(np.eye(x[1].shape[1]) - x[0]@x[1])
-            K = list(map(f1, zip(DD, PI1, tG)))
+        mat = basic_matrix(V, area)
+    if cfun is not None:
+        k = cfun(V.smspace.barycenter)
+
+    K = []
+    for cidx, cd, D, G, PI1, C, PI0 in group_matrices(V, mat):
+        if p == 1:
+            tG = np.broadcast_to(np.diag([0.0, 1.0, 1.0]), G.shape)
         else:
-            barycenter = V.smspace.barycenter
-            k = cfun(barycenter)
-            f1 = lambda x: (x[1].T@x[2]@x[1] + (np.eye(x[1].shape[1]) - x[0]@x[1]).T@(np.eye(x[1].shape[1]) - x[0]@x[1]))*x[3]
-            K = list(map(f1, zip(DD, PI1, tG, k)))
-
-    f2 = lambda x: np.repeat(x, x.shape[0])
-    f3 = lambda x: np.tile(x, x.shape[0])
-    f4 = lambda x: x.flatten()
-
-    I = np.concatenate(list(map(f2, cd)))
-    J = np.concatenate(list(map(f3, cd)))
-    val = np.concatenate(list(map(f4, K)))
-    gdof = V.number_of_global_dofs()
-    A = csr_matrix((val, (I, J)), shape=(gdof, gdof), dtype=np.float)
-    return A
+            tG = G.copy()
+            tG[:, 0, :] = 0
+        S = np.eye(cd.shape[1]) - D@PI1
+        A = PI1.swapaxes(-1, -2)@tG@PI1 + S.swapaxes(-1, -2)@S
+        if cfun is not None:
+            A *= k[cidx, None, None]
+        K.append(A)
+    return assemble_groups(V, K)
 
 def mass_matrix(V, area, cfun=None, mat=None):
-    p = V.p
     if mat is None:
-        pass
-    else:
-        PI0 = mat.PI0
-        D = mat.D
-        H = mat.H
-        C = mat.C
-
-    cell2dof, cell2dofLocation = V.dof.cell2dof, V.dof.cell2dofLocation
-    NC = len(cell2dofLocation) - 1
-    cd = np.hsplit(cell2dof, cell2dofLocation[1:-1])
-    DD = np.vsplit(D, cell2dofLocation[1:-1])
-
-    f1 = lambda x: x[0]@x[1]
-    PIS = list(map(f1, zip(DD, PI0)))
-
-    f1 = lambda x: x[0].T@x[1]@x[0] + x[3]*(np.eye(x[2].shape[1]) - x[2]).T@(np.eye(x[2].shape[1]) - x[2])
-    K = list(map(f1, zip(PI0, H, PIS, area)))
-
-    f2 = lambda x: np.repeat(x, x.shape[0])
-    f3 = lambda x: np.tile(x, x.shape[0])
-    f4 = lambda x: x.flatten()
-
-    I = np.concatenate(list(map(f2, cd)))
-    J = np.concatenate(list(map(f3, cd)))
-    val = np.concatenate(list(map(f4, K)))
-    gdof = V.number_of_global_dofs()
-    M = csr_matrix((val, (I, J)), shape=(gdof, gdof), dtype=np.float)
-    return M
+        mat = basic_matrix(V, area)
+
+    K = []
+    for cidx, cd, D, G, PI1, C, PI0 in group_matrices(V, mat):
+        S = np.eye(cd.shape[1]) - D@PI0
+        A = PI0.swapaxes(-1, -2)@mat.H[cidx]@PI0
+        A += area[cidx, None, None]*(S.swapaxes(-1, -2)@S)
+        K.append(A)
+    return assemble_groups(V, K)
 
 def cross_mass_matrix(integral, wh, vemspace, area, PI0):
     p = vemspace.p
@@ -7,6 +7,7 @@ setup(name='fealpy',
       author_email='weihuayi@xtu.edu.cn',
       license='GNU',
       packages=['fealpy'],
+      package_data={'fealpy': ['quadrature/data/*.npz']},
       install_requires=[
           'numpy',  
           'scipy', 
@@ -0,0 +1,49 @@
+import sys
+import time
+import numpy as np
+
+from fealpy.mesh.simple_mesh_generator import rectangledomainmesh
+from fealpy.functionspace.lagrange_fem_space import LagrangeFiniteElementSpace
+
+"""
+Compare the reference basis evaluations (`basis` and `lambda_grad_basis` at
+the quadrature points) and the matrix assembly of `LagrangeFiniteElementSpace`
+with and without the basis tabulation cache.
+
+Usage:
+    python basis_tabulation_benchmark.py n
+"""
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+N = 200
+mesh = rectangledomainmesh([0, 1, 0, 1], nx=n, ny=n, meshtype='tri')
+tabulation = LagrangeFiniteElementSpace.tabulation
+
+
+def run(space):
+    bcs, ws = space.integrator.get_quadrature_points_and_weights()
+    start = time.perf_counter()
+    for i in range(N):
+        space.basis(bcs)
+        space.lambda_grad_basis(bcs)
+    t0 = (time.perf_counter() - start)/N
+
+    start = time.perf_counter()
+    A = space.stiff_matrix()
+    M = space.mass_matrix()
+    t1 = time.perf_counter() - start
+    return t0, t1, A, M
+
+
+print('{:>3} {:>12} {:>12} {:>8} {:>12} {:>12} {:>8}'.format(
+    'p', 'tabulate(s)', 'cached(s)', 'speedup', 'assembly(s)', 'cached(s)', 'speedup'))
+for p in range(1, 6):
+    space = LagrangeFiniteElementSpace(mesh, p=p)
+    tabulation.resize(0)
+    t0, t1, A0, M0 = run(space)
+    tabulation.resize(2**26)
+    run(space)
+    s0, s1, A1, M1 = run(space)
+    assert abs(A0 - A1).max() == 0 and abs(M0 - M1).max() == 0
+    print('{:>3} {:>12.2e} {:>12.2e} {:>8.2f} {:>12.4f} {:>12.4f} {:>8.2f}'.format(
+        p, t0, s0, t0/s0, t1, s1, t1/s1))
@@ -0,0 +1,45 @@
+import sys
+import time
+import numpy as np
+
+from fealpy.mesh.simple_mesh_generator import rectangledomainmesh, boxmesh3d
+
+"""
+Compare the radix sort and the `np.unique` path of `ds.construct()`.
+
+Usage:
+    python construct_benchmark.py n
+"""
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+
+def run(ds, method):
+    ds.uniqueMethod = method
+    start = time.perf_counter()
+    ds.construct()
+    t = time.perf_counter() - start
+    if hasattr(ds, 'face'):
+        data = (ds.face.copy(), ds.face2cell.copy(), ds.edge.copy(),
+                ds.cell2edge.copy())
+    else:
+        data = (ds.edge.copy(), ds.edge2cell.copy())
+    return t, data
+
+
+meshes = [
+        ('tri', rectangledomainmesh([0, 1, 0, 1], nx=n, ny=n, meshtype='tri')),
+        ('quad', rectangledomainmesh([0, 1, 0, 1], nx=n, ny=n, meshtype='quad')),
+        ('tet', boxmesh3d([0, 1, 0, 1, 0, 1], nx=n//5, ny=n//5, nz=n//5, meshtype='tet')),
+        ('hex', boxmesh3d([0, 1, 0, 1, 0, 1], nx=n//5, ny=n//5, nz=n//5, meshtype='hex'))
+        ]
+
+print('{:>6} {:>10} {:>12} {:>12} {:>8} {:>6}'.format(
+    'mesh', 'NC', 'unique(s)', 'radix(s)', 'speedup', 'same'))
+for name, mesh in meshes:
+    ds = mesh.ds
+    t0, d0 = run(ds, 'unique')
+    t1, d1 = run(ds, 'radix')
+    same = all(np.array_equal(a, b) for a, b in zip(d0, d1))
+    print('{:>6} {:>10} {:>12.4f} {:>12.4f} {:>8.2f} {:>6}'.format(
+        name, mesh.number_of_cells(), t0, t1, t0/t1, str(same)))
@@ -0,0 +1,54 @@
+import os
+import sys
+import time
+import numpy as np
+
+from fealpy.mesh.simple_mesh_generator import rectangledomainmesh
+from fealpy.functionspace.lagrange_fem_space import LagrangeFiniteElementSpace
+
+"""
+The speedup of the thread-parallel block assembly of the stiffness matrix,
+the mass matrix and the load vector of `LagrangeFiniteElementSpace` against
+the number of threads, up to the number of cores.
+
+Usage:
+    python parallel_assembly_benchmark.py n p
+"""
+
+n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+p = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+mesh = rectangledomainmesh([0, 1, 0, 1], nx=n, ny=n, meshtype='tri')
+space = LagrangeFiniteElementSpace(mesh, p=p)
+space.assembly_plan(scatter=False)
+
+cfun = lambda p: 1 + p[..., 0]**2
+f = lambda p: np.sin(np.pi*p[..., 0])*np.sin(np.pi*p[..., 1])
+
+
+def run(nthreads):
+    start = time.perf_counter()
+    A = space.stiff_matrix(cfun=cfun, nthreads=nthreads)
+    t0 = time.perf_counter()
+    M = space.mass_matrix(cfun=cfun, nthreads=nthreads)
+    t1 = time.perf_counter()
+    b = space.source_vector(f, nthreads=nthreads)
+    t2 = time.perf_counter()
+    return (t0 - start, t1 - t0, t2 - t1), (A, M, b)
+
+
+ncores = os.cpu_count()
+print('cores:', ncores, 'cells:', mesh.number_of_cells(),
+        'dofs:', space.number_of_global_dofs())
+print('{:>8} {:>10} {:>8} {:>10} {:>8} {:>10} {:>8}'.format(
+    'threads', 'stiff(s)', 'speedup', 'mass(s)', 'speedup', 'source(s)', 'speedup'))
+t, val = run(1)
+nthreads = 1
+while nthreads <= ncores:
+    s, v = run(nthreads)
+    # the blocks are summed in order, so the results are the same
+    assert abs(val[0] - v[0]).max() == 0
+    assert abs(val[1] - v[1]).max() == 0
+    assert np.all(val[2] == v[2])
+    print('{:>8} {:>10.4f} {:>8.2f} {:>10.4f} {:>8.2f} {:>10.4f} {:>8.2f}'.format(
+        nthreads, s[0], t[0]/s[0], s[1], t[1]/s[1], s[2], t[2]/s[2]))
+    nthreads *= 2
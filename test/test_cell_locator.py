@@ -0,0 +1,75 @@
+import numpy as np
+
+from fealpy.mesh.simple_mesh_generator import rectangledomainmesh, boxmesh3d
+from fealpy.mesh import TriangleMesh
+from fealpy.mesh.CellLocator import CellLocator
+
+"""
+Locate random points by `CellLocator` on a triangle mesh, a tetrahedron mesh
+and a curved surface triangle mesh, and map the barycentric coordinates back
+to the points.
+"""
+
+np.random.seed(0)
+
+
+def random_points(mesh, n):
+    """ random points in random cells, and the cells
+    """
+    node = mesh.entity('node')
+    cell = mesh.entity('cell')
+    cidx = np.random.randint(0, len(cell), n)
+    bc = np.random.rand(n, cell.shape[1])
+    bc /= np.sum(bc, axis=1, keepdims=True)
+    return np.einsum('ij, ijk->ik', bc, node[cell[cidx]]), cidx
+
+
+def to_point(mesh, cidx, bc):
+    node = mesh.entity('node')
+    cell = mesh.entity('cell')
+    return np.einsum('ij, ijk->ik', bc, node[cell[cidx]])
+
+
+for mesh in [
+        rectangledomainmesh([0, 1, 0, 1], nx=20, ny=20, meshtype='tri'),
+        boxmesh3d([0, 1, 0, 1, 0, 1], nx=5, ny=5, nz=5, meshtype='tet')]:
+    GD = mesh.geo_dimension()
+    p, _ = random_points(mesh, 10000)
+    # the points out of the box of the mesh and out of the mesh
+    p[:100] = 2 + np.random.rand(100, GD)
+    p[100:200, 0] = -1e-3
+    cidx, bc = CellLocator(mesh, h=0.07).find(p)
+    assert np.all(cidx[:200] == -1)
+    assert np.all(cidx[200:] >= 0)
+    assert np.all(bc[200:] >= -1e-10)
+    assert abs(to_point(mesh, cidx[200:], bc[200:]) - p[200:]).max() < 1e-12
+
+    # the nodes are on the cell boundaries
+    cidx, bc = mesh.location(mesh.entity('node'))
+    assert abs(to_point(mesh, cidx, bc) - mesh.entity('node')).max() < 1e-12
+    print(mesh.meshtype, 'ok')
+
+# a triangle mesh of the surface z = sin(x)cos(y)/2
+mesh = rectangledomainmesh([0, 1, 0, 1], nx=20, ny=20, meshtype='tri')
+node = mesh.entity('node')
+z = np.sin(node[:, 0])*np.cos(node[:, 1])/2
+mesh = TriangleMesh(np.c_[node, z], mesh.entity('cell'))
+
+locator = CellLocator(mesh)
+p0, cidx0 = random_points(mesh, 10000)
+v = mesh.entity('node')[mesh.entity('cell')[cidx0]]
+n = np.cross(v[:, 1] - v[:, 0], v[:, 2] - v[:, 0])
+n /= np.linalg.norm(n, axis=1, keepdims=True)
+d = (np.random.rand(10000) - 0.5)*locator.tol
+p = p0 + d[:, None]*n
+p[:100] = p0[:100] + 2*locator.tol*n[:100]
+cidx, bc = locator.find(p)
+assert np.all(cidx[:100] == -1)
+assert np.all(cidx[100:] >= 0)
+assert np.all(bc[100:] >= 0)
+assert abs(np.sum(bc, axis=1) - 1)[100:].max() < 1e-12
+# the projection on the found cell is not farther than the one on the cell
+# which the point comes from
+dist = np.linalg.norm(to_point(mesh, cidx[100:], bc[100:]) - p[100:], axis=1)
+assert np.all(dist <= np.abs(d[100:]) + 1e-12)
+print(mesh.meshtype, 'ok')
@@ -0,0 +1,48 @@
+import numpy as np
+from scipy.sparse import spdiags
+
+from fealpy.mesh.simple_mesh_generator import rectangledomainmesh
+from fealpy.functionspace.lagrange_fem_space import LagrangeFiniteElementSpace
+from fealpy.boundarycondition import DirichletBC
+
+"""
+`DirichletBC.apply` against the elimination `T@A@T + Tbd` by the sparse
+products.
+"""
+
+g = lambda p: np.sin(p[..., 0]) + p[..., 1]
+mesh = rectangledomainmesh([0, 1, 0, 1], nx=10, ny=10, meshtype='tri')
+
+for p in [1, 2, 3]:
+    space = LagrangeFiniteElementSpace(mesh, p=p)
+    A = space.stiff_matrix()
+    gdof = A.shape[0]
+    b = np.random.rand(gdof)
+    bc = DirichletBC(space, g)
+
+    isBdDof = bc.isBdDof
+    x = np.zeros(gdof)
+    x[isBdDof] = g(space.interpolation_points()[isBdDof])
+    bdIdx = np.zeros(gdof)
+    bdIdx[isBdDof] = 1
+    T = spdiags(1 - bdIdx, 0, gdof, gdof)
+    Tbd = spdiags(bdIdx, 0, gdof, gdof)
+    A0 = T@A@T + Tbd
+    b0 = b - A@x
+    b0[isBdDof] = x[isBdDof]
+
+    A1, b1 = bc.apply(A, b.copy())
+    assert abs(A1 - A0).max() == 0
+    assert abs(b1 - b0).max() < 1e-12
+
+    # in place, twice with the same pattern
+    for i in range(2):
+        A2 = A.copy()
+        A2, b2 = bc.apply(A2, b.copy(), inplace=True)
+        assert abs(A2 - A0).max() == 0
+
+    # many right hand sides
+    B = np.stack([b, 2*b], axis=-1)
+    A3, B3 = bc.apply(A, B)
+    assert abs(B3[:, 0] - b0).max() < 1e-12
+    print(p, 'ok')
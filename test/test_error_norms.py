@@ -0,0 +1,35 @@
+import numpy as np
+
+from fealpy.mesh.simple_mesh_generator import rectangledomainmesh
+from fealpy.functionspace.lagrange_fem_space import LagrangeFiniteElementSpace
+
+"""
+The norms computed together by `FEMeshIntegralAlg.errors` against the ones
+of `L2_error`, `L1_error` and `Lp_error`.
+"""
+
+u = lambda p: np.sin(np.pi*p[..., 0])*np.cos(p[..., 1])
+gu = lambda p: np.stack([
+    np.pi*np.cos(np.pi*p[..., 0])*np.cos(p[..., 1]),
+    -np.sin(np.pi*p[..., 0])*np.sin(p[..., 1])], axis=-1)
+
+mesh = rectangledomainmesh([0, 1, 0, 1], nx=10, ny=10, meshtype='tri')
+for p in [1, 2]:
+    space = LagrangeFiniteElementSpace(mesh, p=p)
+    uh = space.interpolation(u)
+    ia = space.integralalg
+    norms = ('L2', 'L1', 'Lp', 'H1')
+    ref = {
+        'L2': ia.L2_error(u, uh.value),
+        'L1': ia.L1_error(u, uh.value),
+        'Lp': ia.Lp_error(u, uh.value, 3),
+        'H1': ia.L2_error(gu, uh.grad_value)}
+    e = ia.errors(u, uh, gu=gu, norms=norms, power=3)
+    for k in norms:
+        assert abs(e[k] - ref[k]) < 1e-12*max(1, ref[k])
+
+    e1, ec = ia.errors(u, uh, gu=gu, norms=norms, power=3, chunksize=37, celltype=True)
+    for k in norms:
+        assert abs(e1[k] - e[k]) < 1e-14
+    assert abs(ec['L2'] - ia.L2_error(u, uh.value, celltype=True)).max() < 1e-14
+    print(p, 'ok')
@@ -0,0 +1,50 @@
+import numpy as np
+
+from fealpy.mesh.simple_mesh_generator import rectangledomainmesh, boxmesh3d
+from fealpy.functionspace.lagrange_fem_space import LagrangeFiniteElementSpace
+
+"""
+The geometric quantities memoized in `mesh.cache` follow the changes of the
+mesh: a new `node` array, the nodes moved in place and the refinement.
+"""
+
+for mesh in [
+        rectangledomainmesh([0, 1, 0, 1], nx=4, ny=4, meshtype='tri'),
+        boxmesh3d([0, 1, 0, 1, 0, 1], nx=2, ny=2, nz=2, meshtype='tet')]:
+    GD = mesh.geo_dimension()
+    space = LagrangeFiniteElementSpace(mesh, p=2)
+    A = space.stiff_matrix()
+    measure = mesh.entity_measure('cell')
+    Dlambda = mesh.grad_lambda()
+    assert mesh.grad_lambda() is Dlambda
+    assert not Dlambda.flags.writeable
+
+    # a new node array
+    mesh.node = 2*mesh.node
+    assert np.allclose(mesh.entity_measure('cell'), 2**GD*measure)
+    assert np.allclose(mesh.grad_lambda(), Dlambda/2)
+    assert np.allclose(space.cellmeasure, 2**GD*measure)
+
+    # the nodes moved in place
+    mesh.node[:] /= 2
+    assert np.allclose(mesh.entity_measure('cell'), measure)
+    assert abs(space.stiff_matrix() - A).max() < 1e-12
+
+    # the refinement
+    mesh.uniform_refine()
+    assert len(mesh.grad_lambda()) == mesh.number_of_cells()
+    assert np.isclose(mesh.entity_measure('cell').sum(), measure.sum())
+
+    # the calls on a part of the cells are not cached
+    n = len(mesh.cache)
+    assert np.allclose(mesh.bc_to_point(np.full((1, GD+1), 1/(GD+1)), cellidx=np.arange(3)),
+            mesh.entity_barycenter('cell')[:3])
+    assert len(mesh.cache) == n
+    print(mesh.meshtype, 'ok')
+
+mesh = rectangledomainmesh([0, 1, 0, 1], nx=4, ny=4, meshtype='quad')
+area = mesh.entity_measure('cell')
+assert mesh.entity_measure('cell') is area
+mesh.node[:, 0] *= 3
+assert np.allclose(mesh.entity_measure('cell'), 3*area)
+print(mesh.meshtype, 'ok')
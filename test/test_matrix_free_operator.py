@@ -0,0 +1,44 @@
+import numpy as np
+from scipy.sparse.linalg import cg, spsolve
+
+from fealpy.mesh.simple_mesh_generator import rectangledomainmesh, boxmesh3d
+from fealpy.functionspace.lagrange_fem_space import LagrangeFiniteElementSpace
+from fealpy.functionspace import MatrixFreeOperator
+from fealpy.boundarycondition import DirichletBC
+
+"""
+`MatrixFreeOperator` against the assembled matrices: the products, the
+diagonals, the Dirichlet rows and columns, and the CG solve preconditioned by
+`jacobi()` against the direct solve.
+"""
+
+np.random.seed(0)
+
+c = lambda p: 1 + p[..., 0]**2
+f = lambda p: np.ones(p.shape[:-1])
+g = lambda p: p[..., 0]*p[..., 1]
+
+tri = rectangledomainmesh([0, 1, 0, 1], nx=6, ny=6, meshtype='tri')
+tet = boxmesh3d([0, 1, 0, 1, 0, 1], nx=2, ny=2, nz=2, meshtype='tet')
+for mesh, p in [(tri, 1), (tri, 2), (tri, 3), (tet, 2)]:
+    space = LagrangeFiniteElementSpace(mesh, p=p)
+    gdof = space.number_of_global_dofs()
+    u = np.random.rand(gdof)
+    for kind, A in [
+            ('stiff', space.stiff_matrix(cfun=c)),
+            ('mass', space.mass_matrix(cfun=c))]:
+        # a few cells in a block, so the products go over several blocks
+        B = MatrixFreeOperator(space, kind=kind, cfun=c, chunksize=7)
+        assert abs(B@u - A@u).max() < 1e-12
+        assert abs(B.diagonal() - A.diagonal()).max() < 1e-12
+
+    bc = DirichletBC(space, g)
+    A, b = bc.apply(space.stiff_matrix(), space.source_vector(f))
+    B = space.stiff_operator(isDDof=bc.isBdDof)
+    assert abs(B@u - A@u).max() < 1e-12
+    assert abs(B.diagonal() - A.diagonal()).max() < 1e-12
+
+    x, info = cg(B, b, M=B.jacobi(), tol=1e-12)
+    assert info == 0
+    assert abs(x - spsolve(A, b)).max() < 1e-9
+    print(mesh.meshtype, p, 'ok')
@@ -0,0 +1,55 @@
+import numpy as np
+
+from fealpy.mesh.simple_mesh_generator import rectangledomainmesh, boxmesh3d
+from fealpy.functionspace.lagrange_fem_space import LagrangeFiniteElementSpace
+from fealpy.functionspace import MeshTransfer
+
+"""
+Transfer the functions between two non-nested meshes of the same domain by
+`MeshTransfer`: the integral is kept by the L2 projections, the polynomials
+of the target space are kept by the interpolation, and several fields are
+transferred at once as they are one by one.
+"""
+
+np.random.seed(0)
+
+u = lambda p: 1 + p[..., 0]**2 - p[..., 0]*p[..., 1]
+
+
+def perturbed_mesh(mesh, h):
+    """ move the interior nodes randomly by at most `h/4`
+    """
+    node = mesh.entity('node')
+    isBdNode = mesh.ds.boundary_node_flag()
+    node[~isBdNode] += (np.random.rand(np.sum(~isBdNode), node.shape[1]) - 0.5)*h/2
+    return mesh
+
+
+mesh0 = perturbed_mesh(rectangledomainmesh([0, 1, 0, 1], nx=10, ny=10, meshtype='tri'), 0.1)
+mesh1 = perturbed_mesh(rectangledomainmesh([0, 1, 0, 1], nx=7, ny=9, meshtype='tri'), 1/9)
+for method, p0, p1 in [('L2', 1, 1), ('L2', 2, 1), ('L2', 1, 3), ('lumped', 2, 1)]:
+    space0 = LagrangeFiniteElementSpace(mesh0, p=p0)
+    space1 = LagrangeFiniteElementSpace(mesh1, p=p1)
+    M0 = space0.mass_matrix()
+    M1 = space1.mass_matrix()
+    U0 = np.random.rand(space0.number_of_global_dofs(), 3)
+    T = MeshTransfer(space0, space1, method=method)
+    U1 = T(U0)
+    assert abs(np.sum(M1@U1, axis=0) - np.sum(M0@U0, axis=0)).max() < 1e-13
+    for k in range(3):
+        assert abs(T(U0[:, k]) - U1[:, k]).max() < 1e-13
+    print(method, p0, p1, 'ok')
+
+tri = perturbed_mesh(rectangledomainmesh([0, 1, 0, 1], nx=6, ny=5, meshtype='tri'), 1/6)
+tet0 = perturbed_mesh(boxmesh3d([0, 1, 0, 1, 0, 1], nx=4, ny=4, nz=4, meshtype='tet'), 0.25)
+tet1 = perturbed_mesh(boxmesh3d([0, 1, 0, 1, 0, 1], nx=3, ny=5, nz=3, meshtype='tet'), 0.2)
+for mesh0, mesh1 in [(mesh1, tri), (tet0, tet1)]:
+    space0 = LagrangeFiniteElementSpace(mesh0, p=2)
+    space1 = LagrangeFiniteElementSpace(mesh1, p=2)
+    T = MeshTransfer(space0, space1)
+    u1 = T(space0.interpolation(u))
+    assert abs(u1 - space1.interpolation(u)).max() < 1e-12
+    U0 = np.random.rand(space0.number_of_global_dofs(), 2)
+    U1 = T(U0)
+    assert abs(T(U0[:, 1]) - U1[:, 1]).max() < 1e-14
+print('interpolation ok')
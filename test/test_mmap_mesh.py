@@ -0,0 +1,53 @@
+import os
+import json
+import tempfile
+import numpy as np
+
+from fealpy.mesh.simple_mesh_generator import rectangledomainmesh, boxmesh3d
+from fealpy.mesh import write_mmap_mesh, load_mmap_mesh
+from fealpy.functionspace.lagrange_fem_space import LagrangeFiniteElementSpace
+
+"""
+Save a mesh by `write_mmap_mesh`, load it back by `load_mmap_mesh` and
+build the same Lagrange spaces and matrices on both meshes.
+"""
+
+meshes = [
+    rectangledomainmesh([0, 1, 0, 1], nx=8, ny=8, meshtype='tri'),
+    boxmesh3d([0, 1, 0, 1, 0, 1], nx=3, ny=3, nz=3, meshtype='tet')]
+
+for mesh in meshes:
+    path = tempfile.mkdtemp()
+    write_mmap_mesh(path, mesh)
+    mesh1 = load_mmap_mesh(path)
+
+    assert type(mesh1) is type(mesh)
+    assert mesh1.meshtype == mesh.meshtype
+    assert np.all(mesh1.entity('node') == mesh.entity('node'))
+    assert np.all(mesh1.entity('cell') == mesh.entity('cell'))
+    assert np.all(mesh1.entity('edge') == mesh.entity('edge'))
+
+    for p in [1, 2, 3]:
+        space = LagrangeFiniteElementSpace(mesh, p=p)
+        space1 = LagrangeFiniteElementSpace(mesh1, p=p)
+        assert np.all(space1.cell_to_dof() == space.cell_to_dof())
+        A = space.stiff_matrix()
+        A1 = space1.stiff_matrix()
+        assert abs(A1 - A).max() == 0
+        M = space.mass_matrix()
+        M1 = space1.mass_matrix()
+        assert abs(M1 - M).max() == 0
+    print(mesh.meshtype, 'ok')
+
+# a directory which asks for a class out of the mesh classes
+with open(os.path.join(path, 'meta.json')) as f:
+    meta = json.load(f)
+meta['class'] = 'subprocess:Popen'
+with open(os.path.join(path, 'meta.json'), 'w') as f:
+    json.dump(meta, f)
+try:
+    load_mmap_mesh(path)
+except ValueError:
+    print('subprocess:Popen refused')
+else:
+    raise AssertionError('subprocess:Popen is loaded')
@@ -0,0 +1,33 @@
+import numpy as np
+
+from fealpy.mesh.simple_mesh_generator import rectangledomainmesh
+from fealpy.functionspace.lagrange_fem_space import LagrangeFiniteElementSpace
+from fealpy.functionspace.lagrange_fem_space import VectorLagrangeFiniteElementSpace
+
+"""
+The load vectors of `K` sources assembled at once against the ones of the
+sources one by one.
+"""
+
+mesh = rectangledomainmesh([0, 1, 0, 1], nx=8, ny=8, meshtype='tri')
+fs = [lambda p, k=k: np.sin(k*p[..., 0])*p[..., 1] for k in range(1, 4)]
+for p in [0, 1, 3]:
+    space = LagrangeFiniteElementSpace(mesh, p=p, spacetype='C' if p > 0 else 'D')
+    b0 = np.stack([space.source_vector(f) for f in fs], axis=-1)
+    b1 = space.source_vector(fs)
+    assert b1.shape == b0.shape
+    assert abs(b1 - b0).max() < 1e-14
+
+    bcs, ws = space.integrator.get_quadrature_points_and_weights()
+    b2 = space.source_vector(space.source_value(fs, bcs))
+    assert abs(b2 - b0).max() < 1e-14
+    if p > 0:
+        b3 = space.source_vector(fs, chunksize=10)
+        assert abs(b3 - b0).max() < 1e-14
+    print(p, 'ok')
+
+space = VectorLagrangeFiniteElementSpace(mesh, p=2)
+gs = [lambda p, k=k: np.stack([np.sin(k*p[..., 0]), p[..., 1]**k], axis=-1) for k in range(1, 4)]
+b0 = np.stack([space.source_vector(g) for g in gs], axis=-1)
+assert abs(space.source_vector(gs) - b0).max() < 1e-14
+print('vector ok')
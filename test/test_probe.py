@@ -0,0 +1,38 @@
+import numpy as np
+
+from fealpy.mesh.simple_mesh_generator import rectangledomainmesh, boxmesh3d
+from fealpy.functionspace.lagrange_fem_space import LagrangeFiniteElementSpace
+
+"""
+`Function.probe` at random points against the exact values of a polynomial
+in the space, and the locator of the space after the mesh is changed.
+"""
+
+u = lambda p: np.sum(p**2, axis=-1) + p[..., 0]*p[..., 1]
+
+
+def gu(p):
+    val = 2*p
+    val[..., 0] += p[..., 1]
+    val[..., 1] += p[..., 0]
+    return val
+
+
+tri = rectangledomainmesh([0, 1, 0, 1], nx=8, ny=8, meshtype='tri')
+tet = boxmesh3d([0, 1, 0, 1, 0, 1], nx=3, ny=3, nz=3, meshtype='tet')
+for mesh in [tri, tet]:
+    GD = mesh.geo_dimension()
+    space = LagrangeFiniteElementSpace(mesh, p=2)
+    uh = space.interpolation(u)
+    points = np.random.rand(1000, GD)
+    points[:10] += 2
+    val, gval = uh.probe(points, grad=True)
+    assert np.all(np.isnan(val[:10]))
+    assert abs(val[10:] - u(points[10:])).max() < 1e-12
+    assert abs(gval[10:] - gu(points[10:])).max() < 1e-10
+
+    # the nodes moved in place
+    mesh.node *= 2
+    assert abs(uh.probe(2*points[10:]) - val[10:]).max() < 1e-12
+    mesh.node /= 2
+    print(mesh.meshtype, 'ok')
@@ -0,0 +1,33 @@
+import numpy as np
+from scipy.sparse.linalg import spsolve
+
+from fealpy.mesh.simple_mesh_generator import rectangledomainmesh, boxmesh3d
+from fealpy.functionspace import LagrangeFiniteElementSpace, StaticCondensation
+from fealpy.boundarycondition import DirichletBC
+
+"""
+The solution of the condensed system of the skeleton dofs, recovered on the
+interior dofs, against the solution of the full system.
+"""
+
+u = lambda p: np.sin(np.pi*p[..., 0])*np.cos(p[..., 1])
+f = lambda p: np.ones(p.shape[:-1])
+
+tri = rectangledomainmesh([0, 1, 0, 1], nx=8, ny=8, meshtype='tri')
+tet = boxmesh3d([0, 1, 0, 1, 0, 1], nx=2, ny=2, nz=2, meshtype='tet')
+for mesh, ps in [(tri, [2, 3, 4]), (tet, [3, 4])]:
+    for p in ps:
+        space = LagrangeFiniteElementSpace(mesh, p=p)
+        A = space.stiff_matrix()
+        b = space.source_vector(f)
+        A, b = DirichletBC(space, u).apply(A, b)
+        x0 = spsolve(A, b)
+
+        sc = StaticCondensation(space)
+        S, g = sc.condense(space.cell_stiff_matrix(), space.cell_source_vector(f))
+        S, g = DirichletBC(sc, u).apply(S, g)
+        x1 = sc.recover(spsolve(S, g))
+        # there are interior dofs from p = GD + 1 on
+        assert S.shape[0] < A.shape[0] or p <= mesh.geo_dimension()
+        assert abs(x1 - x0).max() < 1e-10
+        print(mesh.meshtype, p, 'ok')
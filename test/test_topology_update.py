@@ -0,0 +1,60 @@
+import numpy as np
+
+from fealpy.mesh.simple_mesh_generator import rectangledomainmesh, boxmesh3d
+from fealpy.mesh.Quadtree import Quadtree
+from fealpy.mesh.Tritree import Tritree
+
+"""
+The topology patched by `ds.update` after a local refinement against the one
+built from scratch by a new data structure on the same cells.
+"""
+
+np.random.seed(0)
+
+
+def check(mesh, names):
+    ds = mesh.ds
+    ref = type(ds)(ds.NN, ds.cell.copy())
+    for name in names:
+        assert np.array_equal(getattr(ref, name), getattr(ds, name)), name
+    assert ds.itype == ref.itype
+
+
+names2d = ['edge', 'edge2cell']
+names3d = ['face', 'face2cell', 'edge', 'cell2edge']
+
+mesh = rectangledomainmesh([0, 1, 0, 1], nx=10, ny=10, meshtype='tri')
+for i in range(6):
+    mesh.bisect(np.random.rand(mesh.number_of_cells()) < 0.1)
+    check(mesh, names2d)
+print('bisect of TriangleMesh:', mesh.number_of_cells(), 'cells')
+
+mesh = boxmesh3d([0, 1, 0, 1, 0, 1], nx=3, ny=3, nz=3, meshtype='tet')
+for i in range(4):
+    mesh.bisect(np.random.rand(mesh.number_of_cells()) < 0.1)
+    check(mesh, names3d)
+print('bisect of TetrahedronMesh:', mesh.number_of_cells(), 'cells')
+
+tree = Tritree(
+        np.array([(0, 0), (1, 0), (0, 1)], dtype=np.float),
+        np.array([(0, 1, 2)], dtype=np.int))
+tree.uniform_refine(2)
+for i in range(5):
+    isMarkedCell = tree.is_leaf_cell() & (np.random.rand(tree.number_of_cells()) < 0.3)
+    tree.refine(isMarkedCell)
+    check(tree, names2d)
+print('refine of Tritree:', tree.number_of_cells(), 'cells')
+
+tree = Quadtree(
+        np.array([(0, 0), (1, 0), (1, 1), (0, 1)], dtype=np.float),
+        np.array([(0, 1, 2, 3)], dtype=np.int))
+tree.uniform_refine(2)
+for i in range(5):
+    isMarkedCell = tree.is_leaf_cell() & (np.random.rand(tree.number_of_cells()) < 0.3)
+    tree.refine(isMarkedCell)
+    check(tree, names2d)
+# only the cells refined already are marked
+NC = tree.number_of_cells()
+tree.refine(~tree.is_leaf_cell())
+assert tree.number_of_cells() == NC
+print('refine of Quadtree:', tree.number_of_cells(), 'cells')
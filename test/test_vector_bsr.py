@@ -0,0 +1,54 @@
+import numpy as np
+
+from fealpy.mesh.simple_mesh_generator import rectangledomainmesh, boxmesh3d
+from fealpy.functionspace.lagrange_fem_space import VectorLagrangeFiniteElementSpace
+from fealpy.boundarycondition import DirichletBC
+
+"""
+The BSR matrices of `VectorLagrangeFiniteElementSpace` against the CSR ones,
+the rigid body modes in the kernel of `linear_elasticity_matrix` and the
+Dirichlet elimination kept in BSR format.
+"""
+
+
+def rigid_body_modes(ip):
+    """ the translations and the infinitesimal rotations at the points `ip`
+    """
+    GD = ip.shape[1]
+    modes = [np.broadcast_to(e, ip.shape) for e in np.eye(GD)]
+    for i, j in [(0, 1), (1, 2), (0, 2)][:GD*(GD-1)//2]:
+        r = np.zeros_like(ip)
+        r[:, i] = -ip[:, j]
+        r[:, j] = ip[:, i]
+        modes.append(r)
+    return [r.reshape(-1) for r in modes]
+
+
+tri = rectangledomainmesh([0, 1, 0, 1], nx=4, ny=4, meshtype='tri')
+tet = boxmesh3d([0, 1, 0, 1, 0, 1], nx=2, ny=2, nz=2, meshtype='tet')
+for mesh, p in [(tri, 1), (tri, 2), (tet, 1), (tet, 2)]:
+    GD = mesh.geo_dimension()
+    space = VectorLagrangeFiniteElementSpace(mesh, p=p)
+
+    A = space.stiff_matrix()
+    assert A.format == 'csr'
+    B = space.stiff_matrix(format='bsr')
+    assert B.blocksize == (GD, GD)
+    assert abs(B - A).max() < 1e-12
+    M = space.mass_matrix(format='bsr')
+    assert abs(M - space.mass_matrix()).max() < 1e-12
+
+    E = space.linear_elasticity_matrix(1.0, 2.0, format='bsr')
+    assert abs(E - E.T).max() < 1e-12
+    for r in rigid_body_modes(space.scalarspace.interpolation_points()):
+        assert abs(E@r).max() < 1e-10
+
+    g = lambda x: np.sin(x)
+    b = np.random.rand(E.shape[0])
+    bc = DirichletBC(space, g)
+    E0, b0 = bc.apply(E.tocsr(), b.copy())
+    E1, b1 = bc.apply(E, b.copy())
+    assert E1.format == 'bsr'
+    assert abs(E1 - E0).max() < 1e-12
+    assert abs(b1 - b0).max() < 1e-12
+    print(mesh.meshtype, p, 'ok')
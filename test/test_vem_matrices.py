@@ -0,0 +1,80 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from fealpy.mesh import Quadtree
+from fealpy.functionspace import ConformingVirtualElementSpace2d
+from fealpy.functionspace import NonConformingVirtualElementSpace2d
+
+"""
+The VEM stiffness and mass matrices batched over the groups of polygons with
+the same size against the ones built polygon by polygon, and the projection
+matrices cached on the mesh after the nodes are moved.
+"""
+
+
+def cell_by_cell(space):
+    p = space.p
+    H, D, B = space.H, space.D, space.B
+    area = space.smspace.area
+    cell2dof, location = space.dof.cell2dof, space.dof.cell2dofLocation
+    idof = (p-1)*p//2
+    I, J, A, M = [], [], [], []
+    for i in range(len(location) - 1):
+        s = slice(location[i], location[i+1])
+        cd, DD, BB = cell2dof[s], D[s], B[:, s]
+        ldof = len(cd)
+        if isinstance(space, ConformingVirtualElementSpace2d) and (p == 1):
+            G = np.eye(3)
+            PI1 = BB
+        else:
+            G = BB@DD
+            PI1 = np.linalg.solve(G, BB)
+        C = H[i]@PI1
+        if p > 1:
+            C[:idof, :] = 0
+            C[:idof, ldof-idof:] = area[i]*np.eye(idof)
+        PI0 = np.linalg.solve(H[i], C)
+        tG = G.copy()
+        tG[0, :] = 0
+        S1 = np.eye(ldof) - DD@PI1
+        S0 = np.eye(ldof) - DD@PI0
+        A.append((PI1.T@tG@PI1 + S1.T@S1).flat)
+        M.append((PI0.T@H[i]@PI0 + area[i]*S0.T@S0).flat)
+        I.append(np.repeat(cd, ldof))
+        J.append(np.tile(cd, ldof))
+    gdof = space.number_of_global_dofs()
+    I, J = np.concatenate(I), np.concatenate(J)
+    A = csr_matrix((np.concatenate(A), (I, J)), shape=(gdof, gdof))
+    M = csr_matrix((np.concatenate(M), (I, J)), shape=(gdof, gdof))
+    return A, M
+
+
+def quadtree_mesh(box):
+    node = np.array([
+        (box[0], box[2]), (box[1], box[2]),
+        (box[1], box[3]), (box[0], box[3])], dtype=np.float)
+    quadtree = Quadtree(node, np.array([(0, 1, 2, 3)], dtype=np.int))
+    quadtree.uniform_refine(2)
+    # the hanging nodes give the polygons with 4 to 6 vertices
+    isMarkedCell = np.zeros(quadtree.number_of_cells(), dtype=np.bool)
+    isMarkedCell[[5, 6, 17]] = True
+    quadtree.refine(isMarkedCell)
+    return quadtree.to_pmesh()
+
+
+mesh = quadtree_mesh([0, 1, 0, 1])
+for Space in [ConformingVirtualElementSpace2d, NonConformingVirtualElementSpace2d]:
+    for p in [1, 2, 3]:
+        space = Space(mesh, p)
+        A0, M0 = cell_by_cell(space)
+        assert abs(space.stiff_matrix() - A0).max() < 1e-10
+        assert abs(space.mass_matrix() - M0).max() < 1e-12
+
+        # a new space after the mesh is stretched in place
+        mesh.node[:, 0] *= 2
+        A1 = Space(mesh, p).stiff_matrix()
+        A2 = Space(quadtree_mesh([0, 2, 0, 1]), p).stiff_matrix()
+        assert abs(A1 - A2).max() < 1e-10
+        mesh.node[:, 0] /= 2
+        assert abs(Space(mesh, p).stiff_matrix() - A0).max() < 1e-10
+        print(Space.__name__, p, 'ok')